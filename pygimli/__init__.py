@@ -6,16 +6,46 @@ import sys
 import locale
 
 from .core.decorators import (renamed, singleton, moduleProperty,
-                              skipOnDefaultTest,
+                              moduleLazyImport, skipOnDefaultTest,
                               )
 
+# Subpackages and shortcuts that are imported on first access only.
+# This keeps `import pygimli` fast and avoids loading matplotlib until
+# something is drawn.
+moduleLazyImport(__name__, {
+    'solver': '.solver',
+    'solve': '.solver:solve',
+    'utils': '.utils',
+    'boxprint': '.utils:boxprint',
+    'cache': '.utils:cache',
+    'cut': '.utils:cut',
+    'unique': '.utils:unique',
+    'unit': '.utils:unit',
+    'cmap': '.utils:cmap',
+    'randn': '.utils:randn',
+    'pf': '.utils:prettify',
+    'Report': '.utils.utils:Report',
+    'viewer': '.viewer',
+    'show': '.viewer:show',
+    'wait': '.viewer:wait',
+    'noShow': '.viewer:noShow',
+    'hold': '.viewer:hold',
+    'frameworks': '.frameworks',
+    'fit': '.frameworks:fit',
+    'Modelling': '.frameworks:Modelling',
+    'Inversion': '.frameworks:Inversion',
+    'testing': '.testing',
+    'test': '.testing:test',  # , setTestingMode, testingMode
+    'physics': '.physics',
+})
+
 # Import everything that should be accessible through main namespace.
 from .core import (BVector, CVector, DataContainer, DataContainerERT,
                    IVector, Line, Mesh, Plane, Pos, PosList, PosVector,
                    RVector, RVector3, Vector, abs, cat, center, exp,
                    find, interpolate, log, log10, logDropTol, max,
                    mean, median, min, search, setDebug, setThreadCount, sort,
-                   Stopwatch, sum, trans, unique, versionStr, x, y, z, zero)
+                   Stopwatch, sum, trans, versionStr, x, y, z, zero)
 
 from .core import (isInt, isScalar, isIterable, isArray, isPos, isPosList,
                    isR3Array, isComplex, isMatrix)
@@ -34,17 +64,6 @@ warning = warn  # convenience
 from .core.config import getConfigPath, rc, getCPUCount
 
 from .meshtools import createGrid, interpolate
-from .solver import solve
-from .utils import boxprint, cache, cut, unique, unit, cmap, randn
-from .utils import prettify as pf
-from .utils.utils import Report
-
-from .viewer import show, wait, noShow, hold
-
-from .frameworks import fit
-from .frameworks import Modelling
-from .frameworks import Inversion
-from .testing import test  #, setTestingMode, testingMode
 
 from .math import matrix  # alias all from .core.matrix.* to pg.matrix.*
 from .core.load import (load, optImport, getCachePath,
@@ -267,6 +286,8 @@ def toc(msg=None, box=False, reset=False, key=0):
     id: identifier
         Identifier for your Stopwatch.
     """
+    from .utils import boxprint
+
     if msg:
         if box is True:
             boxprint(msg)
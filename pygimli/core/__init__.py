@@ -917,89 +917,217 @@ def asvector(array):
 # ##########################
 
 
-def __GLOBAL__response_mt_shm_(fop, model, shm, i):
-    resp = fop.response_mt(model, i)
+__GLOBAL__mtFop__ = None
+
+
+def __GLOBAL__stateHash_(v, depth=0):
+    """Hash of plain (possibly nested) attribute values, None if unknown."""
+    from builtins import hash  # shadowed by pgcore.hash
+
+    if isinstance(v, (bool, int, float, complex, str, type(None))):
+        return hash(v)
+    if isinstance(v, np.ndarray) and v.dtype.kind in 'biufc':
+        return hash((v.shape, v.tobytes()))
+    if isinstance(v, (pgcore.RVector, pgcore.IVector, pgcore.BVector)):
+        return hash(np.asarray(v).tobytes())
+    if isinstance(v, (pgcore.Mesh, pgcore.DataContainer)):
+        return v.hash()
+    if depth < 4 and isinstance(v, (list, tuple)):
+        return hash(tuple(__GLOBAL__stateHash_(vi, depth+1) for vi in v))
+    if depth < 4 and isinstance(v, dict):
+        return hash(tuple((hash(str(k)), __GLOBAL__stateHash_(vi, depth+1))
+                          for k, vi in sorted(v.items(), key=str)))
+    return None
+
+
+def __GLOBAL__fopStateHash_(fop):
+    """Fingerprint of the forward operator state the worker pool relies on.
+
+    Forward operators can't be pickled, so workers inherit a copy at fork
+    time. Besides the operator hash we include the content of mesh and data
+    and all plain attributes (scalars, arrays, vectors and nested
+    lists/dicts of them), e.g. the electrode spacings of VESModelling, so
+    the pool is renewed whenever the operator is reconfigured. State that
+    can't be seen from here needs an explicit :py:meth:`modified` call.
+    """
+    from builtins import hash  # shadowed by pgcore.hash
 
-    for j in range(len(resp)):
-        shm[j] = resp[j]
+    h = hash(type(fop))
+    try:
+        h ^= hash(fop)
+    except Exception:
+        pass
 
+    for getter in (pgcore.ModellingBase.mesh, pgcore.ModellingBase.data):
+        try:
+            h = hash((h, getter(fop).hash()))
+        except Exception:
+            pass
 
-def __ModellingBase__createJacobian_mt__(self, model, resp):
-    from math import ceil
-    from multiprocessing import Process, Array
-    import numpy as np
+    for k, v in sorted(getattr(fop, '__dict__', {}).items()):
+        if k.startswith('_mtPool'):
+            continue
+        hv = __GLOBAL__stateHash_(v)
+        if hv is not None:
+            h = hash((h, k, hv))
+    return h
 
-    nModel = len(model)
-    # nData = len(resp)  # not used
 
-    fak = 1.05
+def __GLOBAL__response_mt_chunk_(shmName, shape, models, ids):
+    """Worker task: write responses for rows `ids` into the shared buffer."""
+    from multiprocessing import shared_memory
 
-    dModel = pgcore.RVector(len(model))
-    nProcs = self.multiThreadJacobian()
+    fop = __GLOBAL__mtFop__
+    shm = shared_memory.SharedMemory(name=shmName)
+    try:
+        buf = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        for m, i in zip(models, ids):
+            buf[i] = fop.response_mt(m, int(i))
+        del buf
+    finally:
+        shm.close()
+    return len(ids)
 
-    if sys.platform == 'win32' or sys.platform == 'darwin':
-        # strange pickle problem: see  python test_PhysicsManagers.py ves
-        from .logger import warn
-        warn('Multiprocess Jacobian currently unavailable for Win32 and Mac.')
-        nProcs = 1
 
-    if nProcs == 1:
-        self.createJacobian(model, resp)
-        return
+def __ModellingBase__workerPool__(self, nProcs):
+    """Return a persistent worker pool holding a copy of this operator.
 
-    shm = []
+    The pool is forked once and reused as long as the number of processes
+    and the operator state (see :py:func:`__GLOBAL__fopStateHash_`) do not
+    change.
+    """
+    import multiprocessing
+    from multiprocessing import resource_tracker
+    import weakref
+
+    key = (nProcs, __GLOBAL__fopStateHash_(self))
+    pool = getattr(self, '_mtPool', None)
+
+    if pool is not None and getattr(self, '_mtPoolKey', None) == key:
+        return pool
+
+    self.releaseWorkerPool()
 
+    # workers must share our tracker for the shared-memory result buffers
+    resource_tracker.ensure_running()
+
+    global __GLOBAL__mtFop__
     oldBertThread = self.threadCount()
     self.setThreadCount(1)
+    __GLOBAL__mtFop__ = self
+    try:
+        pool = multiprocessing.get_context('fork').Pool(nProcs)
+    finally:
+        __GLOBAL__mtFop__ = None
+        self.setThreadCount(oldBertThread)
+
+    self._mtPool = pool
+    self._mtPoolKey = key
+    self._mtPoolFinalizer = weakref.finalize(self, pool.terminate)
+    return pool
+
+
+def __ModellingBase__releaseWorkerPool__(self):
+    """Terminate the persistent worker pool if there is one."""
+    fin = getattr(self, '_mtPoolFinalizer', None)
+    if fin is not None:
+        fin()
+    self._mtPool = None
+    self._mtPoolKey = None
+    self._mtPoolFinalizer = None
+
+
+def __ModellingBase__modified__(self):
+    """Tell the operator that its state has changed.
+
+    Workers of the persistent pool (see :py:meth:`workerPool`) hold a copy
+    of the operator from fork time, so they are released and forked again
+    on next use. Called by setData, setMesh and setRegionProperties of
+    :py:class:`pygimli.frameworks.Modelling`; call it yourself after
+    changing state the workers can't see otherwise.
+    """
+    self.releaseWorkerPool()
 
-    # print("Model/Data/nProcs", nModel, nData, nProcs,
-    #       int(ceil(float(nModel)/nProcs)))
-    for pCount in range(int(ceil(float(nModel) / nProcs))):
-        procs = []
+
+def __ModellingBase__responsesPool__(self, models, nData, nProcs):
+    """Compute responses for all rows of models with the worker pool.
+
+    Rows are split into one chunk per process and all results land in a
+    single shared-memory buffer of shape (len(models), nData).
+    """
+    from multiprocessing import shared_memory
+
+    models = np.asarray(models, dtype=float)
+    pool = self.workerPool(nProcs)
+
+    shape = (len(models), nData)
+    shm = shared_memory.SharedMemory(create=True,
+                                     size=max(1, int(np.prod(shape)) * 8))
+    try:
+        chunks = [c for c in np.array_split(np.arange(len(models)),
+                                            min(nProcs, len(models)))
+                  if len(c)]
         if self.verbose():
-            print("Jacobian MT:(", pCount * nProcs, "--",
-                  (pCount + 1) * nProcs, ") /", nModel, '... ')
+            print("Responses MT: {0} models in {1} chunks on {2} processes"
+                  .format(len(models), len(chunks), nProcs))
 
-        for i in range(int(pCount * nProcs), int((pCount + 1) * nProcs)):
-            if i < nModel:
-                modelChange = pgcore.RVector(model)
-                modelChange[i] *= fak
-                dModel[i] = modelChange[i] - model[i]
+        tasks = [pool.apply_async(__GLOBAL__response_mt_chunk_,
+                                  (shm.name, shape, models[c], c))
+                 for c in chunks]
+        for t in tasks:
+            t.get()
 
-                shm.append(Array('d', len(resp)))
-                procs.append(
-                    Process(target=__GLOBAL__response_mt_shm_,
-                            args=(self, modelChange, shm[i], i)))
+        out = np.array(np.ndarray(shape, dtype=float, buffer=shm.buf))
+    finally:
+        shm.close()
+        shm.unlink()
+    return out
 
-        for i, p in enumerate(procs):
-            p.start()
 
-        for i, p in enumerate(procs):
-            p.join()
+def __ModellingBase__mtProcs__(self):
+    nProcs = self.multiThreadJacobian()
 
-        # if self.verbose():
-        #     print(dur(), 's')
-    self.setThreadCount(oldBertThread)
+    if sys.platform == 'win32' or sys.platform == 'darwin':
+        # forward operators can't be pickled and there is no fork
+        if nProcs > 1:
+            from .logger import warn
+            warn('Multiprocess Jacobian currently unavailable for '
+                 'Win32 and Mac.')
+        nProcs = 1
+    return nProcs
 
-    for i in range(nModel):
-        dData = np.array(shm[i]) - resp
-        self._J.setCol(i, dData / dModel[i])
 
+def __ModellingBase__createJacobian_mt__(self, model, resp):
+    """Brute force Jacobian using a persistent pool of worker processes."""
+    nProcs = self._mtProcs()
 
-def __ModellingBase__responses_mt__(self, models, respos):
+    if nProcs == 1:
+        self.createJacobian(model, resp)
+        return
 
-    nModel = len(models)
-    nProcs = self.multiThreadJacobian()
+    fak = 1.05
+    model = np.asarray(model, dtype=float)
+    resp = np.asarray(resp, dtype=float)
+
+    models = np.tile(model, (len(model), 1))
+    models[np.diag_indices(len(model))] *= fak
+    dModel = np.diag(models) - model
+
+    dData = self._responsesPool(models, len(resp), nProcs)
+
+    # fill in place, block matrices (e.g. LCModelling) hold a reference
+    self.jacobian().copy(pgcore.RMatrix((dData - resp).T / dModel))
+
+
+def __ModellingBase__responses_mt__(self, models, respos):
+    """Compute responses for many models, in parallel if enabled."""
+    nProcs = self._mtProcs()
 
     if nProcs == 1:
         for i, m in enumerate(models):
             respos[i] = self.response_mt(m, i)
         return
 
-    from math import ceil
-    from multiprocessing import Process, Array
-    import numpy as np
-
     if models.ndim != 2:
         raise BaseException("models need to be a matrix(N, nModel):" +
                             str(models.shape))
@@ -1007,38 +1135,7 @@ def __ModellingBase__responses_mt__(self, models, respos):
         raise BaseException("respos need to be a matrix(N, nData):" +
                             str(respos.shape))
 
-    nData = len(respos[0])
-    shm = []
-
-    oldBertThread = self.threadCount()
-    self.setThreadCount(1)
-
-    # print("*"*100)
-    # print(nModel, nProcs)
-    # print("*"*100)
-    for pCount in range(int(ceil(nModel / nProcs))):
-        procs = []
-        if self.verbose():
-            print(pCount * nProcs, "/", nModel)
-        for i in range(int(pCount * nProcs), int((pCount + 1) * nProcs)):
-
-            if i < nModel:
-                shm.append(Array('d', nData))
-                procs.append(
-                    Process(target=__GLOBAL__response_mt_shm_,
-                            args=(self, models[i], shm[i], i)))
-
-        for i, p in enumerate(procs):
-            p.start()
-
-        for i, p in enumerate(procs):
-            p.join()
-
-    self.setThreadCount(oldBertThread)
-
-    for i in range(nModel):
-        resp = np.array(shm[i])
-        respos[i] = resp
+    respos[:] = self._responsesPool(models, respos.shape[1], nProcs)
 
 
 class ModellingBaseMT__(pgcore.ModellingBase):
@@ -1061,6 +1158,11 @@ class ModellingBaseMT__(pgcore.ModellingBase):
 
 ModellingBaseMT__.createJacobian_mt = __ModellingBase__createJacobian_mt__
 ModellingBaseMT__.responses = __ModellingBase__responses_mt__
+ModellingBaseMT__.workerPool = __ModellingBase__workerPool__
+ModellingBaseMT__.releaseWorkerPool = __ModellingBase__releaseWorkerPool__
+ModellingBaseMT__.modified = __ModellingBase__modified__
+ModellingBaseMT__._responsesPool = __ModellingBase__responsesPool__
+ModellingBaseMT__._mtProcs = __ModellingBase__mtProcs__
 
 ModellingBase = ModellingBaseMT__
 
@@ -1164,6 +1266,8 @@ def search(what):
 # Import from submodules at the end
 from .mesh import Mesh, MeshEntity, Node
 from .datacontainer import DataContainer, DataContainerERT
+from .binarydata import (BinaryDataContainer, appendBinaryData,
+                         loadBinaryData, saveBinaryData)
 from .trans import *  # why do we need that?
 
 # from .matrix import (Cm05Matrix, LMultRMatrix, LRMultRMatrix, MultLeftMatrix,
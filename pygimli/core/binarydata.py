@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+"""Columnar binary format for data containers and time-lapse data.
+
+A .bdat file holds the sensor positions, every index and data token of a
+DataContainer as a column of its own and, optionally, time-lapse matrices
+(e.g. apparent resistivities of many time steps) as blocks of time steps::
+
+    magic | block | block | ... | header (json) | trailer
+
+All blocks are raw little-endian arrays aligned to 64 bytes, so every
+column can be memory mapped without touching the others. The json header
+describes the blocks and is found by the fixed size trailer at the end of
+the file. New time steps are appended as new blocks followed by a new
+header and trailer, i.e. nothing that is already written is changed. If an
+append is interrupted, the last complete header is still found.
+"""
+import json
+import struct
+from datetime import datetime
+
+import numpy as np
+
+from .logger import critical, warn
+from .core import DataContainer, R3Vector, RVector
+from . import core as _core
+
+_MAGIC = b"PGBDAT01"
+_TRAILER = struct.Struct("<QQ8s")  # header offset, header length, magic
+_ALIGN = 64
+
+
+def _writeBlock(fid, arr):
+    """Write array to the next aligned position and return its description."""
+    fid.write(b"\0" * (-fid.tell() % _ALIGN))
+    arr = np.asarray(arr)
+    arr = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder("<"))
+    desc = dict(offset=fid.tell(), dtype=arr.dtype.str, shape=arr.shape)
+    arr.tofile(fid)
+    return desc
+
+
+def _writeHeader(fid, header):
+    """Write header and, after everything else, the trailer."""
+    pos = fid.tell()
+    head = json.dumps(header).encode("utf-8")
+    fid.write(head)
+    fid.flush()
+    fid.write(_TRAILER.pack(pos, len(head), _MAGIC))
+    fid.truncate()
+
+
+def _parseHeader(buf, end):
+    """Header of the trailer ending at end or None if it is not valid."""
+    if end - _TRAILER.size < len(_MAGIC):
+        return None
+
+    pos, length, magic = _TRAILER.unpack(buf[end - _TRAILER.size:end])
+    if magic != _MAGIC or pos + length != end - _TRAILER.size or \
+            pos < len(_MAGIC):
+        return None
+
+    try:
+        header = json.loads(bytes(buf[pos:pos + length]).decode("utf-8"))
+    except ValueError:
+        return None
+
+    header["end"] = end
+    return header
+
+
+def _readHeader(fileName):
+    """Read the last complete json header of a .bdat file.
+
+    The returned header holds the position after its trailer as "end".
+    """
+    import mmap
+
+    with open(fileName, "rb") as fid:
+        if fid.read(len(_MAGIC)) != _MAGIC:
+            critical(fileName, "is no binary data file.")
+
+        with mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            header = _parseHeader(buf, len(buf))
+            if header is not None:
+                return header
+
+            # interrupted append: search for the last complete trailer
+            end = len(buf)
+            while header is None:
+                end = buf.rfind(_MAGIC, len(_MAGIC), end - 1) + len(_MAGIC)
+                if end < len(_MAGIC) * 2:
+                    critical(fileName, "has no valid header.")
+                header = _parseHeader(buf, end)
+
+    warn(fileName, "has an incomplete tail (interrupted append?), using the "
+         "last complete header. It is removed with the next append.")
+    return header
+
+
+def _timeSteps(matrices, nData):
+    """Time-major float blocks (nTimes x nData) of time-lapse matrices."""
+    blocks = {}
+    for key, M in matrices.items():
+        if np.ma.isMaskedArray(M):
+            M = np.ma.filled(M.astype(float), np.nan)
+
+        M = np.asarray(M, dtype=float)
+        if M.ndim == 1:
+            M = M[:, np.newaxis]
+
+        if M.shape[0] != nData:
+            critical("Matrix", key, "does not fit data size:", M.shape, nData)
+
+        blocks[key] = M.T
+
+    if len(set(M.shape[0] for M in blocks.values())) > 1:
+        critical("Time-lapse matrices differ in number of time steps.")
+
+    return blocks
+
+
+def _timeStrings(times):
+    """Times as iso strings (datetime) or floats for the json header."""
+    return [t.isoformat() if isinstance(t, datetime) else float(t)
+            for t in times]
+
+
+def saveBinaryData(fileName, data, times=None, **matrices):
+    """Save data container and time-lapse matrices into a .bdat file.
+
+    Parameters
+    ----------
+    fileName : str
+        file name, usually with suffix .bdat
+    data : pg.DataContainer
+        data container (or derived class), all index tokens and all
+        nonzero data tokens are stored
+    times : iterable [None]
+        datetime objects or numbers for the time steps
+    **matrices : dict
+        time-lapse matrices of shape (data.size(), nTimes), e.g. rhoa=DATA,
+        err=ERR as used by :py:class:`pygimli.physics.ert.TimelapseERT`.
+        Masked entries are stored as NaN.
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> import numpy as np
+    >>> import pygimli as pg
+    >>> from pygimli.core.binarydata import (saveBinaryData, loadBinaryData,
+    ...                                      appendBinaryData)
+    >>> data = pg.DataContainerERT()
+    >>> data.setSensors(pg.utils.grange(0, 3, n=4))
+    >>> data.addFourPointData(0, 1, 2, 3, rhoa=100.0)
+    0
+    >>> fileName = tempfile.mktemp(suffix=".bdat")
+    >>> saveBinaryData(fileName, data, rhoa=np.ones((1, 2)))
+    >>> appendBinaryData(fileName, rhoa=[2.0])
+    >>> store = loadBinaryData(fileName)
+    >>> print(store['rhoa'], store.timelapse('rhoa'))
+    [100.] [[1. 1. 2.]]
+    >>> os.remove(fileName)
+    """
+    nData = data.size()
+    blocks = _timeSteps(matrices, nData)
+    nTimes = [M.shape[0] for M in blocks.values()]
+    if times is not None and blocks and len(times) != nTimes[0]:
+        critical("Number of times does not fit matrices:", len(times),
+                 nTimes[0])
+
+    header = dict(version=1, cls=type(data).__name__, size=nData,
+                  sensorTokens=[], tokens={}, timelapse={},
+                  times=_timeStrings(times if times is not None else []))
+
+    with open(fileName, "wb") as fid:
+        fid.write(_MAGIC)
+        header["sensors"] = _writeBlock(
+            fid, np.array(data.sensorPositions(), dtype=float).reshape(-1, 3))
+
+        for key in data.dataMap().keys():
+            if data.isSensorIndex(key):
+                header["sensorTokens"].append(key)
+                col = np.array(data(key), dtype=np.int32)
+            elif data.haveData(key):
+                col = np.array(data(key), dtype=float)
+            else:
+                continue
+
+            header["tokens"][key] = _writeBlock(fid, col)
+
+        for key, M in blocks.items():
+            header["timelapse"][key] = [_writeBlock(fid, M)]
+
+        _writeHeader(fid, header)
+
+
+def appendBinaryData(fileName, times=None, **matrices):
+    """Append time steps to the time-lapse matrices of a .bdat file.
+
+    Only the new blocks and a new header are written behind the existing
+    ones, existing data are neither read nor rewritten. The new header
+    becomes valid with its trailer written last, so an interrupted append
+    leaves the file as it was before.
+
+    Parameters
+    ----------
+    fileName : str
+        existing .bdat file
+    times : iterable [None]
+        datetime objects or numbers for the new time steps
+    **matrices : dict
+        new time steps (data.size() x nNew or a vector for a single step)
+        for all time-lapse matrices of the file
+    """
+    header = _readHeader(fileName)
+    if header["timelapse"] and \
+            set(matrices.keys()) != set(header["timelapse"].keys()):
+        critical("Append all time-lapse matrices at once:",
+                 list(header["timelapse"].keys()))
+
+    blocks = _timeSteps(matrices, header["size"])
+    if not blocks:
+        return
+
+    nNew = next(iter(blocks.values())).shape[0]
+    if times is not None:
+        if len(times) != nNew:
+            critical("Number of times does not fit matrices:", len(times),
+                     nNew)
+        header["times"].extend(_timeStrings(times))
+    elif header["times"]:
+        critical("The file has times, so times for new steps are needed.")
+
+    with open(fileName, "r+b") as fid:
+        # behind the last complete trailer, i.e. a tail of an interrupted
+        # append is overwritten
+        fid.seek(header.pop("end"))
+        for key, M in blocks.items():
+            header["timelapse"].setdefault(key, []).append(
+                _writeBlock(fid, M))
+
+        _writeHeader(fid, header)
+
+
+class BinaryDataContainer(object):
+    """Lazy, memory-mapped access to a .bdat file.
+
+    Nothing but the header is read on creation. Every token column,
+    the sensor positions and the time-lapse matrices are memory mapped on
+    first access, so data['rhoa'] only touches that column. Use
+    :py:meth:`toDataContainer` to create a full DataContainer.
+    """
+
+    def __init__(self, fileName):
+        self.fileName = fileName
+        self._header = _readHeader(fileName)
+
+    def __repr__(self):
+        out = "Binary data ({0}): Sensors: {1} data: {2}, tokens: {3}".format(
+            self.fileName, self.sensorCount(), self.size(), self.tokens())
+        if self._header["timelapse"]:
+            out += ", {0} time steps of {1}".format(
+                self.nTimes(), list(self._header["timelapse"].keys()))
+        return out
+
+    def _map(self, desc):
+        shape = tuple(desc["shape"])
+        if np.prod(shape) == 0:
+            return np.zeros(shape, dtype=desc["dtype"])
+
+        return np.memmap(self.fileName, dtype=desc["dtype"], mode="r",
+                         offset=desc["offset"], shape=shape)
+
+    def size(self):
+        """Number of data."""
+        return self._header["size"]
+
+    def sensorCount(self):
+        """Number of sensors."""
+        return self._header["sensors"]["shape"][0]
+
+    def sensorPositions(self):
+        """Sensor positions as (sensorCount x 3) array."""
+        return self._map(self._header["sensors"])
+
+    def tokens(self):
+        """Names of all stored tokens."""
+        return list(self._header["tokens"].keys())
+
+    def isSensorIndex(self, token):
+        """Return True if token is a sensor index."""
+        return token in self._header["sensorTokens"]
+
+    def haveData(self, token):
+        """Return True if token is stored."""
+        return token in self._header["tokens"]
+
+    def __contains__(self, token):
+        return self.haveData(token)
+
+    def __getitem__(self, token):
+        """Memory-mapped column of a single token."""
+        if token not in self._header["tokens"]:
+            critical("There is no token", token, "in", self.fileName)
+
+        return self._map(self._header["tokens"][token])
+
+    def timelapseTokens(self):
+        """Names of the stored time-lapse matrices."""
+        return list(self._header["timelapse"].keys())
+
+    def nTimes(self):
+        """Number of time steps."""
+        for blocks in self._header["timelapse"].values():
+            return sum(b["shape"][0] for b in blocks)
+        return len(self._header["times"])
+
+    @property
+    def times(self):
+        """Times of the time steps (datetime objects or numbers)."""
+        return np.array([datetime.fromisoformat(t) if isinstance(t, str)
+                         else t for t in self._header["times"]])
+
+    def timelapse(self, token):
+        """Time-lapse matrix (size() x nTimes) of token.
+
+        A matrix written at once is returned as memory-mapped (transposed)
+        view. Appended time steps are concatenated into memory.
+        """
+        if token not in self._header["timelapse"]:
+            critical("There is no time-lapse matrix", token, "in",
+                     self.fileName)
+
+        blocks = [self._map(b) for b in self._header["timelapse"][token]]
+        if len(blocks) == 1:
+            return blocks[0].T
+
+        return np.concatenate(blocks).T
+
+    def frame(self, token, i):
+        """Memory-mapped values of token for the single time step i."""
+        if i < 0:
+            i += self.nTimes()
+
+        for b in self._header["timelapse"][token]:
+            if i < b["shape"][0]:
+                return self._map(b)[i]
+            i -= b["shape"][0]
+
+        critical("Time step out of range.")
+
+    def toDataContainer(self, tokens=None):
+        """Create a data container (of the stored class).
+
+        Parameters
+        ----------
+        tokens : list [None]
+            data tokens to read, sensor indices are always read
+        """
+        data = getattr(_core, self._header["cls"], DataContainer)()
+        data.setSensorPositions(R3Vector(
+            np.array(self.sensorPositions(), dtype=float)))
+        data.resize(self.size())
+        for key in self.tokens():
+            if self.isSensorIndex(key):
+                data.registerSensorIndex(key)
+            elif tokens is not None and key not in tokens:
+                continue
+
+            data.set(key, RVector(np.array(self[key], dtype=float)))
+
+        return data
+
+
+def loadBinaryData(fileName, lazy=True):
+    """Load a .bdat file.
+
+    Parameters
+    ----------
+    fileName : str
+        file name
+    lazy : bool [True]
+        Return a :py:class:`BinaryDataContainer` reading tokens on access,
+        otherwise a full DataContainer (as done by pg.load).
+    """
+    store = BinaryDataContainer(fileName)
+    if lazy:
+        return store
+
+    return store.toDataContainer()
@@ -16,6 +16,13 @@ rc = {
     'pyvista.backend': 'client',
     # auto: Use pyvista if installed or set it to 'fallback' to force fallback mode
     'globalCache': True,
+    # limits for the cache store (0: unlimited), least recently used
+    # entries are removed first
+    'cacheMaxSize': 0,  # in MB
+    'cacheMaxAge': 0,  # in days
+    # largest mesh (cells) for dense geostatistic constraints, larger ones
+    # use a sparse covariance (see GeostatisticConstraintsMatrix)
+    'geostatMaxDense': 5000,
     # call pg.wait() before the terminal script ends if there are pending 
     # mpl widgets and your backend this supports
     'waitOnExit': True,
@@ -28,7 +35,7 @@ def getCPUCount():
     if os.name == 'nt':
         return int(os.getenv('NUMBER_OF_PROCESSORS'))
     # Linux
-    elif sys.platform == 'linux2':
+    elif sys.platform.startswith('linux'):
         retv = 0
         with open('/proc/cpuinfo', 'rt') as cpuinfo:
             for line in cpuinfo:
@@ -39,7 +46,7 @@ def getCPUCount():
     # Please add similar hacks for MacOSX, Solaris, Irix,
     # FreeBSD, HPUX, etc.
     else:
-        raise RuntimeError('unknown platform')
+        return os.cpu_count() or 1
 
 
 def getConfigPath():
@@ -4,6 +4,7 @@
 Useful utility decorators.
 """
 import sys
+from importlib import import_module
 
 
 class renamed:
@@ -70,12 +71,22 @@ class AttrGetter:
             o = super().__new__(cls)
             o.oldgetattr = gt
             o.funcmap = {}
+            o.lazymap = {}
             return o
 
     def __call__(self, name):
         name2 = "_" + name
         if name2 in self.funcmap:
             return self.funcmap[name2]()
+        elif name in self.lazymap:
+            module, target = self.lazymap[name]
+            mod, _, attr = target.partition(':')
+            obj = import_module(mod, module.__name__)
+            if attr:
+                obj = getattr(obj, attr)
+            # bind it to the module so __getattr__ is not asked again
+            setattr(module, name, obj)
+            return obj
         else:
             return self.oldgetattr(name)
 
@@ -94,3 +105,28 @@ def moduleProperty(func):
     module.__getattr__ = ag
     ag.add(func)
     return func
+
+
+def moduleLazyImport(moduleName, names):
+    """Import module attributes on first access.
+
+    Expensive submodules are only imported when one of their attributes is
+    actually used. Can be combined with :py:func:`moduleProperty`.
+
+    Parameters
+    ----------
+    moduleName: str
+        Name of the module that gets the lazy attributes, usually `__name__`.
+    names: dict
+        Attribute name to import target. The target is a (relative) module
+        name, optionally followed by `:attr` to import an attribute of it,
+        e.g., `{'show': '.viewer:show', 'viewer': '.viewer'}`.
+    """
+    module = sys.modules[moduleName]
+    def base_getattr(name):
+        raise AttributeError(
+            f"module '{module.__name__}' has no attribute '{name}'")
+    ag = AttrGetter(getattr(module, '__getattr__', base_getattr))
+    module.__getattr__ = ag
+    for name, target in names.items():
+        ag.lazymap[name] = (module, target)
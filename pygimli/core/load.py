@@ -6,15 +6,12 @@ import os.path
 
 from importlib import import_module
 import contextlib
-from urllib.request import urlopen
 
 import numpy as np
 import pygimli as pg
 from pygimli.meshtools import (readFenicsHDF5Mesh, readGmsh, readPLC, readSTL,
                                readMeshIO)
-from pygimli.utils import readGPX
 # from pygimli.utils import cache  # not used yet
-from pygimli.physics.traveltime import load as loadTT
 
 
 __gimliExampleDataRepo__ = 'gimli-org/example-data/'
@@ -122,6 +119,10 @@ def load(fname, verbose=False, testAll=True, realName=None):
     >>> mesh.cellCount()
     4
     """
+    # import the method specific readers not before they are needed
+    from pygimli.utils import readGPX
+    from pygimli.physics.traveltime import load as loadTT
+
     ImportFilter = {
         # maybe inflate the importer list from the submodules itself.
         # Data
@@ -129,6 +130,7 @@ def load(fname, verbose=False, testAll=True, realName=None):
         ".data": pg.DataContainerERT,
         ".ohm": pg.DataContainerERT,  # BERT compatibility
         ".shm": pg.DataContainerERT,  # BERT compatibility
+        ".bdat": lambda f: pg.core.loadBinaryData(f, lazy=False),
         ".sgt": loadTT,
         ".gtt": loadTT,
         ".tom": loadTT,
@@ -230,6 +232,7 @@ def getMD5(fileName):
 def getUrlFile(url, fileName, timeout=10, verbose=False):
     """Write file from url. Path will be created."""
     import hashlib
+    from urllib.request import urlopen
     md5_hash = hashlib.md5()
 
     with contextlib.closing(urlopen(url, timeout=timeout)) as fp:
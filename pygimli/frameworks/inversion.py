@@ -10,7 +10,40 @@ from pygimli.solver.leastsquares import lsqr as lssolver
 from pygimli.core.trans import str2Trans
 from pygimli.utils import prettyFloat as pf
 from pygimli.utils.sparseMat2Numpy import sparseMatrix2Dense
-from .linesearch import lineSearch
+from pygimli.math.bfgsmatrix import BFGSMatrix
+from .linesearch import lineSearch, cachedResponse, ResponseCache
+
+
+def _quadraticStepLength(inv, dM, g=None, cWeight=1.0):
+    """Step length minimizing the quadratic approximation along dM.
+
+    Uses the Gauss-Newton curvature along the search direction, i.e., one
+    Jacobian product J*dM (fop.Sx), so J needs not to be formed.
+
+    Parameters
+    ----------
+    inv : InversionBase | ClassicInversion
+        Inversion instance providing fop, transformations, model, response,
+        errors, lam and the gradient.
+    dM : iterable
+        Search direction (transformed model).
+    g : iterable [inv.gradient()]
+        Gradient of the objective function.
+    cWeight : float | iterable [1.0]
+        Constraint weights.
+    """
+    if g is None:
+        g = inv.gradient()
+
+    tData = inv.dataTrans.deriv(inv.response) / \
+        inv.dataTrans.error(inv.response, inv.errorVals)
+    Jd = inv.fop.Sx(dM / inv.modelTrans.deriv(inv.model)) * tData
+    Cd = cWeight * inv.fop.constraints().mult(dM)
+    curv = pg.math.dot(Jd, Jd) + inv.lam * pg.math.dot(Cd, Cd)
+
+    if curv <= 0:
+        return 1.0
+    return -pg.math.dot(g, dM) / curv
 
 
 class InversionBase(object):
@@ -43,10 +76,14 @@ class InversionBase(object):
         self.cWeight = 1
         self.axs = None  # for showProgress only
         self.LSiter = 100
+        self.LSprecond = 'column'  # preconditioner for the LSQR solver
+        self.LSdPhi = 1e-3  # stop LSQR if the data misfit settles
         self.maxIter = kwargs.pop('maxIter', 20)
         self.G = None
         self._jacobianOutdated = False
         self.lineSearchMethod = None  # auto inter-quad
+        self.lineSearchWorkers = 1  # concurrent trial models
+        self.responseCache = ResponseCache()  # trial models of line search
         # self.minTau/maxTau
 
     @property
@@ -236,7 +273,7 @@ class InversionBase(object):
     def roughness(self, model=None, weighted=True):
         """Return (weighted) roughness vector."""
         if model is None:
-            model or self.model
+            model = self.model
 
         modelVector = self.modelTrans(model)
         pureRoughness = self.fop.constraints().mult(modelVector)
@@ -299,7 +336,9 @@ class InversionBase(object):
         single : bool
             reduce region to one unknown
         correlationLengths : [floats]
-            correlation lengths for geostatistical inversion (x', y', z')
+            correlation lengths for geostatistical inversion (x', y', z').
+            Meshes with more than pg.rc['geostatMaxDense'] (5000) cells use
+            a sparse tapered covariance instead of the dense one.
         dip : float [0]
             angle between x and x' (first correlation length)
         strike : float [0]
@@ -361,18 +400,16 @@ class InversionBase(object):
     def oneStep(self):
         """Carry out one iteration step (e.g. good for coupling etc.)."""
         dModel = self.modelUpdate()
-        print("dM: ", dModel)
-        tau, responseLS = lineSearch(self, dModel)
-        print("tau: ", tau)
+        tau, _ = lineSearch(self, dModel,
+                            method=self.lineSearchMethod or 'auto',
+                            nWorkers=self.lineSearchWorkers)
         pg.debug(f"tau={tau}")
         if tau >= 0.95:  # practically 1
             tau = 1
 
         self.model = self.modelTrans.update(self.model, dModel*tau)
-        if tau == 1.0:
-            self.response = responseLS
-        else:  # compute new response
-            self.response = self.fop.response(self.model)
+        # reuse the response if the line search evaluated this step
+        self.response = cachedResponse(self, self.model)
 
     def run(self, dataVals, errorVals=None, **kwargs):
         """Run inversion.
@@ -643,11 +680,28 @@ class InversionBase(object):
         """Gradient of the objective function."""
         return self.dataGradient() + self.modelGradient() * self.lam
 
+    def stepLength(self, dM, g=None):
+        """Step length minimizing the quadratic approximation along dM.
+
+        See :py:func:`_quadraticStepLength`.
+        """
+        return _quadraticStepLength(self, dM, g, cWeight=self.cWeight)
+
 
 class GaussNewtonInversion(InversionBase):
-    """Gauss-Newton based inversion."""
+    """Gauss-Newton based inversion.
+
+    The least-squares system of every step is solved by preconditioned LSQR
+    started from the (optimally scaled) previous model update.
+    """
     def __init__(self, fop=None, **kwargs):
         super().__init__(fop=fop, **kwargs)
+        self._dM = None  # last model update (LSQR warm start)
+
+    def reset(self):
+        """Reset warm start."""
+        super().reset()
+        self._dM = None
 
     def modelUpdate(self):
         """Compute (full) model update from inverse ."""
@@ -694,7 +748,14 @@ class GaussNewtonInversion(InversionBase):
             deltaG = (self.c - self.G * model) * sqrt(self.my)
             rhs = pg.cat(rhs, deltaG)
 
-        dM = lssolver(self.A, rhs, maxiter=self.LSiter, verbose=self.verbose)
+        x0 = None
+        if self._dM is not None and len(self._dM) == self.A.cols():
+            x0 = pg.Vector(self._dM)
+
+        dM = lssolver(self.A, rhs, x=x0, maxiter=self.LSiter,
+                      verbose=self.verbose, precond=self.LSprecond,
+                      scaleStart=True, nData=nData, dPhi=self.LSdPhi)
+        self._dM = dM
         return dM
 
 
@@ -714,21 +775,89 @@ class DescentInversion(InversionBase):
         return -self.gradient()
 
 
-class NLCGInversion(InversionBase):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+class NLCGInversion(DescentInversion):
+    """Nonlinear conjugate gradient (Polak-Ribiere+) minimization.
+
+    Only needs the gradient, i.e., fop.STy, and one product fop.Sx for the
+    step length in every iteration. The Jacobian is never formed if the
+    forward operator overwrites both.
+    """
+    def __init__(self, fop=None, **kwargs):
+        super().__init__(fop=fop, **kwargs)
+        self._g = None  # last gradient
+        self._dM = None  # last search direction
+
+    def reset(self):
+        """Reset search history."""
+        super().reset()
+        self._g = None
+        self._dM = None
 
     def modelUpdate(self):
-        return None
+        """Conjugate search direction scaled by its optimal step length."""
+        g = -super().modelUpdate()
 
+        dM = -g
+        if self._g is not None:
+            beta = max(pg.math.dot(g, g - self._g) /
+                       pg.math.dot(self._g, self._g), 0.0)
+            dM = dM + self._dM * beta
 
-class LBFGSInversion(InversionBase):
-    """Limited-memory BFGS minimization."""
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+            if pg.math.dot(dM, g) >= 0:  # no descent: restart
+                dM = -g
+
+        self._g = g
+        self._dM = dM
+        return dM * self.stepLength(dM, g)
+
+
+class LBFGSInversion(DescentInversion):
+    """Limited-memory BFGS minimization.
+
+    The inverse Hessian is approximated by a chain of
+    :py:class:`pygimli.math.bfgsmatrix.BFGSMatrix` built from the last
+    maxHistory model and gradient differences, so memory is bounded by
+    2*maxHistory model vectors. Only the gradient (fop.STy) is needed.
+    """
+    def __init__(self, fop=None, **kwargs):
+        self.maxHistory = kwargs.pop('maxHistory', 10)
+        super().__init__(fop=fop, **kwargs)
+        self._m = None  # last (transformed) model
+        self._g = None  # last gradient
+        self._sy = []  # history of model and gradient differences
+
+    def reset(self):
+        """Reset search history."""
+        super().reset()
+        self._m = None
+        self._g = None
+        self._sy = []
 
     def modelUpdate(self):
-        return None
+        """Quasi-Newton search direction -H*g."""
+        g = np.asarray(-super().modelUpdate())
+        m = np.asarray(self.modelTrans.fwd(self.model))
+
+        if self._g is not None:
+            s = m - self._m
+            y = g - self._g
+            if np.dot(s, y) > 1e-12 * np.linalg.norm(s) * np.linalg.norm(y):
+                self._sy.append((s, y))
+                self._sy = self._sy[-self.maxHistory:]
+
+        self._m = m
+        self._g = g
+
+        if len(self._sy) == 0:
+            dM = -g
+            return dM * self.stepLength(dM, g)
+
+        s, y = self._sy[-1]
+        H = pg.matrix.IdentityMatrix(len(g), np.dot(s, y) / np.dot(y, y))
+        for s, y in self._sy:
+            H = BFGSMatrix(H, s, y)
+
+        return -H.mult(g)
 
 
 # Note that there is a lot of redundancy but this class is to be removed upon
@@ -1217,7 +1346,9 @@ class ClassicInversion(object):
         single : bool
             reduce region to one unknown
         correlationLengths : [floats]
-            correlation lengths for geostatistical inversion (x', y', z')
+            correlation lengths for geostatistical inversion (x', y', z').
+            Meshes with more than pg.rc['geostatMaxDense'] (5000) cells use
+            a sparse tapered covariance instead of the dense one.
         dip : float [0]
             angle between x and x' (first correlation length)
         strike : float [0]
@@ -1628,6 +1759,13 @@ class ClassicInversion(object):
         """Gradient of the objective function."""
         return self.dataGradient() + self.modelGradient() * self.lam
 
+    def stepLength(self, dM, g=None):
+        """Step length minimizing the quadratic approximation along dM.
+
+        See :py:func:`_quadraticStepLength`.
+        """
+        return _quadraticStepLength(self, dM, g, cWeight=self.inv.cWeight())
+
 # END OF REMOVAL upon pg 1.6
 
 Inversion = ClassicInversion  # pg<1.6
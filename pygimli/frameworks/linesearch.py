@@ -2,8 +2,126 @@
 """pyGIMLi - Linesearch.
 
 Linesearch procedures used by various inversion frameworks.
+
+All procedures evaluate their trial models by :py:func:`forwardResponses`,
+i.e., concurrently for nWorkers > 1, and keep the responses in the
+:py:class:`ResponseCache` of the inversion instance, so the response of the
+accepted step needs not to be computed again.
 """
+import hashlib
+
 import numpy as np
+import pygimli as pg
+
+__GLOBAL__lsFop__ = None  # forward operator inherited by forked workers
+
+
+def _responseWorker(model):
+    """Worker task: forward response of a single trial model."""
+    return np.array(__GLOBAL__lsFop__.response(model), dtype=float)
+
+
+class ResponseCache(object):
+    """Forward responses of the trial models of a line search.
+
+    Responses are stored by the exact bytes of the model vector. Trial
+    models are built by the same model transformation update as the final
+    model, so the accepted step is found bitwise.
+    """
+
+    def __init__(self):
+        self._store = {}
+
+    @staticmethod
+    def key(model):
+        """Hash key of a model vector."""
+        return hashlib.sha1(np.ascontiguousarray(
+            model, dtype=float).tobytes()).hexdigest()
+
+    def __len__(self):
+        return len(self._store)
+
+    def __contains__(self, model):
+        return self.key(model) in self._store
+
+    def get(self, model):
+        """Cached response of model or None."""
+        return self._store.get(self.key(model))
+
+    def add(self, model, response):
+        """Store the response of model."""
+        self._store[self.key(model)] = response
+
+    def clear(self):
+        """Remove all responses."""
+        self._store = {}
+
+
+def _cache(inv):
+    """Response cache of an inversion instance, created if missing."""
+    cache = getattr(inv, 'responseCache', None)
+    if cache is None:
+        cache = ResponseCache()
+        inv.responseCache = cache
+    return cache
+
+
+def forwardResponses(inv, models, nWorkers=1):
+    """Forward responses of several trial models.
+
+    Responses found in the response cache of the inversion are reused. The
+    others are computed, in forked processes for nWorkers > 1, and added to
+    the cache.
+
+    Parameters
+    ----------
+    inv : pg.Inversion
+        pygimli Inversion (or any derived class) instance
+    models : list of iterable
+        trial models
+    nWorkers : int [1]
+        Number of parallel forward calculations. None uses the number of
+        available CPUs.
+
+    Returns
+    -------
+    responses : list
+        forward response for every model
+    """
+    cache = _cache(inv)
+    todo = {}
+    for m in models:
+        if m not in cache:
+            todo.setdefault(cache.key(m), m)
+    todo = list(todo.values())
+
+    if nWorkers is None:
+        nWorkers = pg.getCPUCount()
+    nWorkers = max(1, min(nWorkers, len(todo)))
+
+    if nWorkers > 1:
+        import multiprocessing
+
+        global __GLOBAL__lsFop__
+        __GLOBAL__lsFop__ = inv.fop
+        try:
+            with multiprocessing.get_context('fork').Pool(nWorkers) as pool:
+                responses = pool.map(_responseWorker,
+                                     [np.asarray(m) for m in todo])
+        finally:
+            __GLOBAL__lsFop__ = None
+    else:
+        responses = [inv.fop.response(m) for m in todo]
+
+    for m, r in zip(todo, responses):
+        cache.add(m, r)
+
+    return [cache.get(m) for m in models]
+
+
+def cachedResponse(inv, model):
+    """Response of model, taken from the line search if evaluated there."""
+    return forwardResponses(inv, [model])[0]
 
 
 def tauVector(taumin=0.01, taumax=1, logScale=False, n=21):
@@ -14,7 +132,7 @@ def tauVector(taumin=0.01, taumax=1, logScale=False, n=21):
         return np.linspace(taumin, taumax, n)
 
 
-def lineSearchExact(inv, dM, taus=None, show=False, **kwargs):
+def lineSearchExact(inv, dM, taus=None, show=False, nWorkers=1, **kwargs):
     """Line search by exact forward response.
 
     Parameters
@@ -31,15 +149,22 @@ def lineSearchExact(inv, dM, taus=None, show=False, **kwargs):
         use logarithmic scaling, otherwise linear
     show : bool
         show curve
+    nWorkers : int [1]
+        number of tau values evaluated concurrently
+
+    Returns
+    -------
+    tau : float
+        best tau value
+    response : array
+        forward response of the best tau value
     """
     if taus is None:
         taus = tauVector(**kwargs)
 
-    phis = np.zeros_like(taus)
-    for i, tau in enumerate(taus):
-        newModel = inv.modelTrans.update(inv.model, dM*tau)
-        newResponse = inv.fop.response(newModel)
-        phis[i] = inv.phi(newModel, newResponse)
+    models = [inv.modelTrans.update(inv.model, dM*tau) for tau in taus]
+    responses = forwardResponses(inv, models, nWorkers=nWorkers)
+    phis = np.array([inv.phi(m, r) for m, r in zip(models, responses)])
 
     if show:
         import matplotlib.pyplot as plt
@@ -48,9 +173,10 @@ def lineSearchExact(inv, dM, taus=None, show=False, **kwargs):
         else:
             plt.plot(taus, phis)
 
-    return taus[np.argmin(phis)], newResponse
+    return taus[np.argmin(phis)], responses[np.argmin(phis)]
+
 
-def lineSearchInter(inv, dM, taus=None, show=False, **kwargs):
+def lineSearchInter(inv, dM, taus=None, show=False, nWorkers=1, **kwargs):
     """Optimizes line search parameter by linear response interpolation.
 
     Parameters
@@ -75,7 +201,7 @@ def lineSearchInter(inv, dM, taus=None, show=False, **kwargs):
     dT = inv.dataTrans
     oldResponse = dT(inv.response)
     fullModel = inv.modelTrans.update(inv.model, dM)
-    fullResponse = dT(inv.fop.response(fullModel))
+    fullResponse = dT(forwardResponses(inv, [fullModel])[0])
     for i, tau in enumerate(taus):
         newModel = inv.modelTrans.update(inv.model, dM*tau)
         newResponse = dT.inv(oldResponse + (fullResponse - oldResponse) * tau)
@@ -88,7 +214,8 @@ def lineSearchInter(inv, dM, taus=None, show=False, **kwargs):
         else:
             plt.plot(taus, phis)
 
-    return taus[np.argmin(phis)], newResponse
+    tau = taus[np.argmin(phis)]
+    return tau, _cache(inv).get(inv.modelTrans.update(inv.model, dM*tau))
 
 
 def lineSearchInterOld(inv, dM, nTau=100, maxTau=1.0):
@@ -111,15 +238,19 @@ def lineSearchInterOld(inv, dM, nTau=100, maxTau=1.0):
 
     return taus[np.argmin(phi)], responseLS
 
-def lineSearchQuad(inv, dm, tautest=0.3, tau1=1, show=False, **kwargs):
-    """Optimize line search by fitting parabola by Phi(tau) curve."""
+def lineSearchQuad(inv, dm, tautest=0.3, tau1=1, show=False, nWorkers=1,
+                   **kwargs):
+    """Optimize line search by fitting parabola by Phi(tau) curve.
+
+    The two trial models are evaluated concurrently for nWorkers > 1.
+    """
     y0 = inv.phi()
     x1 = tau1
-    fullModel = np.exp(dm*x1)*inv.model
-    fullResponse = inv.fop.response(fullModel)
+    fullModel = inv.modelTrans.update(inv.model, dm*x1)
     xt = tautest
-    testModel = np.exp(dm*xt)*inv.model
-    testResponse = inv.fop.response(testModel)
+    testModel = inv.modelTrans.update(inv.model, dm*xt)
+    fullResponse, testResponse = forwardResponses(
+        inv, [fullModel, testModel], nWorkers=nWorkers)
     y1 = inv.phi(fullModel, fullResponse)
     yt = inv.phi(testModel, testResponse)
     rt = (yt-y0) / xt
@@ -140,7 +271,83 @@ def lineSearchQuad(inv, dm, tautest=0.3, tau1=1, show=False, **kwargs):
         ax.grid()
         ax.legend()
 
-    return xopt, None
+    return xopt, _cache(inv).get(inv.modelTrans.update(inv.model, dm*xopt))
+
+
+def lineSearchArmijo(inv, dm, tau0=1.0, c1=1e-4, rho=0.5, maxIter=10,
+                     nWorkers=1, **kwargs):
+    """Backtracking line search with Armijo (sufficient decrease) condition.
+
+    Starting from tau0, the step length is reduced until
+    phi(tau) <= phi(0) + c1 * tau * phi'(0)
+    holds, using the minimum of the parabola through phi(0), phi'(0) and the
+    last trial. For Gauss-Newton updates the full step is mostly accepted,
+    i.e., only a single forward calculation is needed. With nWorkers > 1,
+    nWorkers trial steps tau, tau*rho, tau*rho^2, ... are evaluated
+    concurrently and the longest acceptable one is taken.
+
+    The curvature (Wolfe) condition is not tested as it needs the Jacobian
+    for every trial model. Starting from the full step is sufficient to
+    avoid too short steps.
+
+    Parameters
+    ----------
+    inv : pg.Inversion
+        pygimli Inversion (or any derived class) instance
+    dm : iterable
+        model update direction
+    tau0 : float [1.0]
+        initial step length
+    c1 : float [1e-4]
+        sufficient decrease parameter
+    rho : float [0.5]
+        reduction factor for concurrent trial steps
+    maxIter : int [10]
+        maximum number of forward calculations
+    nWorkers : int [1]
+        number of trial steps evaluated concurrently
+
+    Returns
+    -------
+    tau : float
+        accepted (or best) step length
+    response : array
+        forward response of the accepted step
+    """
+    phi0 = inv.phi()
+    try:  # gradient() is half the gradient of phi
+        slope = 2 * pg.math.dot(inv.gradient(), dm)
+    except Exception:
+        slope = 0.0
+
+    if not slope < 0:  # unknown or no descent: demand decrease only
+        slope = 0.0
+
+    if nWorkers is None:
+        nWorkers = pg.getCPUCount()
+
+    best = (np.inf, tau0, None)
+    tau, nIter = tau0, 0
+    while nIter < maxIter:
+        taus = tau * rho**np.arange(min(max(1, nWorkers), maxIter - nIter))
+        models = [inv.modelTrans.update(inv.model, dm*t) for t in taus]
+        responses = forwardResponses(inv, models, nWorkers=nWorkers)
+        nIter += len(taus)
+        for t, m, r in zip(taus, models, responses):
+            phi = inv.phi(m, r)
+            if phi <= phi0 + c1 * t * slope:
+                return t, r
+            if phi < best[0]:
+                best = (phi, t, r)
+
+        t = taus[-1]
+        tau = t * rho
+        if slope < 0:
+            curv = phi - phi0 - slope * t
+            if curv > 0:
+                tau = min(max(-slope * t**2 / (2 * curv), 0.1 * t), 0.5 * t)
+
+    return best[1], best[2]
 
 def lineSearch(inv, dm, method='auto', **kwargs):
     """Carry out line search.
@@ -149,6 +356,9 @@ def lineSearch(inv, dm, method='auto', **kwargs):
     m + s*dm
     is minimized.
 
+    The responses of all trial models are kept in the response cache of the
+    inversion instance, see :py:func:`cachedResponse`.
+
     Parameter
     ---------
     inv : pg.Inversion
@@ -160,7 +370,10 @@ def lineSearch(inv, dm, method='auto', **kwargs):
         'exact' : function evaluation for every step
         'interp' : linear interpolation of response
         'quad' : fitting a parabola through 3 points
+        'armijo' : backtracking from the full step
         'auto': first try 'inter', then 'quad', else 0.1
+    nWorkers : int [1]
+        number of trial models evaluated concurrently
     taus : array [None]
         array containing the tau values to test, alternatively:
     taumin : float [0.01]
@@ -171,13 +384,23 @@ def lineSearch(inv, dm, method='auto', **kwargs):
         use logarithmic scaling, otherwise linear
     show : bool [False]
         show line search curve
+
+    Returns
+    -------
+    tau : float
+        step length
+    response : array|None
+        forward response of the step if computed during the search
     """
+    _cache(inv).clear()
     if method.lower().startswith("exact"):
         return lineSearchExact(inv, dm, **kwargs)
     elif method.lower().startswith("int"):
         return lineSearchInter(inv, dm, **kwargs)
     elif method.lower().startswith("quad"):
         return lineSearchQuad(inv, dm, **kwargs)
+    elif method.lower().startswith("armijo"):
+        return lineSearchArmijo(inv, dm, **kwargs)
     else:
         tau, response = lineSearchInter(inv, dm, **kwargs)
         if tau > 0.01 and tau <= 1:
@@ -5,7 +5,7 @@ import numpy as np
 import pygimli as pg
 from pygimli.frameworks import Inversion
 from pygimli.solver.leastsquares import lsqr as lssolver
-from .linesearch import lineSearch
+from .linesearch import lineSearch, cachedResponse
 
 
 class LSQRInversion(Inversion):
@@ -18,6 +18,14 @@ class LSQRInversion(Inversion):
         self.c = None
         self.my = 1.0
         self.LSQRiter = 200
+        self.LSQRprecond = 'column'  # preconditioner
+        self.LSQRdPhi = 1e-3  # stop if the data misfit settles
+        self._dM = None  # last model update (warm start)
+
+    def reset(self):
+        """Reset warm start."""
+        super().reset()
+        self._dM = None
 
     def setParameterConstraints(self, G, c, my=1.0):
         """Set parameter constraints G*p=c."""
@@ -76,14 +84,18 @@ class LSQRInversion(Inversion):
             deltaG = (self.c - self.G * model) * sqrt(self.my)
             rhs = pg.cat(pg.cat(deltaD, deltaC), deltaG)
 
-        dM = lssolver(self.A, rhs, maxiter=self.LSQRiter, verbose=self.verbose)
-        tau, responseLS = lineSearch(self, dM)
+        x0 = None
+        if self._dM is not None and len(self._dM) == self.A.cols():
+            x0 = pg.Vector(self._dM)
+
+        dM = lssolver(self.A, rhs, x=x0, maxiter=self.LSQRiter,
+                      verbose=self.verbose, precond=self.LSQRprecond,
+                      scaleStart=True, nData=nData, dPhi=self.LSQRdPhi)
+        self._dM = dM
+        tau, _ = lineSearch(self, dM)
         pg.debug(f"tau={tau}")
         self.model = tM.update(self.model, dM*tau)
-        if tau == 1.0:
-            self.inv.setResponse(responseLS)
-        else:  # compute new response
-            self.inv.setResponse(self.fop.response(self.model))
+        self.inv.setResponse(cachedResponse(self, self.model))
 
         # self.inv.setLambda(self.lam * self.inv.lambdaFactor())
         self.inv.setModel(self.model)
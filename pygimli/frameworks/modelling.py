@@ -4,6 +4,8 @@
 
 These are basic modelling proxies.
 """
+from functools import partial
+
 import numpy as np
 import pygimli as pg
 
@@ -148,6 +150,7 @@ class Modelling(pg.core.ModellingBase):
 
     def setData(self, data):
         """Set data (actual version)."""
+        self.modified()
         if isinstance(data, pg.DataContainer):
             self.setDataContainer(data)
         else:
@@ -236,6 +239,7 @@ class Modelling(pg.core.ModellingBase):
 
     def clearRegionProperties(self):
         """Clear all region parameter."""
+        self.modified()
         self._regionChanged = True
         self._regionProperties = {}
 
@@ -279,12 +283,15 @@ class Modelling(pg.core.ModellingBase):
         single : bool
             reduce region to one unknown
         correlationLengths : [floats]
-            correlation lengths for geostatistical inversion (x', y', z')
+            correlation lengths for geostatistical inversion (x', y', z').
+            Meshes with more than pg.rc['geostatMaxDense'] (5000) cells use
+            a sparse tapered covariance instead of the dense one.
         dip : float [0]
             angle between x and x' (first correlation length)
         strike : float [0]
             angle between y and y' (second correlation length)
         """
+        self.modified()
         if regionNr == '*':
             for regionNr in self.regionManager().regionIdxs():
                 self.setRegionProperties(regionNr, **kwargs)
@@ -470,8 +477,17 @@ class Block1DModelling(Modelling):
 
     Model space: [thickness_i, parameter_jk],
     with i = 0 - nLayers-1, j = (0 .. nLayers), k=(0 .. nPara)
+
+    Many models (e.g. all soundings of a profile) can be computed at once
+    with :py:meth:`responses`, for which derived classes can provide a
+    vectorized batchResponse.
     """
 
+    #: Data basis keywords that may differ between models in responses()
+    batchKeys = ()
+    #: Maximum number of models passed to batchResponse at once
+    batchSize = 500
+
     def __init__(self, nPara=1, nLayers=4, **kwargs):
         """Constructor.
 
@@ -526,6 +542,126 @@ class Block1DModelling(Modelling):
 
         # self._applyRegionProperties()
 
+    def _hasBatchResponse(self):
+        """Check if batchResponse is valid, i.e., not only inherited.
+
+        A derived class that changes response or response_mt without
+        providing its own batchResponse falls back to the single loop.
+        """
+        mro = type(self).__mro__
+
+        def _owner(name):
+            return min(i for i, c in enumerate(mro) if name in c.__dict__)
+
+        return _owner('batchResponse') <= min(_owner('response'),
+                                              _owner('response_mt'))
+
+    def batchResponse(self, models, **kwargs):
+        """Compute responses for all rows of models.
+
+        Overwrite this with a vectorized kernel in derived classes.
+        The default evaluates the models one after another.
+        Keyword arguments are data basis values that vary between the
+        models, see batchKeys.
+        """
+        if kwargs:
+            pg.critical("Can't vary", list(kwargs.keys()),
+                        "between models for", type(self))
+
+        return np.array([self.response(m) for m in models])
+
+    def responses(self, models, respos=None, **kwargs):
+        """Compute forward responses for many layered models at once.
+
+        Parameters
+        ----------
+        models : ndarray
+            Models of size (nModels x nPar), one model per row.
+        respos : ndarray [None]
+            Optional array of size (nModels x nData) to be filled.
+
+        Keyword Args
+        ------------
+        **kwargs :
+            Data basis values per model for the keys in batchKeys,
+            e.g., the flight height for airborne EM.
+
+        Returns
+        -------
+        resp : ndarray
+            Responses of size (nModels x nData).
+        """
+        models = np.atleast_2d(np.asarray(models, dtype=float))
+        kwargs = {k: np.broadcast_to(np.asarray(v, dtype=float),
+                                     (len(models),))
+                  for k, v in kwargs.items()}
+
+        if self._hasBatchResponse():
+            batch = self.batchResponse
+        else:
+            batch = partial(Block1DModelling.batchResponse, self)
+
+        resp = []
+        for i in range(0, len(models), self.batchSize):
+            resp.append(batch(models[i:i+self.batchSize],
+                              **{k: v[i:i+self.batchSize]
+                                 for k, v in kwargs.items()}))
+        resp = np.vstack(resp)
+
+        if respos is not None:
+            respos[:] = resp
+        return resp
+
+    def jacobians(self, models, resp=None, **kwargs):
+        """Brute force Jacobian matrices for many layered models at once.
+
+        All perturbed models are evaluated by a single call of
+        :py:meth:`responses`.
+
+        Parameters
+        ----------
+        models : ndarray
+            Models of size (nModels x nPar), one model per row.
+        resp : ndarray [None]
+            Responses of the models if already known.
+
+        Keyword Args
+        ------------
+        **kwargs :
+            Data basis values per model, see :py:meth:`responses`.
+
+        Returns
+        -------
+        J : ndarray
+            Jacobian matrices of size (nModels x nData x nPar).
+        """
+        fak = 1.05
+        models = np.atleast_2d(np.asarray(models, dtype=float))
+        nM, nP = models.shape
+        diag = np.arange(nP)
+
+        pert = np.repeat(models[:, np.newaxis, :], nP, axis=1)
+        pert[:, diag, diag] *= fak
+        dModel = pert[:, diag, diag] - models
+
+        kwPert = {k: np.repeat(np.broadcast_to(v, (nM,)), nP)
+                  for k, v in kwargs.items()}
+
+        if resp is None:
+            kwAll = {k: np.concatenate([np.broadcast_to(v, (nM,)),
+                                        kwPert[k]])
+                     for k, v in kwargs.items()}
+            allResp = self.responses(np.vstack([models,
+                                                pert.reshape(-1, nP)]),
+                                     **kwAll)
+            resp, dResp = allResp[:nM], allResp[nM:]
+        else:
+            resp = np.atleast_2d(np.asarray(resp, dtype=float))
+            dResp = self.responses(pert.reshape(-1, nP), **kwPert)
+
+        dResp = dResp.reshape(nM, nP, -1) - resp[:, np.newaxis, :]
+        return dResp.transpose(0, 2, 1) / dModel[:, np.newaxis, :]
+
     def drawModel(self, ax, model, **kwargs):
         """Draw model into a given axis."""
         pg.viewer.mpl.drawModel1D(ax=ax,
@@ -728,6 +864,7 @@ class MeshModelling(Modelling):
 
     def setMesh(self, mesh, ignoreRegionManager=False):
         """Set mesh and specify whether region manager can be ignored."""
+        self.modified()
         # keep a copy, just in case
         self._baseMesh = mesh
 
@@ -956,6 +1093,7 @@ class LCModelling(Modelling):
         self._nSoundings = 0
         self._parPerSounding = 0
         self._jac = None
+        self._batchKwargs = None  # per-sounding data basis for responses()
 
         self.soundingPos = None
 
@@ -984,6 +1122,10 @@ class LCModelling(Modelling):
         """Cut together forward responses of all soundings."""
         mods = np.asarray(par).reshape(self._nSoundings, self._parPerSounding)
 
+        if self._batchKwargs is not None:
+            return pg.Vector(self._fops1D[0].responses(
+                mods, **self._batchKwargs).ravel())
+
         resp = pg.Vector(0)
         for i in range(self._nSoundings):
             r = self._fops1D[i].response(mods[i])
@@ -996,8 +1138,17 @@ class LCModelling(Modelling):
         """Create Jacobian matrix by creating individual Jacobians."""
         mods = np.asarray(par).reshape(self._nSoundings, self._parPerSounding)
 
+        if self._batchKwargs is not None:
+            Js = self._fops1D[0].jacobians(mods, **self._batchKwargs)
+            for f, J in zip(self._fops1D, Js):
+                # fill in place, the block matrix holds a reference
+                f.jacobian().copy(pg.Matrix(np.ascontiguousarray(J)))
+            return
+
         for i in range(self._nSoundings):
             self._fops1D[i].createJacobian(mods[i])
+            if hasattr(self._fops1D[i], 'releaseWorkerPool'):
+                self._fops1D[i].releaseWorkerPool()
 
     def createParametrization(self, nSoundings, nLayers=4, nPar=1):
         """Create LCI mesh and suitable constraints informations.
@@ -1071,14 +1222,17 @@ class LCModelling(Modelling):
             self._jac = pg.matrix.BlockMatrix()
 
         self.fops1D = []
+        self._fops1D = []
         nData = 0
 
+        perSounding = [key for key, val in self._fopKwargs.items()
+                       if hasattr(val, '__iter__') and len(val) == nSoundings]
+
         for i in range(nSoundings):
             kwargs = {}
             for key, val in self._fopKwargs.items():
-                if hasattr(val, '__iter__'):
-                    if len(val) == nSoundings:
-                        kwargs[key] = val[i]
+                if key in perSounding:
+                    kwargs[key] = val[i]
                 else:
                     kwargs[key] = val
 
@@ -1100,6 +1254,15 @@ class LCModelling(Modelling):
         # print("Jacobian size:", self.J.rows(), self.J.cols(), nData)
         self.setJacobian(self._jac)
 
+        # all soundings at once if only batchable data basis values differ
+        self._batchKwargs = None
+        f = self._fops1D[0]
+        if isinstance(f, Block1DModelling) and f._hasBatchResponse() and \
+                set(perSounding) <= set(f.batchKeys) and \
+                len(set(len(d) for d in dataVals)) == 1:
+            self._batchKwargs = {key: np.asarray(self._fopKwargs[key])
+                                 for key in perSounding}
+
     def drawModel(self, ax, model, **kwargs):
         """Draw models as stitched 1D model section."""
         mods = np.asarray(model).reshape(self._nSoundings,
@@ -2,16 +2,71 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 import pygimli as pg
+from pygimli.core import __GLOBAL__fopStateHash_ as _fopStateHash
 from .modelling import MeshModelling
 
+__GLOBAL__mfFop__ = None  # MultiFrameModelling inherited by forked workers
+
+
+def _frameResponseWorker(shmName, shape, i, model, start):
+    """Worker task: write the response of frame i into the shared buffer."""
+    from multiprocessing import shared_memory
+
+    fop = __GLOBAL__mfFop__.fops[i]
+    shm = shared_memory.SharedMemory(name=shmName)
+    try:
+        buf = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        resp = fop.response(model)
+        buf[start:start+len(resp)] = resp
+        del buf
+    finally:
+        shm.close()
+    return i
+
+
+def _frameJacobianWorker(shmName, shape, i, model):
+    """Worker task: write the (dense) Jacobian of frame i into shared buffer."""
+    from multiprocessing import shared_memory
+
+    fop = __GLOBAL__mfFop__.fops[i]
+    shm = shared_memory.SharedMemory(name=shmName)
+    try:
+        buf = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        fop.createJacobian(model)
+        buf[:] = np.asarray(fop.jacobian())
+        del buf
+    finally:
+        shm.close()
+    return i
+
 
 class MultiFrameModelling(MeshModelling):
-    """Full frame (multiple fop parallel) forward modelling."""
+    """Full frame (multiple fop parallel) forward modelling.
+
+    The frames are independent forward problems sharing the mesh only, so
+    responses and Jacobian blocks can be computed concurrently.
+
+    Keyword Args
+    ------------
+    nWorkers: int [1]
+        Number of parallel workers for the frames. None uses the number of
+        available CPUs, 1 computes the frames one after another.
+    pool: str ['process']
+        Pool type. 'process' forks the operators once and reuses the pool
+        as long as the frame operators don't change (see :py:meth:`modified`)
+        and needs dense Jacobian matrices. 'thread' avoids any copying but is only
+        safe for thread-safe operators releasing the GIL, e.g. numpy/scipy
+        based ones. Core (C++) operators log into Python without holding
+        the GIL and therefore need processes.
+    """
 
-    def __init__(self, modellingOperator, scalef=1.0, **ini):
+    def __init__(self, modellingOperator, scalef=1.0, nWorkers=1,
+                 pool='process', **ini):
         """Init class and jacobian matrix."""
         super().__init__()
         self.ini = ini
+        self.nWorkers = nWorkers
+        self.pool = pool
         self.modellingOperator = modellingOperator
         self.jac = pg.matrix.BlockMatrix()
         self.scalef = scalef
@@ -93,17 +148,157 @@ class MultiFrameModelling(MeshModelling):
         # local modeltransform of the regionManager
         self.regionManager().setLocalTransFlag(False)
 
+    def _workerCount(self):
+        """Number of workers to use for the frames."""
+        nWorkers = self.nWorkers
+        if nWorkers is None:
+            nWorkers = pg.getCPUCount()
+        if self.pool not in ['thread', 'process']:
+            pg.critical("Unknown pool type:", self.pool,
+                        "Choose 'thread' or 'process'.")
+        return max(1, min(nWorkers, len(self.fops)))
+
+    def _forkPool(self, nWorkers):
+        """Return a process pool holding a copy of the current operators.
+
+        The pool is forked once and reused as long as the number of workers
+        and the state of all frame operators do not change.
+        """
+        import multiprocessing
+        from multiprocessing import resource_tracker
+        import weakref
+
+        key = (nWorkers, tuple(_fopStateHash(fop) for fop in self.fops))
+        pool = getattr(self, '_mfPool', None)
+        if pool is not None and getattr(self, '_mfPoolKey', None) == key:
+            return pool
+
+        self._releaseFramePool()
+
+        # workers must share our tracker for the shared-memory buffers
+        resource_tracker.ensure_running()
+        global __GLOBAL__mfFop__
+        __GLOBAL__mfFop__ = self
+        try:
+            pool = multiprocessing.get_context('fork').Pool(nWorkers)
+        finally:
+            __GLOBAL__mfFop__ = None
+
+        self._mfPool = pool
+        self._mfPoolKey = key
+        self._mfPoolFinalizer = weakref.finalize(self, pool.terminate)
+        return pool
+
+    def _releaseFramePool(self):
+        """Terminate the frame process pool if there is one."""
+        fin = getattr(self, '_mfPoolFinalizer', None)
+        if fin is not None:
+            fin()
+        self._mfPool = None
+        self._mfPoolKey = None
+        self._mfPoolFinalizer = None
+
+    def modified(self):
+        """Tell the operator that its (or a frame operator's) state changed.
+
+        Releases the frame process pool, so it is forked again on next use.
+        """
+        super().modified()
+        self._releaseFramePool()
+
     def response(self, model):
-        """Forward response."""
+        """Forward response (frames computed concurrently for nWorkers>1)."""
         mod = np.reshape(model, [len(self.fops), -1])
-        return np.concatenate([fop.response(mo) for fop, mo in
-                               zip(self.fops, mod)])
+        sizes = [fop.data.size() for fop in self.fops]
+        starts = np.cumsum([0] + sizes)
+        nWorkers = self._workerCount()
+
+        if nWorkers > 1 and self.pool == 'process':
+            from multiprocessing import shared_memory
+
+            shape = (int(starts[-1]),)
+            shm = shared_memory.SharedMemory(create=True,
+                                             size=max(1, shape[0] * 8))
+            try:
+                self._forkPool(nWorkers).starmap(
+                    _frameResponseWorker,
+                    [(shm.name, shape, i, mod[i], starts[i])
+                     for i in range(len(self.fops))])
+                return np.ndarray(shape, dtype=float, buffer=shm.buf).copy()
+            finally:
+                shm.close()
+                shm.unlink()
+
+        resp = np.zeros(starts[-1])
+
+        def frameResponse(i):
+            resp[starts[i]:starts[i+1]] = self.fops[i].response(mod[i])
+
+        if nWorkers > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=nWorkers) as pool:
+                list(pool.map(frameResponse, range(len(self.fops))))
+        else:
+            for i in range(len(self.fops)):
+                frameResponse(i)
+
+        return resp
 
     def createJacobian(self, model):
-        """Create Jacobian matrix."""
+        """Create Jacobian matrix (frames computed concurrently).
+
+        Every frame operator fills its own Jacobian that is already part of
+        the block matrix, so the block layout stays untouched.
+        """
         mod = np.reshape(model, [len(self.fops), -1])
-        for i, fop in enumerate(self.fops):
-            fop.createJacobian(mod[i])
+        nWorkers = self._workerCount()
+
+        if nWorkers > 1 and self.pool == 'process':
+            if all(isinstance(fop.jacobian(), pg.core.RMatrix)
+                   for fop in self.fops):
+                self._createJacobianProcess(mod, nWorkers)
+            else:
+                pg.warn("Process pool needs dense Jacobian matrices, "
+                        "creating frame Jacobians serially.")
+                nWorkers = 1
+
+        if nWorkers > 1 and self.pool == 'thread':
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=nWorkers) as pool:
+                list(pool.map(lambda i: self.fops[i].createJacobian(mod[i]),
+                              range(len(self.fops))))
+        elif nWorkers == 1:
+            for i, fop in enumerate(self.fops):
+                fop.createJacobian(mod[i])
+
+        self.jac.recalcMatrixSize()
+
+    def _createJacobianProcess(self, mod, nWorkers):
+        """Compute dense frame Jacobians on forked workers.
+
+        Every worker writes into its own shared-memory buffer that is
+        copied into the frame's Jacobian matrix afterwards.
+        """
+        from multiprocessing import shared_memory
+
+        shapes = [(fop.data.size(), len(mod[i]))
+                  for i, fop in enumerate(self.fops)]
+        shms = [shared_memory.SharedMemory(
+            create=True, size=max(1, int(np.prod(sh)) * 8)) for sh in shapes]
+        try:
+            self._forkPool(nWorkers).starmap(
+                _frameJacobianWorker,
+                [(shm.name, sh, i, mod[i]) for i, (shm, sh) in
+                 enumerate(zip(shms, shapes))])
+
+            for fop, shm, sh in zip(self.fops, shms, shapes):
+                buf = np.ndarray(sh, dtype=float, buffer=shm.buf)
+                fop.jacobian().copy(pg.Matrix(buf))
+                del buf
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
 
     def createDefaultStartModel(self):  # , dataVals):
         """Create standard starting model."""
@@ -1,16 +1,26 @@
+import numpy as np
+
 import pygimli as pg
 import pygimli.core as pgcore
 
 
 class BFGSMatrix(pgcore.MatrixBase):
-    """BFGS Matrix according to Nocedal&Wright, chap. 3."""
+    r"""BFGS Matrix according to Nocedal&Wright, chap. 3.
+
+    Inverse Hessian approximation
+    :math:`H_{k+1} = (I-\rho sy^T) H_k (I-\rho ys^T) + \rho ss^T`
+    with :math:`\rho=1/(y^Ts)`.
+    Chaining several BFGSMatrix instances with a limited number of s/y pairs
+    gives the limited-memory (L-BFGS) two-loop recursion.
+    """
 
     def __init__(self, Hk, s, y):
         """Construct Hk+1 from Hk and s/y vectors."""
+        super().__init__()
         self.Hk = Hk
-        self.s = s
-        self.y = y
-        self.rho = 1 / 1
+        self.s = np.asarray(s)
+        self.y = np.asarray(y)
+        self.rho = 1.0 / np.dot(self.y, self.s)
 
     def rows(self):
         return self.Hk.rows()
@@ -20,12 +30,11 @@ class BFGSMatrix(pgcore.MatrixBase):
 
     def mult(self, x):
         """Multiply using s/y vectors and Hk matrix."""
-        Imryst = x - sum(self.s*x)*self.rho*self.y
-        a = self.Hk.mult(Imryst)
-        Imrsyt = a - sum(self.y*a) * self.rho * self.s
-        return Imrsyt + sum(self.s*x) * self.rho * self.s
+        x = np.asarray(x)
+        sx = np.dot(self.s, x) * self.rho
+        a = np.asarray(self.Hk.mult(x - sx * self.y))
+        return a - np.dot(self.y, a) * self.rho * self.s + sx * self.s
 
     def transMult(self, y):
         """Multiply using s/y vectors and Hk matrix."""
         return self.mult(y)  # symmetric!
-
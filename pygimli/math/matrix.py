@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Some special and usefull matrices."""
 
+import os
+
 import numpy as np
 
 import pygimli as pg
@@ -129,7 +131,7 @@ class RealNumpyMatrix(MatrixBase):
 
         # print('real Matrix')
         if isinstance(mat, str):
-            self.M = np.load(mat)
+            self.M = np.load(mat, mmap_mode='r')
         else:
             if copy is True:
                 self.M = np.copy(mat)
@@ -166,7 +168,7 @@ def NumpyMatrix(mat, copy=False):
     algorithms (rows, cols, mult, transMult, save(numpy)).
     """
     if isinstance(mat, str):
-        mat = np.load(mat)
+        mat = np.load(mat, mmap_mode='r')
 
     if isinstance(mat[0][0], complex):
         return ComplexNumpyMatrix(mat, copy=copy)
@@ -441,7 +443,12 @@ class DiagonalMatrix(MatrixBase):
 
 @pg.cache
 def createCm05(A):
-    """Globally cached helper function to create Cm05Matrix."""
+    """Globally cached helper function to create Cm05Matrix.
+
+    Returns a SparseCm05Matrix for scipy sparse matrices.
+    """
+    if hasattr(A, 'tocsr'):
+        return pg.matrix.SparseCm05Matrix(A, verbose=True)
     return pg.matrix.Cm05Matrix(A, verbose=True)
 
 
@@ -497,16 +504,26 @@ class Cm05Matrix(MatrixBase):
     def save(self, fileName):
         """Save the content of this matrix.
 
+        Eigenvalues and eigenvectors are stored as plain arrays
+        (fileName.ew.npy, fileName.EV.npy) that can be memory mapped.
         Used for caching until pickling is possible for this class"""
-        np.save(fileName, dict(ew=self.ew, EV=self.EV), allow_pickle=True)
+        np.save(fileName + '.ew', self.ew, allow_pickle=False)
+        np.save(fileName + '.EV', self.EV, allow_pickle=False)
 
     def load(self, fileName):
         """Load the content of this matrix.
 
+        The eigenvectors are memory mapped (read-only) and used without
+        copying, so processes share them.
         Used for caching until pickling is possible for this class"""
-        d = np.load(fileName + '.npy', allow_pickle=True).tolist()
-        self.ew = d['ew']
-        self.EV = d['EV']
+        if os.path.exists(fileName + '.EV.npy'):
+            self.ew = np.load(fileName + '.ew.npy')
+            self.EV = np.load(fileName + '.EV.npy', mmap_mode='r')
+        else:  # old pickled format
+            d = np.load(fileName + '.npy', allow_pickle=True).tolist()
+            self.ew = d['ew']
+            self.EV = d['EV']
+        self._mul = None
 
     def rows(self):
         """Return number of rows (using underlying matrix)."""
@@ -525,6 +542,167 @@ class Cm05Matrix(MatrixBase):
         return self.mult(x)  # matrix is symmetric by definition
 
 
+class SparseCm05Matrix(MatrixBase):
+    """Matrix-free inverse square-root of a sparse covariance matrix.
+
+    A**(-0.5) * x is approximated by a Chebyshev polynomial in A that is
+    evaluated by the Clenshaw recurrence, so only sparse matrix-vector
+    products are needed. The polynomial is fixed, i.e. the operator is
+    exactly linear and symmetric.
+    """
+
+    def __init__(self, A, trsh=1e-4, tol=1e-3, maxDegree=1000,
+                 verbose=False):
+        """Constructor computing spectral bounds and polynomial.
+
+        Parameters
+        ----------
+        A : scipy.sparse matrix | str
+            symmetric positive definite (covariance) matrix or file name
+        trsh : float [1e-4]
+            smallest eigenvalue expected relative to the largest. A warning
+            is given if the spectrum extends below, the interval is widened
+            then (raising the degree). Lower bound for matrices that are not
+            positive definite.
+        tol : float [1e-3]
+            accuracy of the polynomial relative to the largest value
+        maxDegree : int [1000]
+            maximum polynomial degree
+        """
+        super().__init__(verbose)
+
+        if isinstance(A, str):
+            self.load(A)
+        else:
+            from scipy.sparse import csr_matrix
+
+            if verbose:
+                pg.tic(key='init cm05')
+
+            self.A = csr_matrix(A)
+            # Ritz values approach the extreme eigenvalues from inside
+            a, b = self._lanczosBounds(self.A,
+                                       maxIter=min(1000, self.A.shape[0]))
+            b *= 1.01
+            if a <= 0:
+                pg.warn('Covariance matrix is not positive definite, '
+                        'ignoring eigenvalues below', trsh * b)
+                a = trsh * b
+            elif 0.8 * a < trsh * b:
+                pg.warn('Smallest eigenvalue {0:.2e} is below trsh times the '
+                        'largest ({1:.2e}), widening the Chebyshev interval '
+                        'accordingly.'.format(a, trsh * b))
+            self.bounds = np.array([0.8 * a, b])
+            self.coeffs = self._chebyshevCoefficients(tol, maxDegree)
+
+            if verbose:
+                pg.info('(C) Chebyshev approximation of degree {0} on '
+                        '[{1:.2e}, {2:.2e}] took {3:.1f}s'.format(
+                            len(self.coeffs) - 1, *self.bounds,
+                            pg.dur(key='init cm05')))
+
+    @staticmethod
+    def _lanczosBounds(A, maxIter, rtol=5e-3):
+        """Estimate the extreme eigenvalues by plain Lanczos iteration.
+
+        The largest Ritz value converges fast, the smallest one slowly from
+        above. Iterates until it changes less than rtol within 10 steps.
+        """
+        from scipy.linalg import eigvalsh_tridiagonal
+
+        v = np.random.default_rng(1337).standard_normal(A.shape[0])
+        v /= np.linalg.norm(v)
+        vOld = np.zeros_like(v)
+        alpha, beta = np.zeros(maxIter), np.zeros(maxIter)
+        aOld = np.inf
+        for i in range(maxIter):
+            w = A @ v - (beta[i-1] if i > 0 else 0) * vOld
+            alpha[i] = w.dot(v)
+            w -= alpha[i] * v
+            beta[i] = np.linalg.norm(w)
+            if beta[i] == 0:  # invariant subspace found
+                break
+            vOld, v = v, w / beta[i]
+            if i % 10 == 9:
+                a = eigvalsh_tridiagonal(alpha[:i+1], beta[:i],
+                                         select='i', select_range=(0, 0))[0]
+                if abs(aOld - a) < rtol * abs(a):
+                    break
+                aOld = a
+        else:
+            if maxIter < A.shape[0]:
+                pg.warn('Lanczos estimate of the smallest eigenvalue not '
+                        'converged after', maxIter, 'iterations.')
+
+        theta = eigvalsh_tridiagonal(alpha[:i+1], beta[:i])
+        return theta[0], theta[-1]
+
+    def _chebyshevCoefficients(self, tol, maxDegree):
+        """Chebyshev coefficients of x**(-0.5) on the spectral interval."""
+        a, b = self.bounds
+        c = np.polynomial.chebyshev.chebinterpolate(
+            lambda t: ((b - a) / 2 * t + (a + b) / 2)**(-0.5), maxDegree)
+        # truncate where the remaining coefficients are small enough
+        tail = np.cumsum(np.abs(c[::-1]))[::-1]
+        n = np.argmax(tail < tol * a**(-0.5))
+        if n == 0:
+            pg.warn('Chebyshev approximation not converged with degree',
+                    maxDegree)
+            return c
+        return c[:n]
+
+    def save(self, fileName):
+        """Save the content of this matrix.
+
+        The sparse matrix (fileName.data|indices|indptr.npy), coefficients
+        and bounds are stored as plain arrays that can be memory mapped.
+        """
+        np.save(fileName + '.data', self.A.data, allow_pickle=False)
+        np.save(fileName + '.indices', self.A.indices, allow_pickle=False)
+        np.save(fileName + '.indptr', self.A.indptr, allow_pickle=False)
+        np.save(fileName + '.cheb', self.coeffs, allow_pickle=False)
+        np.save(fileName + '.bounds', self.bounds, allow_pickle=False)
+
+    def load(self, fileName):
+        """Load the content of this matrix, the sparse matrix is mapped."""
+        from scipy.sparse import csr_matrix
+        indptr = np.load(fileName + '.indptr.npy')
+        n = len(indptr) - 1
+        self.A = csr_matrix((np.load(fileName + '.data.npy', mmap_mode='r'),
+                             np.load(fileName + '.indices.npy',
+                                     mmap_mode='r'),
+                             indptr), shape=(n, n), copy=False)
+        self.coeffs = np.load(fileName + '.cheb.npy')
+        self.bounds = np.load(fileName + '.bounds.npy')
+
+    def rows(self):
+        """Return number of rows (using underlying matrix)."""
+        return self.A.shape[0]
+
+    def cols(self):
+        """Return number of columns (using underlying matrix)."""
+        return self.rows()
+
+    def mult(self, x):
+        """Multiplication from right-hand side (dot product)."""
+        x = np.asarray(x)
+        a, b = self.bounds
+        c = self.coeffs
+
+        def _B(v):  # A mapped to the interval [-1, 1]
+            return (2 * (self.A @ v) - (a + b) * v) / (b - a)
+
+        b1 = np.zeros_like(x, dtype=float)
+        b2 = np.zeros_like(b1)
+        for ck in c[:0:-1]:
+            b1, b2 = ck * x + 2 * _B(b1) - b2, b1
+        return c[0] * x + _B(b1) - b2
+
+    def transMult(self, x):
+        """Multiplication from right-hand side (dot product)."""
+        return self.mult(x)  # matrix is symmetric by definition
+
+
 class RepeatVMatrix(BlockMatrix):
     """Matrix repeating a base matrix N times vertically. Only A is stored.
 
@@ -755,6 +933,15 @@ class GeostatisticConstraintsMatrix(MatrixBase):
             angle of main axis corresponding to I[0] versus I[1] (3D)
         withRef : bool [False]
             neglect spur (reference model effect) that is otherwise corrected
+        sparse : bool [None]
+            use a tapered sparse covariance matrix and a matrix-free
+            inverse root (SparseCm05Matrix), by default for meshes with
+            more than maxDense cells
+        maxDense : int [pg.rc['geostatMaxDense']]
+            largest mesh (number of cells) for the dense eigenvalue
+            decomposition if sparse is not given
+        cutoff : float [3]
+            taper range of the sparse covariance in correlation lengths
         """
         super().__init__(kwargs.pop('verbose', False))
         self.withRef = kwargs.pop('withRef', False)
@@ -767,12 +954,24 @@ class GeostatisticConstraintsMatrix(MatrixBase):
             from pygimli.utils.geostatistics import covarianceMatrix
 
             if isinstance(CM, pgcore.Mesh):
-                CM = covarianceMatrix(CM, **kwargs)
+                mesh, CM = CM, None
+
+            if CM is None:
+                if mesh is None:
+                    pg.critical('Give either CM or mesh')
+
+                maxDense = kwargs.pop('maxDense', None)
+                if maxDense is None:
+                    maxDense = pg.rc['geostatMaxDense']
+
+                if kwargs.get('sparse', None) is None:
+                    kwargs['sparse'] = mesh.cellCount() > maxDense
+                    if kwargs['sparse']:
+                        pg.info('Using sparse geostatistic constraints for '
+                                f'{mesh.cellCount()} > {maxDense} cells '
+                                "(pg.rc['geostatMaxDense']).")
 
-            if CM is None and mesh is not None:
                 CM = covarianceMatrix(mesh, **kwargs)
-            else:
-                pg.critical('Give either CM or mesh')
 
             self.Cm05 = createCm05(CM)
 
@@ -787,28 +986,39 @@ class GeostatisticConstraintsMatrix(MatrixBase):
 
     @property
     def nModel(self):
-        return self.Cm05.EV.shape[0] if hasattr(self.Cm05, "EV") else 0
+        return self.Cm05.rows() if self.Cm05 is not None else 0
 
     def save(self, fileName):
         """Save content of this matrix.
 
+        Flags go to fileName.npy and the inverse root matrix to
+        fileName.Cm05.*, all without pickling.
         Used for caching until pickling is possible for this class
         """
-        self.Cm05.save(fileName + '-Cm05')
-        np.save(fileName, dict(verbose=self.verbose(),
-                               withRef=self.withRef,
-                               Cm05=fileName + '-Cm05'),
-                allow_pickle=True)
+        self.Cm05.save(fileName + '.Cm05')
+        np.save(fileName, np.array([self.verbose(), self.withRef]),
+                allow_pickle=False)
 
     def load(self, fileName):
         """Load the content of this matrix.
 
+        The eigenvectors of Cm05 are memory mapped.
         Used for caching until pickling is possible for this class
         """
-        d = np.load(fileName + '.npy', allow_pickle=True).tolist()
-        self.setVerbose(d['verbose'], )
-        self.withRef = d['withRef']
-        self.Cm05 = Cm05Matrix(d['Cm05'])
+        if os.path.exists(fileName + '.Cm05.EV.npy'):
+            verbose, self.withRef = np.load(fileName + '.npy').tolist()
+            self.setVerbose(verbose)
+            self.Cm05 = Cm05Matrix(fileName + '.Cm05')
+        elif os.path.exists(fileName + '.Cm05.cheb.npy'):
+            verbose, self.withRef = np.load(fileName + '.npy').tolist()
+            self.setVerbose(verbose)
+            self.Cm05 = SparseCm05Matrix(fileName + '.Cm05')
+        else:  # old pickled format
+            d = np.load(fileName + '.npy', allow_pickle=True).tolist()
+            self.setVerbose(d['verbose'], )
+            self.withRef = d['withRef']
+            self.Cm05 = Cm05Matrix(d['Cm05'])
+        self._spur = None
 
     def mult(self, x):
         return self.Cm05.mult(x) - self.spur * x
@@ -41,7 +41,7 @@ from .polytools import (createCircle, createCube, createCylinder, createFacet,
                         createRectangle, createWorld, exportPLC, mergePLC,
                         mergePLC3D, readPLC, syscallTetgen, extrude)
 
-from .quality import quality
+from .quality import quality, qualities, qualityReport
 
 #  This is neither functional nor good practice  #  why?
 #  __all__ = [name for name in dir() if '_' not in name]
@@ -81,5 +81,7 @@ __all__ = [
     'writePLC',
     'exportPLC',
     'createParaDomain2D',  # keep for backward compatibility
-    'quality'
+    'quality',
+    'qualities',
+    'qualityReport'
 ]
@@ -108,9 +108,251 @@ def nsr(cell):
     return 2 * r / R
 
 
+# Vectorized measures for all cells at once
+# corner node count -> cell type for 2D and 3D meshes (P2 nodes are skipped)
+_CELL_TYPES = {(2, 3): 'tri', (2, 6): 'tri', (2, 4): 'quad', (2, 8): 'quad',
+               (3, 3): 'tri', (3, 6): 'tri', (3, 4): 'tet', (3, 10): 'tet',
+               (3, 8): 'hex', (3, 20): 'hex'}
+_CORNERS = {'tri': 3, 'quad': 4, 'tet': 4, 'hex': 8}
+
+# neighbours of every corner, ordered for positive corner simplices
+_QUAD_CORNERS = [[i, (i+1) % 4, (i+3) % 4] for i in range(4)]
+_HEX_CORNERS = ([[i, (i+1) % 4, (i+3) % 4, i+4] for i in range(4)] +
+                [[i+4, (i+3) % 4 + 4, (i+1) % 4 + 4, i] for i in range(4)])
+
+# pairs of faces (opposite to the vertices k, l) meeting at a tet edge
+_TET_EDGES = [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)]
+
+
+__cellCorners__ = {}  # mesh hash -> cell corners of the last used mesh
+
+
+def _cellCorners(mesh):
+    """Corner node ids of all cells grouped by cell type.
+
+    Connectivity is read from the mesh in a single pass and cached for the
+    last used mesh.
+
+    Returns
+    -------
+    groups : dict
+        cell type -> (cell ids, node ids (nCells, nCorners))
+    """
+    key = mesh.hash()
+    if key in __cellCorners__:
+        return __cellCorners__[key]
+
+    cells = mesh.cells()
+    nN = np.fromiter((c.nodeCount() for c in cells), dtype=int,
+                     count=len(cells))
+    types = np.array([_CELL_TYPES.get((mesh.dim(), n), '') for n in nN])
+    nC = np.array([_CORNERS.get(t, 0) for t in types])
+    ids = np.fromiter((c.node(i).id() for c, k in zip(cells, nC)
+                       for i in range(k)), dtype=int, count=nC.sum())
+    start = np.cumsum(nC) - nC
+    groups = {}
+    for t, k in _CORNERS.items():
+        cIds = np.nonzero(types == t)[0]
+        if len(cIds):
+            groups[t] = (cIds, ids[start[cIds, None] + np.arange(k)])
+
+    __cellCorners__.clear()
+    __cellCorners__[key] = groups
+    return groups
+
+
+def _angles(a, b):
+    """Angles (in degrees) between the vectors in the last axis of a and b."""
+    cos = np.sum(a * b, axis=-1) / (np.linalg.norm(a, axis=-1) *
+                                    np.linalg.norm(b, axis=-1))
+    return np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+
+
+def _triangleQuality(P, measure, normal=None):
+    """Quality of triangles P (n, 3, 3).
+
+    If a normal is given, triangles with negative orientation get zero
+    quality.
+    """
+    e = P[:, [1, 2, 0]] - P[:, [0, 1, 2]]  # edges opposite to node 2, 0, 1
+    l = np.linalg.norm(e, axis=-1)
+    n = np.cross(e[:, 0], -e[:, 2])
+    A = 0.5 * np.linalg.norm(n, axis=-1)
+    if measure == "minimumAngle":
+        q = np.min(_angles(e, -e[:, [2, 0, 1]]), axis=1) / 60.
+    elif measure == "nsr":
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = 2 * A / np.sum(l, axis=1)
+            R = 0.25 * np.prod(l, axis=1) / A
+            q = np.nan_to_num(2 * r / R)
+    else:
+        q = 4 * np.sqrt(3) * A / np.sum(l**2, axis=1)
+
+    if normal is not None:
+        q[np.sum(n * normal, axis=-1) < 0] = 0.0
+    return q
+
+
+def _tetQuality(P, measure, signed=False):
+    """Quality of tetrahedra P (n, 4, 3).
+
+    For signed=True, tetrahedra with negative volume get zero quality.
+    """
+    a, b, c = [P[:, i] - P[:, 0] for i in (1, 2, 3)]
+    V6 = np.sum(a * np.cross(b, c), axis=-1)
+    V = np.abs(V6) / 6.
+    if measure == "minimumAngle":  # dihedral angle, 70.53 deg for regular
+        # outward face normals, face k is opposite to node k
+        n = np.stack([np.cross(P[:, (k+2) % 4] - P[:, (k+1) % 4],
+                               P[:, (k+3) % 4] - P[:, (k+1) % 4])
+                      for k in range(4)], axis=1)
+        side = np.sum(n * (P - P[:, [1, 2, 3, 0]]), axis=-1)
+        n *= -np.sign(side)[..., None]
+        dih = 180. - np.stack([_angles(n[:, k], n[:, l])
+                               for k, l in _TET_EDGES], axis=1)
+        q = np.min(dih, axis=1) / np.degrees(np.arccos(1. / 3.))
+    elif measure == "nsr":  # radius ratio
+        faces = [np.linalg.norm(np.cross(P[:, (k+2) % 4] - P[:, (k+1) % 4],
+                                         P[:, (k+3) % 4] - P[:, (k+1) % 4]),
+                                axis=-1) / 2 for k in range(4)]
+        r = 3 * V / np.sum(faces, axis=0)
+        Rv = (np.sum(a*a, axis=-1)[:, None] * np.cross(b, c) +
+              np.sum(b*b, axis=-1)[:, None] * np.cross(c, a) +
+              np.sum(c*c, axis=-1)[:, None] * np.cross(a, b))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            R = np.linalg.norm(Rv, axis=-1) / (12 * V)
+            q = np.nan_to_num(3 * r / R)
+    else:  # volume-edge ratio (Liu & Joe)
+        l2 = sum(np.sum((P[:, i] - P[:, j])**2, axis=-1)
+                 for i in range(4) for j in range(i+1, 4))
+        q = 12 * (3 * V)**(2. / 3.) / l2
+
+    if signed:
+        q[V6 < 0] = 0.0
+    return q
+
+
+def _cornerQuality(P, corners, measure):
+    """Worst quality of the corner simplices of quads or hexahedra.
+
+    Normalized with the corner simplex of the square or cube.
+    """
+    n, k = len(P), len(corners)
+    S = P[:, np.array(corners)].reshape(n * k, len(corners[0]), 3)
+    if k == 4:  # quadrilateral, orientation from the diagonals
+        normal = np.cross(P[:, 2] - P[:, 0], P[:, 3] - P[:, 1])
+        normal = np.repeat(normal, k, axis=0)
+        q = _triangleQuality(S, measure, normal=normal)
+        ref = _triangleQuality(np.array([[[0., 0, 0], [1, 0, 0], [0, 1, 0]]]),
+                               measure)
+    else:
+        ref = _tetQuality(np.array([[[0., 0, 0], [1, 0, 0],
+                                     [0, 1, 0], [0, 0, 1]]]), measure)
+        # accept both node orientations, inverted corners remain zero
+        q = np.maximum(
+            np.min(_tetQuality(S, measure, signed=True).reshape(n, k), 1),
+            np.min(_tetQuality(S[:, [0, 2, 1, 3]], measure,
+                               signed=True).reshape(n, k), 1))
+        return q / ref[0]
+
+    return np.min(q.reshape(n, k), axis=1) / ref[0]
+
+
+def _cornerAngleQuality(P, corners):
+    """Minimum angle between the edges at the corners normalized by 90."""
+    C = np.array(corners)
+    E = P[:, C[:, 1:]] - P[:, C[:, :1]]  # (n, nCorners, nEdges, 3)
+    m = E.shape[2]
+    ang = [_angles(E[:, :, i], E[:, :, j])
+           for i in range(m) for j in range(i+1, m)]
+    return np.min(ang, axis=(0, 2)) / 90.
+
+
+def qualities(mesh, measure="eta"):
+    r"""Return the quality of all cells computed with array operations.
+
+    Supports triangles and quadrilaterals (2D) as well as tetrahedra and
+    hexahedra (3D). All measures are 1 for the equilateral triangle,
+    regular tetrahedron, square and cube and 0 for degenerated cells.
+    Quadrilaterals and hexahedra take the worst of their corner simplices,
+    i.e. the triangle or tetrahedron made of a corner and its neighbours.
+
+    Parameters
+    ----------
+    mesh : mesh object
+        Mesh for which the quality is calculated.
+    measure : str ["eta"]
+        * "eta" - area-edge ratio for triangles, volume-edge ratio
+          :math:`12 (3V)^{2/3} / \sum l^2` for tetrahedra
+        * "nsr" - normalized shape ratio (radius ratio)
+        * "minimumAngle" - minimum angle (triangles and quads) or
+          dihedral angle (tetrahedra) normalized by the value of the
+          regular cell, hexahedra use the angles between the corner edges
+
+    Returns
+    -------
+    q : np.ndarray (mesh.cellCount())
+        Quality for each cell, NaN for unsupported cell types.
+    """
+    if measure not in ["eta", "nsr", "minimumAngle"]:
+        raise Exception("Unknown quality measure: " + measure)
+
+    P = np.array(mesh.positions())
+    q = np.full(mesh.cellCount(), np.nan)
+    for t, (cIds, ids) in _cellCorners(mesh).items():
+        X = P[ids]
+        if t == 'tri':
+            q[cIds] = _triangleQuality(X, measure)
+        elif t == 'tet':
+            q[cIds] = _tetQuality(X, measure)
+        else:
+            corners = _QUAD_CORNERS if t == 'quad' else _HEX_CORNERS
+            if measure == "minimumAngle":
+                q[cIds] = _cornerAngleQuality(X, corners)
+            else:
+                q[cIds] = _cornerQuality(X, corners, measure)
+
+    return q
+
+
+def qualityReport(mesh, measure="eta", bins=10, nWorst=10):
+    """Quality histogram and the worst cells of a mesh.
+
+    Parameters
+    ----------
+    mesh : mesh object
+        Mesh for which the quality is calculated.
+    measure : str ["eta"]
+        Quality measure, see :py:func:`qualities`.
+    bins : int|array [10]
+        Number of bins between 0 and 1 or bin edges.
+    nWorst : int [10]
+        Number of worst cells to return.
+
+    Returns
+    -------
+    report : dict
+        * quality - quality for each cell
+        * hist, edges - histogram counts and bin edges
+        * worst - ids of the nWorst worst cells (worst first)
+        * min, mean - minimum and mean quality
+    """
+    q = qualities(mesh, measure)
+    valid = np.isfinite(q)
+    hist, edges = np.histogram(q[valid], bins=bins, range=(0., 1.))
+    cIds = np.nonzero(valid)[0]
+    nWorst = max(0, min(nWorst, len(cIds)))
+    worst = cIds[np.argpartition(q[cIds], nWorst - 1)[:nWorst]] if nWorst \
+        else cIds[:0]
+    worst = worst[np.argsort(q[worst], kind="stable")]
+    return dict(quality=q, hist=hist, edges=edges, worst=worst,
+                min=np.min(q[cIds]) if len(cIds) else np.nan,
+                mean=np.mean(q[cIds]) if len(cIds) else np.nan)
+
+
 # Main function
 def quality(mesh, measure="eta"):
-    """Return the quality of a given triangular mesh.
+    """Return the quality of a given mesh (see :py:func:`qualities`).
 
     Parameters
     ----------
@@ -137,12 +379,7 @@ def quality(mesh, measure="eta"):
 
     See also
     --------
-    eta, nsr, minimumAngle
+    qualities, qualityReport, eta, nsr, minimumAngle
     """
 
-    # Implemented quality measures (Triangular meshses only.)
-    measures = {"eta": eta, "nsr": nsr, "minimumAngle": minimumAngle}
-
-    m = measures[measure]
-    qualities = [m(cell) for cell in mesh.cells()]
-    return qualities
+    return qualities(mesh, measure)
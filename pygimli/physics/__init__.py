@@ -3,19 +3,34 @@
 """
 Module containing submodules for various geophysical methods.
 """
+from pygimli.core.decorators import moduleLazyImport
 
 from .constants import Constants
 from .complexSpectrum import ComplexSpectrum
-from .ert import ERTManager, ERTModelling
-from .ves import VESManager
-from .em import VMDTimeDomainModelling
-from .traveltime import TravelTimeManager
 
-Refraction = TravelTimeManager  # Backward compatibility to pg 1.0
-
-from .em import FDEM, TDEM
-from .SIP import SIPSpectrum, SpectrumManager
-from .sNMR import MRS
+# The method managers are imported on first access only.
+moduleLazyImport(__name__, {
+    'ert': '.ert',
+    'ves': '.ves',
+    'em': '.em',
+    'traveltime': '.traveltime',
+    'SIP': '.SIP',
+    'sNMR': '.sNMR',
+    'gravimetry': '.gravimetry',
+    'petro': '.petro',
+    'seismics': '.seismics',
+    'ERTManager': '.ert:ERTManager',
+    'ERTModelling': '.ert:ERTModelling',
+    'VESManager': '.ves:VESManager',
+    'VMDTimeDomainModelling': '.em:VMDTimeDomainModelling',
+    'FDEM': '.em:FDEM',
+    'TDEM': '.em:TDEM',
+    'TravelTimeManager': '.traveltime:TravelTimeManager',
+    'Refraction': '.traveltime:TravelTimeManager',  # Backward comp. to pg 1.0
+    'SIPSpectrum': '.SIP:SIPSpectrum',
+    'SpectrumManager': '.SIP:SpectrumManager',
+    'MRS': '.sNMR:MRS',
+})
 
 constants = Constants
 
@@ -105,6 +105,26 @@ class HEMmodelling(Block1DModelling):
         """Multi-threaded forward response."""
         return self.response(par)
 
+    batchKeys = ('height',)
+
+    def batchResponse(self, models, height=None):
+        """Forward responses of many models (rows) at once.
+
+        Parameters
+        ----------
+        models : array (nModels x nPar)
+            thicknesses and resistivities for every model
+        height : array [self.height]
+            flight height for every model
+        """
+        if height is None:
+            height = self.height
+
+        ip, op = self.vmd_hem(height,
+                              models[:, self.nlay-1:self.nlay*2-1],
+                              models[:, :self.nlay-1])
+        return np.hstack([ip, op])
+
     def calc_forward(self, x, h, rho, d, epr, mur, quasistatic=False):
         """Calculate forward response."""
         field = np.zeros((self.f.size, x.size), complex)
@@ -204,101 +224,128 @@ class HEMmodelling(Block1DModelling):
             ap = ap[np.newaxis, :, :]  # (1, 100, nfreq)
             return b1, a, ap
 
+    def admittance(self, rho, d, epr, mur, lam):
+        """Admittance at the surface of layered halfspaces.
+
+        Parameters
+        ----------
+        rho, epr, mur : array (nSoundings x nLayers)
+            resistivity, relative permittivity and permeability
+        d : array (nSoundings x nLayers-1)
+            thickness
+        lam : array (nSoundings x nc x nf)
+            wave numbers
+
+        Returns
+        -------
+        b1 : array (nSoundings x nc x nf)
+        """
+        def _alpha(i):
+            return np.sqrt(lam**2 - self.wem * (epr[:, i] * mur[:, i])[
+                :, np.newaxis, np.newaxis] + self.iwm *
+                (mur[:, i] / rho[:, i])[:, np.newaxis, np.newaxis])
+
+        b = _alpha(rho.shape[1] - 1)
+        # recursive admittance computation from bottom to top
+        # tanh num unstable tanh(x)=(exp(x)-exp(-x))/(exp(x)+exp(-x))
+        for n in range(rho.shape[1] - 2, -1, -1):
+            alpha = _alpha(n)
+            ealphad = np.exp(-2.0 * alpha * d[:, n, np.newaxis, np.newaxis])
+            talphad = (1.0 - ealphad) / (1.0 + ealphad)
+            b = alpha * (b + alpha * talphad) / (alpha + b * talphad)
+        return b
+
     def vmd_hem(self, h, rho, d, epr=1., mur=1., quasistatic=False):
         """Vertical magnetic dipole (VMD) response.
 
+        All soundings are computed at once if h is an array and rho, d
+        (and epr, mur) are given as (nSoundings x nLayers) arrays.
+
         Parameters
         ----------
-        h : float
+        h : float | array
             flight height
         rho : array
             resistivity vector
         d : array
             thickness vector
+
+        Returns
+        -------
+        ip, op : array
+            in-phase and out-of-phase (quadrature) response, of size
+            (nSoundings x nFrequencies) for several soundings
         """
+        rho = np.asarray(rho, float)
+        single = rho.ndim == 1
+        rho = np.atleast_2d(rho)
+        nS, nl = rho.shape
+        d = np.reshape(np.asarray(d, float), (nS, nl - 1))
+        h = np.broadcast_to(np.asarray(h, float).ravel(), (nS,))
+        epr = np.broadcast_to(np.asarray(epr, float), (nS, nl))
+        mur = np.broadcast_to(np.asarray(mur, float), (nS, nl))
         # filter coefficients
-        if isinstance(epr, float):
-            epr = np.ones((len(rho),), float)*epr
-        if isinstance(mur, float):
-            mur = np.ones((len(rho),), float)*mur
         fc0, nc, nc0 = hankelfc(3)
         fc1, nc, nc0 = hankelfc(4)
-        # allocate arrays
-        nf = len(self.f)
-        lam = np.zeros((1, nc, nf), float)
-        alpha0 = np.zeros((1, nc, nf), complex)
-        delta0 = np.zeros((1, nc, nf), complex)
-        delta1 = np.zeros((1, nc, nf), complex)
-        delta2 = np.zeros((1, nc, nf), complex)
-        delta3 = np.zeros((1, nc, nf), complex)
-        aux0 = np.zeros((1, nf), complex)
-        aux1 = np.zeros((1, nf), complex)
-        aux2 = np.zeros((1, nf), complex)
-        aux3 = np.zeros((1, nf), complex)
-        Z = np.zeros(nf, complex)
-        # r0
-        r0 = np.copy(self.r)
+        fc0 = fc0[::-1, 0]
+        fc1 = fc1[::-1, 0]
+        # r0 (nS, nf)
+        r0 = np.tile(np.asarray(self.r, float), (nS, 1))
         # determine optimum r0 (shift nodes) for f > 1e4 and h > 100
         if quasistatic:
-            index = np.zeros(self.f.shape, np.bool)
+            index = np.zeros(r0.shape, bool)
         else:
-            index = np.logical_and(self.f >= 1e4, h >= 100.0)
+            index = np.logical_and(self.f >= 1e4, h[:, np.newaxis] >= 100.0)
 
         if np.any(index):
+            f = np.broadcast_to(self.f, r0.shape)[index]
             opt = np.floor(10.0 * np.log10(
-                self.r[index] * 2.0 * np.pi * self.f[index] / self.c0) + nc0)
-            r0[index] = self.c0 / (2.0 * np.pi * self.f[index]) * 10.0 ** (
+                r0[index] * 2.0 * np.pi * f / self.c0) + nc0)
+            r0[index] = self.c0 / (2.0 * np.pi * f) * 10.0 ** (
                 (opt + 0.5 - nc0) / 10.0)
-        # Wave numbers
+        # Wave numbers (nS, 100, nfreq)
         n = np.arange(nc0 - nc, nc0, 1, float)
         q = 0.1 * np.log(10)
-        lam = np.reshape(np.exp(-n[np.newaxis, :, np.newaxis] * q) /
-                         r0[np.newaxis, np.newaxis, :], (-1, nc, r0.size))
-        # (1, 100, nfreq)
+        lam = np.exp(-n * q)[np.newaxis, :, np.newaxis] / \
+            r0[:, np.newaxis, :]
         # wave number in air, quasistationary approximation
-        alpha0 = np.copy(lam) * complex(1, 0)  # (1, 100, nfreq)
+        alpha0 = lam * complex(1, 0)
         # wave number in air, full solution for f > 1e4
         if quasistatic:
-            index = np.zeros(self.f.shape, np.bool)
+            index = np.zeros(self.f.shape, bool)
         else:
             index = self.f >= 1e4
         if np.any(index):
             alpha0[:, :, index] = np.sqrt(
-                lam[:, :, index]**2 - np.tile(self.wem[index], (1, nc, 1)) +
-                np.tile(self.iwm[index], (1, nc, 1)) / 1e9)  # (1, 100 , nfreq)
+                lam[:, :, index]**2 - self.wem[index] +
+                self.iwm[index] / 1e9)
         # Admittanzen an der Oberfläche eines geschichteten Halbraums
-        b1, _, _ = self.downward(rho, d, 0.0, epr, mur, lam)
+        b1 = self.admittance(rho, d, epr, mur, lam)
         # Kernel functions
-        e = np.exp(-2.0 * h * alpha0)  # (1, 100, nfreq)
-        delta0 = (b1 - alpha0 * mur[0]) / (b1 + alpha0 * mur[0]) * e
-        delta1 = (2 * mur[0]) / (b1 + alpha0 * mur[0]) * e  # (1, 100, nfreq)
-        delta2 = 1 / h * e  # (1, 100, nfreq)
-        delta3 = 1 / (2 * h) * e  # (1, 100, nfreq)
+        h = h[:, np.newaxis, np.newaxis]
+        mu1 = mur[:, 0, np.newaxis, np.newaxis]
+        e = np.exp(-2.0 * h * alpha0)  # (nS, 100, nfreq)
+        delta0 = (b1 - alpha0 * mu1) / (b1 + alpha0 * mu1) * e
         # convolution
         # quasistationary approximation
         aux0 = np.sum(delta0 * lam ** 3 / alpha0 *
-                      np.tile(fc0[::-1].T[:, :, np.newaxis],
-                              (1, 1, self.f.size)), 1, complex) / r0
-        # full solution, partial integration
-        if np.any(index):
-            aux1 = np.sum(delta1 * lam ** 3 *
-                          np.tile(fc0[::-1].T[:, :, np.newaxis],
-                                  (1, 1, self.f.size)), 1, complex) / r0
-            aux2 = np.sum(
-                delta2 * lam * np.tile(fc0[::-1].T[:, :, np.newaxis],
-                                       (1, 1, self.f.size)), 1, complex)/r0
-            aux3 = np.sum(delta3 * lam ** 2 *
-                          np.tile(fc1[::-1].T[:, :, np.newaxis],
-                                  (1, 1, self.f.size)), 1, complex) / r0
+                      fc0[:, np.newaxis], 1) / r0
         # normed secondary field
-        # quasistationary approximation
         Z = self.r ** 3 * aux0 * self.scaling
-        # full solution
+        # full solution, partial integration
         if np.any(index):
+            delta1 = (2 * mu1) / (b1 + alpha0 * mu1) * e
+            delta2 = 1 / h * e
+            delta3 = 1 / (2 * h) * e
+            aux1 = np.sum(delta1 * lam ** 3 * fc0[:, np.newaxis], 1) / r0
+            aux2 = np.sum(delta2 * lam * fc0[:, np.newaxis], 1) / r0
+            aux3 = np.sum(delta3 * lam ** 2 * fc1[:, np.newaxis], 1) / r0
             Z[:, index] = (-self.r[index]**3 * aux1[:, index] +
                            self.r[index]**3 * aux2[:, index] -
                            self.r[index]**4 * aux3[:, index]) * self.scaling
-        return np.real(Z[0]), np.imag(Z[0])
+        if single:
+            return np.real(Z[0]), np.imag(Z[0])
+        return np.real(Z), np.imag(Z)
 
     def vmd_total_Ef(self, h, z, rho, d, epr, mur, tm):
         """VMD E-phi field (not used actively)."""
@@ -72,9 +72,12 @@ class VMDModelling(Block1DModelling):
 
     def calcEPhiF(self, f, rho, d, rmin=1, nr=41, ze=0, zs=0, tm=1):
         """Compute radial E field from vertical magnetic dipole (VMD) source.
+
+        Frequencies and models are vectorized, i.e., f can be an array and
+        rho/d can be given as (nModels x nLayers) arrays.
         Parameters
         ----------
-        f : float
+        f : float | array
             Frequency
         rho : iterable
             resistivity vector
@@ -89,96 +92,53 @@ class VMDModelling(Block1DModelling):
         zs : float [ze]
             z coordinate of source in Meter
         zs    z-Koordinate des Senders in Meter
-        """
-
-        # filter coefficients
-        q = 10**0.1
-        rr = rmin * q**(np.array(nr) - 1)
 
-        he = ze
-        hs = zs
-        # zm = hs - he  # not used
-        zp = hs + he
+        Returns
+        -------
+        ePhi : array
+            Of size (nr,) for a single frequency and model, otherwise
+            (nModels x nFrequencies).
+        """
+        if np.ndim(nr) > 0 or nr > 1:
+            raise Exception("more than one r .. check code here")
+        if ze > 0:
+            raise Exception('NeedTests')
+            # not used (uncommented)
+            # aa[i], aap[i], bt[i] = downward(k[i], f, rho, d, ze)
 
-        # rm = np.sqrt(rr**2 + zm**2)  # not used
+        rr = rmin
+        zp = zs + ze
         rp = np.sqrt(rr**2 + zp**2)
 
         fcJ1, nc0 = pg.utils.hankelFC(4)
         nc = len(fcJ1)
 
-        ncnr = nc + nr - 1
-
         # Vakuumwerte, nicht normiert
-        if ze <= 0:
-            ePhi = rr / rp**3
+        ePhi = rr / rp**3
 
         # Create Wavenumbers
-        nu = np.arange(1, ncnr + 1)
-
-        n = nc0 - nc + nu
+        n = nc0 - nc + np.arange(nc)
         q = np.log(10) * 0.1
-        k = np.exp(-(n-1) * q) / rmin
-
-        if ze <= 0:
-            ePhi = rr / rp**3.0
+        k = np.exp(-n * q) / rmin
 
         # Admittanzen for halfspace borders for each Wavenumbers k
-        bt = np.zeros(ncnr) * 1j
-        aa = np.zeros(ncnr) * 1j
-        for i in range(ncnr):
-            if ze <= 0:
-                bt[i] = self.btp(k[i], f, rho, d, type=1)
-            else:
-                raise Exception('NeedTests')
-                # not used (uncommented)
-                # aa[i], aap[i], bt[i] = downward(k[i], f, rho, d, ze)
+        f = np.asarray(f, float)
+        bt = self.btp(k, f[..., np.newaxis], rho, d, type=1)
 
         # Kernel functions
-        if ze <= 0:
-            e = np.exp(k * ze) * np.exp(k * zs)
-            delta = e * (bt - k) / (bt + k)
-        else:
-            raise Exception('NeedTests')
-            e = np.exp(k * zs)
-            delta = 2. * k**2. / (bt + k)*e
+        e = np.exp(k * ze) * np.exp(k * zs)
+        delta = e * (bt - k) / (bt + k)
 
         # convolution
-        aux3 = np.zeros(nr) * 1j
-
-        for n in range(nr):
-            for nn in range(nc):
-                nu = nn + n
-                mn = nc - nn
-
-                nnn = nc0 - nc + nu
-                k = np.exp(-nnn * q) / rmin
-
-                del0 = delta[nu]
-
-                if ze <= 0:
-                    del1 = del0 * k
-                    aux3[n] = aux3[n] + del1 * fcJ1[mn-1]
-                else:
-                    raise Exception('NeedTests')
-                    del3 = del0 * aa(nu)
-                    aux3[n] = aux3[n] + del3 * fcJ1[mn]
-
-            if nr > 1:
-                aux3[n] = aux3[n] / rr[n]
-                raise Exception("more than one r .. check code here")
-            else:
-                aux3[n] = aux3[n] / rr
-
-        if ze <= 0:
-            # Air
-            ePhi = ePhi - aux3
-        else:
-            raise Exception("more than one r .. check code here")
-            # Halfspace
-            ePhi = aux3
+        aux3 = np.sum(delta * k * fcJ1[::-1], axis=-1) / rr
+
+        # Air
+        ePhi = ePhi - aux3
 
         # Normalization
-        ePhi *= -tm * 1j * (2*pi*f) * pg.physics.constants.mu0 / (4*pi)
+        ePhi = ePhi * -tm * 1j * (2*pi*f) * pg.physics.constants.mu0 / (4*pi)
+        if ePhi.ndim == 0:
+            return ePhi.reshape(1)
         return ePhi
 
     def btp(self, k, f, rho, d, type=1):
@@ -188,19 +148,26 @@ class VMDModelling(Block1DModelling):
         f: frequency (1/s)
         rho: layer resitivities
         d: layer thicknesses
+
+        k and f need to be broadcastable, rho and d can be
+        (nModels x nLayers) arrays which adds a leading model axis.
         """
-        nl = len(rho)
+        rho = np.asarray(rho, float)
+        d = np.asarray(d, float)
+        nl = rho.shape[-1]
+        expand = (Ellipsis,) + (np.newaxis,) * np.ndim(k * f)
+
         c = 1j * pg.physics.constants.mu0 * 2 * pi * f
-        b = np.sqrt(k**2 + c/rho[nl-1])
+        b = np.sqrt(k**2 + c/rho[..., nl-1][expand])
 
         if nl > 1:
             beta = 1
             for nn in range(nl-2, -1, -1):
-                alpha = np.sqrt(k**2 + c / rho[nn])
+                alpha = np.sqrt(k**2 + c / rho[..., nn][expand])
                 if type == 2:
-                    beta = rho[nn] / rho[nn + 1]
+                    beta = (rho[..., nn] / rho[..., nn + 1])[expand]
 
-                cth = np.exp(-2. * d[nn] * alpha)
+                cth = np.exp(-2. * d[..., nn][expand] * alpha)
                 cth = (1-cth) / (1+cth)
                 b = (b + alpha * beta * cth) / (beta + cth * b / alpha)
 
@@ -256,16 +223,27 @@ class VMDTimeDomainModelling(VMDModelling):
         """par = [thicknesses(nLay), res(nlay + 1)]"""
         return self.response_mt(par, 0)
 
+    def batchResponse(self, models, **kwargs):
+        """Apparent resistivities of many models (rows) at once."""
+        nLay = (models.shape[1]-1)//2
+        return self.calcRhoa(models[:, :nLay], models[:, nLay:])
+
     def calcRhoa(self, thk, res):
-        """Compute apparent resistivity response"""
+        """Compute apparent resistivity response.
+
+        thk and res can be (nModels x nLayers) arrays for many models.
+        """
         a = sqrt(self.txArea / pi)  # TX coil radius
 
         ePhiTD, tD = self.calcEphiT(tMin=min(self.t), tMax=max(self.t),
                                     rho=res, d=thk, rMin=a, rMax=a, z=0,
                                     dipm=self.rxArea)
 
-        ePhi = np.exp(np.interp(np.log(self.t),
-                                np.log(tD), np.log(ePhiTD[:, 0])))
+        # log-log interpolation is linear in log(ePhi) and equal for all
+        logT = np.log(self.t)
+        P = np.array([np.interp(logT, np.log(tD), e)
+                      for e in np.eye(len(tD))]).T
+        ePhi = np.exp(np.log(ePhiTD[..., 0]) @ P.T)
 
         tmp = a**(4./3) * self.rxArea**(2./3) * \
             pg.physics.constants.mu0**(5./3) / (20**(2./3) * pi**(1./3))
@@ -274,7 +252,12 @@ class VMDTimeDomainModelling(VMDModelling):
         return rhoa
 
     def calcEphiT(self, tMin, tMax, rho, d, rMin, rMax, z, dipm):
-        """Compute radial electric field."""
+        """Compute radial electric field.
+
+        All frequencies of the sine transformation are computed at once.
+        rho and d can be (nModels x nLayers) arrays which adds a leading
+        model axis to the returned field.
+        """
         # nl = len(rho)
         r = pg.utils.niceLogspace(rMin, rMax, nDec=10)
         r = [rMin]
@@ -288,25 +271,17 @@ class VMDTimeDomainModelling(VMDModelling):
         nt = len(t)
         ncnt = nc + nt
 
-        fef = np.zeros((ncnt, nr), complex)
-        ePhi = np.zeros((nt, nr))
-
         omega = 10. ** (0.1 * (1 - (-nc + nc0 + np.arange(1, ncnt)))) / t[0]
 
-        for nn, o in enumerate(omega):
-            f = o / (2. * pi)
-            ePhiF = self.calcEPhiF(f, rho, d, ze=z, zs=0.,
-                                   rmin=r[0], nr=len(r), tm=1.0)
-
-            fef[nn, :] = ePhiF / sqrt(o)
-
-            ita = max(0, nn-nc)
-            ite = min(nt, nn+1)
-            for it in range(ita, ite):
-                itn = nc-nn+it-1
-                ePhi[it] = ePhi[it] - np.real(fef[nn]) * fcS[itn]
+        ePhiF = self.calcEPhiF(omega / (2. * pi), rho, d, ze=z, zs=0.,
+                               rmin=r[0], nr=len(r), tm=1.0)
+        fef = np.real(ePhiF / np.sqrt(omega))
 
-        for it in range(nt):
-            ePhi[it] = ePhi[it] * dipm * sqrt(2/pi / t[it])
+        # sine transformation as matrix (nt x nOmega)
+        W = np.zeros((nt, len(omega)))
+        for nn in range(len(omega)):
+            for it in range(max(0, nn-nc), min(nt, nn+1)):
+                W[it, nn] = fcS[nc-nn+it-1]
 
-        return ePhi, t
+        ePhi = -(fef @ W.T) * dipm * np.sqrt(2/pi / t)
+        return ePhi[..., np.newaxis] * np.ones(nr), t
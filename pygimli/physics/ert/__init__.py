@@ -24,8 +24,8 @@ from .ertIPManager import ERTIPManager
 from .ertModelling import ERTModelling, ERTModellingReference
 from .ertScheme import createData
 from .processing import (uniqueERTIndex, generateDataFromUniqueIndex,
-                         reciprocalIndices, fitReciprocalErrorModel,
-                         reciprocalProcessing)
+                         matchIndex, reciprocalIndices, reciprocalStatistics,
+                         fitReciprocalErrorModel, reciprocalProcessing)
 from .timelapse import TimelapseERT
 from .crosshole import CrossholeERT
 from pygimli.physics.ves import VESManager  # backward compatibility
@@ -231,8 +231,49 @@ class ERTModelling(ERTModellingBase):
         self._core.setMesh(mesh, ignoreRegionManager=True)
 
 
+def _solveWavenumberSystem(A, rhs):
+    """Factorize one wavenumber system once and solve for all sources.
+
+    Module level function so it can be dispatched to a process pool.
+
+    Args
+    ----
+    A: scipy.sparse matrix
+        System matrix :math:`S + k^2 M + R_k` for one wavenumber.
+    rhs: scipy.sparse matrix (nDof x nSources)
+        Right-hand sides, one column for each source (electrode).
+
+    Returns
+    -------
+    u: ndarray (nSources x nDof)
+        Potentials for all sources.
+    """
+    from scipy.sparse.linalg import splu
+
+    lu = splu(A.tocsc())
+    return np.ascontiguousarray(lu.solve(rhs.toarray()).T)
+
+
 class ERTModellingReference(ERTModellingBase):
-    """Reference implementation for 2.5D Electrical Resistivity Tomography."""
+    """Reference implementation for 2.5D Electrical Resistivity Tomography.
+
+    The wavenumber dependent subproblems are independent from each other.
+    The stiffness and mass parts of the system matrices are assembled only
+    once for each model, every wavenumber system is factorized once and all
+    electrode sources are solved as one block. The wavenumbers can be
+    distributed over a thread or process pool.
+
+    Keyword Args
+    ------------
+    nWorkers: int [None]
+        Number of parallel workers for the wavenumber systems.
+        None uses the number of available CPUs, 1 solves serially.
+    pool: str ['thread']
+        Pool type for the wavenumber systems, 'thread' or 'process'.
+    memoryBudget: float [None]
+        Maximum memory in MB for the temporary arrays of the sensitivity
+        kernel. None computes all cells in one chunk.
+    """
 
     def __init__(self, **kwargs):
         super().__init__()
@@ -247,6 +288,13 @@ class ERTModellingReference(ERTModellingBase):
         self.k = None
         self.w = None
 
+        self.nWorkers = kwargs.pop('nWorkers', None)
+        self.pool = kwargs.pop('pool', 'thread')
+
+        # optional memory budget (MB) for the sensitivity kernel
+        self.memoryBudget = kwargs.pop('memoryBudget', None)
+        self._cellIntegrals = None
+
     def response(self, model):
         """Solve forward task and return apparent resistivity for self.mesh."""
         # NOTE TODO can't be MT until mixed boundary condition depends on
@@ -263,7 +311,6 @@ class ERTModellingReference(ERTModellingBase):
         elecs = self.data.sensorPositions()
 
         nEle = len(elecs)
-        nData = self.data.size()
 
         self.resistivity = res = self.createMappedModel(model, -1.0)
 
@@ -284,15 +331,11 @@ class ERTModellingReference(ERTModellingBase):
         rhs = self.createRHS(mesh, elecs)
 
         # store all potential fields
+        self.subPotentials = self.solveWavenumbers(mesh, res, rhs, k,
+                                                   sourcePos=elecs)
+
         u = np.zeros((nEle, nDof))
-        self.subPotentials = [pg.Matrix(nEle, nDof) for i in range(len(k))]
-
-        for i, ki in enumerate(k):
-            uE = pg.solve(mesh, a=1./res, b=-(ki * ki)/res, f=rhs,
-                          bc={'Robin': ['*', self.mixedBC]},
-                          userData={'sourcePos': elecs, 'k': ki},
-                          verbose=False, stats=0, debug=False)
-            self.subPotentials[i] = uE
+        for i, uE in enumerate(self.subPotentials):
             u += w[i] * uE
 
         # collect potential matrix,
@@ -303,16 +346,12 @@ class ERTModellingReference(ERTModellingBase):
             pM[i] = pg.interpolate(mesh, u[i, :], destPos=elecs)
 
         # collect resistivity values for all 4 pole measurements
-        r = np.zeros(nData)
+        a = np.asarray(self.data['a'], dtype=int)
+        b = np.asarray(self.data['b'], dtype=int)
+        m = np.asarray(self.data['m'], dtype=int)
+        n = np.asarray(self.data['n'], dtype=int)
 
-        for i in range(nData):
-            iA = int(self.data['a'][i])
-            iB = int(self.data['b'][i])
-            iM = int(self.data['m'][i])
-            iN = int(self.data['n'][i])
-
-            uAB = pM[iA] - pM[iB]
-            r[i] = uAB[iM] - uAB[iN]
+        r = pM[a, m] - pM[b, m] - pM[a, n] + pM[b, n]
 
         self.lastResponse = r * self.data['k']
 
@@ -323,71 +362,236 @@ class ERTModellingReference(ERTModellingBase):
 
         return self.lastResponse
 
+    def createSystemParts(self, mesh, res):
+        """Create the wavenumber independent parts of the system matrices.
+
+        Args
+        ----
+        mesh: :gimliapi:`GIMLI::Mesh`
+            Modelling mesh.
+        res: iterable
+            Resistivity for each cell.
+
+        Returns
+        -------
+        S, M: scipy.sparse.csr_matrix
+            Stiffness and mass matrix, both scaled by the conductivity.
+        """
+        sigma = pg.Vector(1. / np.asarray(res))
+        S = pg.solver.createStiffnessMatrix(mesh, sigma)
+        M = pg.solver.createMassMatrix(mesh, sigma)
+        return pg.utils.toCSR(S), pg.utils.toCSR(M)
+
+    def createSystemMatrix(self, S, M, k, boundaries, sourcePos):
+        """Create the system matrix for one wavenumber.
+
+        Args
+        ----
+        S, M: scipy.sparse.csr_matrix
+            Wavenumber independent parts, see :py:meth:`createSystemParts`.
+        k: float
+            Wavenumber.
+        boundaries: list
+            Boundaries with mixed boundary conditions.
+        sourcePos: iterable
+            Source positions forwarded to the mixed boundary conditions.
+
+        Returns
+        -------
+        A: scipy.sparse.csr_matrix
+            System matrix :math:`S + k^2 M` including the mixed boundary
+            conditions.
+        """
+        R = pg.matrix.SparseMapMatrix(S.shape[0], S.shape[1])
+        pg.solver.assembleRobinBC(R, [[b, self.mixedBC] for b in boundaries],
+                                  userData={'sourcePos': sourcePos, 'k': k})
+        return S + M * (k * k) + pg.utils.toCOO(R)
+
+    def solveWavenumbers(self, mesh, res, rhs, k, sourcePos):
+        """Solve the 2.5D subproblems for all wavenumbers and all sources.
+
+        Stiffness and mass matrix are assembled once. Each wavenumber system
+        is factorized once and solved for all sources as one block. The
+        wavenumbers are distributed over a pool of self.nWorkers workers
+        of type self.pool ('thread' or 'process').
+
+        Args
+        ----
+        mesh: :gimliapi:`GIMLI::Mesh`
+            Modelling mesh.
+        res: iterable
+            Resistivity for each cell.
+        rhs: ndarray (nSources x nDof)
+            Right-hand side for each source.
+        k: iterable
+            Wavenumbers.
+        sourcePos: iterable
+            Source positions.
+
+        Returns
+        -------
+        u: list of ndarray (nSources x nDof)
+            Potentials for each wavenumber.
+        """
+        from scipy.sparse import csc_matrix
+
+        S, M = self.createSystemParts(mesh, res)
+        boundaries = [b for b in mesh.boundaries()
+                      if b.marker() == pg.core.MARKER_BOUND_MIXED]
+        B = csc_matrix(np.asarray(rhs).T)
+
+        nWorkers = self.nWorkers
+        if nWorkers is None:
+            nWorkers = pg.getCPUCount()
+        nWorkers = max(1, min(nWorkers, len(k)))
+
+        if nWorkers == 1:
+            return [_solveWavenumberSystem(
+                self.createSystemMatrix(S, M, ki, boundaries, sourcePos), B)
+                    for ki in k]
+
+        if self.pool == 'process':
+            from concurrent.futures import ProcessPoolExecutor as Executor
+        elif self.pool == 'thread':
+            from concurrent.futures import ThreadPoolExecutor as Executor
+        else:
+            pg.critical("Unknown pool type:", self.pool,
+                        "Choose 'thread' or 'process'.")
+
+        with Executor(max_workers=nWorkers) as pool:
+            # the assembly of the mixed boundary conditions needs the GIL so
+            # it is done here while the workers already solve.
+            jobs = [pool.submit(_solveWavenumberSystem,
+                                self.createSystemMatrix(S, M, ki,
+                                                        boundaries, sourcePos),
+                                B) for ki in k]
+            return [j.result() for j in jobs]
+
+    def createCellIntegrals(self, mesh):
+        r"""Precompute the per cell mass and gradient integrals.
+
+        The integrals only depend on the mesh and are computed once for
+        every new mesh. Cells are grouped by their node count so the
+        sensitivity kernel can work on dense stacked arrays.
+
+        Args
+        ----
+        mesh: :gimliapi:`GIMLI::Mesh`
+            Modelling mesh.
+
+        Returns
+        -------
+        groups: list of dict
+            For each cell type: 'marker' (nCells), 'ids' (nCells x nNodes),
+            'M' and 'S' (nCells x nNodes x nNodes) for the mass
+            :math:`\int u_i u_j` and gradient
+            :math:`\int \nabla u_i \cdot \nabla u_j` integrals.
+        """
+        key = hash(mesh)
+        if self._cellIntegrals is not None and self._cellIntegrals[0] == key:
+            return self._cellIntegrals[1]
+
+        Me = pg.matrix.ElementMatrix()
+        Se = pg.matrix.ElementMatrix()
+
+        groups = {}
+        for c in mesh.findCellByMarker(0, -1):
+            Me.u2(c)
+            Se.ux2uy2uz2(c)
+            g = groups.setdefault(c.nodeCount(),
+                                  {'marker': [], 'ids': [], 'M': [], 'S': []})
+            g['marker'].append(c.marker())
+            g['ids'].append(np.array(Me.ids()))
+            g['M'].append(np.array(Me.mat()))
+            g['S'].append(np.array(Se.mat()))
+
+        groups = [{name: np.array(v) for name, v in g.items()}
+                  for g in groups.values()]
+
+        self._cellIntegrals = (key, groups)
+        return groups
+
     def createJacobian(self, model):
-        """Create Jacobian matrix for model and store it in self.jacobian()."""
+        """Create Jacobian matrix for model and store it in self.jacobian().
+
+        The sensitivities are computed with a batched kernel. For every
+        wavenumber the cell integrals are contracted with the potentials of
+        all electrodes by stacked matrix products into a table of electrode
+        pair sensitivities for each cell. The ABMN data rows are gathered
+        from this table once and summed into the model parameters by a
+        single sparse matrix product.
+        If self.memoryBudget (in MB) is set, the cells are processed in
+        chunks so the temporary arrays stay within this budget.
+        """
+        from scipy.sparse import csr_matrix
+
         if self.subPotentials is None:
             self.response(model)
 
-        J = self.jacobian()
-        J.resize(self.data.size(), self.parameterCount)
-
-        cells = self.mesh().findCellByMarker(0, -1)
-        Si = pg.matrix.ElementMatrix()
-        St = pg.matrix.ElementMatrix()
-
-        u = self.subPotentials
+        nData = self.data.size()
+        nPar = self.parameterCount
 
         pg.tic()
         if self.verbose:
             print("Calculate sensitivity matrix for model: ",
                   min(model), max(model))
 
-        Jt = pg.Matrix(self.data.size(), self.parameterCount)
+        groups = self.createCellIntegrals(self.mesh())
 
-        for kIdx, w in enumerate(self.w):
-            k = self.k[kIdx]
-            w = self.w[kIdx]
+        a = np.asarray(self.data['a'], dtype=int)
+        b = np.asarray(self.data['b'], dtype=int)
+        m = np.asarray(self.data['m'], dtype=int)
+        n = np.asarray(self.data['n'], dtype=int)
 
-            Jt *= 0.
-            A = pg.matrix.ElementMatrixMap()
+        nEle = self.subPotentials[0].shape[0]
 
-            for i, c in enumerate(cells):
-                modelIdx = c.marker()
+        J = np.zeros((nPar, nData))
 
-                # 2.5D
-                Si.u2(c)
-                Si *= k * k
-                Si += St.ux2uy2uz2(c)
+        for g in groups:
+            nCells, nNodes = g['ids'].shape
 
-                # 3D
-                # Si.ux2uy2uz2(c); w = w* 2
+            if self.memoryBudget is not None:
+                # pair table + matrix product temporaries, electrode
+                # potentials and gathered data sensitivities for one cell
+                perCell = (3 * nEle * nEle + 4 * nEle * nNodes + 2 * nData) * 8
+                chunk = max(1, int(self.memoryBudget * 1024**2 // perCell))
+            else:
+                chunk = nCells
+
+            for start in range(0, nCells, chunk):
+                sl = slice(start, min(start + chunk, nCells))
+                ids = g['ids'][sl]
+
+                # sensitivity for all electrode pairs (cell x ele x ele)
+                F = np.zeros((len(ids), nEle, nEle))
 
-                A.add(modelIdx, Si)
+                for kIdx, k in enumerate(self.k):
+                    E = g['S'][sl] + (k * k) * g['M'][sl]
 
-            for dataIdx in range(self.data.size()):
+                    # potentials of all electrodes at the cell nodes
+                    uE = self.subPotentials[kIdx][:, ids].transpose(1, 0, 2)
+                    F += self.w[kIdx] * (uE @ E @ uE.transpose(0, 2, 1))
 
-                a = int(self.data['a'][dataIdx])
-                b = int(self.data['b'][dataIdx])
-                m = int(self.data['m'][dataIdx])
-                n = int(self.data['n'][dataIdx])
-                Jt[dataIdx] = A.mult(u[kIdx][a] - u[kIdx][b],
-                                     u[kIdx][m] - u[kIdx][n])
+                sens = F[:, a, m] - F[:, a, n] - F[:, b, m] + F[:, b, n]
 
-            J += w * Jt
+                # sum cell sensitivities into model parameters
+                P = csr_matrix((np.ones(len(ids)),
+                                (g['marker'][sl], np.arange(len(ids)))),
+                               shape=(nPar, len(ids)))
+                J += P @ sens
 
-        m2 = model*model
-        k = self.data['k']
+        J = J.T * np.asarray(self.data['k'])[:, np.newaxis] / \
+            (np.asarray(model) ** 2)[np.newaxis, :]
 
-        for i in range(J.rows()):
-            J[i] /= (m2 / k[i])
+        # keep a reference, the core only holds a pointer
+        self._J = pg.Matrix(J)
+        self.setJacobian(self._J)
 
         if self.verbose:
-            sumsens = np.zeros(J.rows())
-            for i in range(J.rows()):
-                sumsens[i] = pg.sum(J[i])
-            print("sens sum: median = ", pg.math.median(sumsens),
-                  " min = ", pg.min(sumsens),
-                  " max = ", pg.max(sumsens))
+            sumsens = J.sum(axis=1)
+            print("sens sum: median = ", np.median(sumsens),
+                  " min = ", np.min(sumsens),
+                  " max = ", np.max(sumsens))
 
     def calcGeometricFactor(self, data):
         """Calculate geometry factors for a given dataset."""
@@ -430,11 +634,11 @@ class ERTModellingReference(ERTModellingBase):
         w = pg.Vector()
 
         k0 = 1.0 / (2.0 * rMin)
-        pg.GaussLegendre(0.0, 1.0, nGauLegendre, k, w)
+        pg.core.GaussLegendre(0.0, 1.0, nGauLegendre, k, w)
         kLeg = k0 * k * k
         wLeg = 2.0 * k0 * k * w / np.pi
 
-        pg.GaussLaguerre(nGauLaguerre, k, w)
+        pg.core.GaussLaguerre(nGauLaguerre, k, w)
         kLag = k0 * (k + 1.0)
         wLag = k0 * np.exp(k) * w / np.pi
 
@@ -488,11 +692,14 @@ class ERTModellingReference(ERTModellingBase):
             f.setVal(cell.N(cell.shape().rst(sourcePos)), cell.ids())
 
     def createRHS(self, mesh, elecs):
-        """Create right-hand-side vector."""
+        """Create right-hand-side vectors for all electrodes at once.
+
+        The point sources are the shape functions at the electrode positions,
+        i.e. the rows of the interpolation matrix.
+        """
+        I = pg.utils.sparseMatrix2coo(mesh.interpolationMatrix(elecs))
         rhs = np.zeros((len(elecs), mesh.nodeCount()))
-        for i, e in enumerate(elecs):
-            c = mesh.findCell(e)
-            rhs[i][c.ids()] = c.N(c.shape().rst(e))
+        rhs[I.row, I.col] = I.data
         return rhs
 
 
@@ -70,6 +70,40 @@ def generateDataFromUniqueIndex(ind, data=None, nI=None):
     scheme["valid"] = 1
     return scheme
 
+def matchIndex(ind, ref):
+    """Find the first position of unique indices in a reference array.
+
+    Sort based join in O(n log n) instead of comparing every index.
+
+    Parameters
+    ----------
+    ind : iterable
+        indices to look for, e.g., from uniqueERTIndex
+    ref : iterable
+        reference indices
+
+    Returns
+    -------
+    pos : np.array(dtype=int)
+        first position of every ind in ref or -1 if not present
+
+    Examples
+    --------
+    >>> from pygimli.physics.ert.processing import matchIndex
+    >>> print(matchIndex([3, 5, 7], [7, 3, 3, 1]))
+    [ 1 -1  0]
+    """
+    ind = np.asarray(ind)
+    ref = np.asarray(ref)
+    if len(ref) == 0:
+        return np.full(len(ind), -1, dtype=int)
+
+    order = np.argsort(ref, kind='stable')
+    sRef = ref[order]
+    pos = np.minimum(np.searchsorted(sRef, ind), len(ref) - 1)
+    return np.where(sRef[pos] == ind, order[pos], -1)
+
+
 def reciprocalIndices(data, onlyOnce=False, unify=True):
     """Return indices for reciprocal data.
 
@@ -86,20 +120,57 @@ def reciprocalIndices(data, onlyOnce=False, unify=True):
     """
     unF = uniqueERTIndex(data, unify=unify)
     unB = uniqueERTIndex(data, unify=unify, reverse=True)
-    iF, iB = [], []
-    for i, u in enumerate(unF):
-        ii = np.nonzero(unB == u)[0]
-        if len(ii) > 0:
-            iF.append(i)
-            iB.append(ii[0])
-
-    iF = np.array(iF, dtype=int)
-    iB = np.array(iB, dtype=int)
+    iB = matchIndex(unF, unB)
+    iF = np.nonzero(iB >= 0)[0]
+    iB = iB[iF]
     if onlyOnce:
         return iF[iF < iB], iB[iF < iB]
     else:
         return iF, iB
 
+
+def reciprocalStatistics(data, unify=True):
+    """Normal/reciprocal pairs, duplicates and their statistics at once.
+
+    All data sharing the same electrode configuration, either as
+    duplicates or as reciprocals, are grouped by sorting the unique indices.
+
+    Parameters
+    ----------
+    data : DataContainerERT
+        data containing reciprocal and/or duplicate data
+    unify : bool [True]
+        sort A/B and M/N so that bipole orientation does not matter
+
+    Returns
+    -------
+    out : dict
+        * iN, iR - normal/reciprocal index pairs (every pair once)
+        * group - group number for every datum
+        * count - number of data per group
+        * nRec - number of reciprocal data per group
+        * mean, std - mean and standard deviation of resistance per group
+        * rec - reciprocity (normal - reciprocal) / mean for every pair
+    """
+    unF = uniqueERTIndex(data, unify=unify)
+    unB = uniqueERTIndex(data, unify=unify, reverse=True)
+    isRec = unB < unF  # the larger index is the normal configuration
+    key = np.where(isRec, unB, unF)
+    _, group, count = np.unique(key, return_inverse=True, return_counts=True)
+    group = group.ravel()
+    iN, iR = reciprocalIndices(data, onlyOnce=True, unify=unify)
+
+    R = np.asarray(getResistance(data))
+    nG = len(count)
+    mean = np.bincount(group, weights=R, minlength=nG) / count
+    var = np.bincount(group, weights=(R - mean[group])**2,
+                      minlength=nG) / count
+    meanR = np.abs(R[iN] + R[iR]) / 2
+    return dict(iN=iN, iR=iR, group=group, count=count,
+                nRec=np.bincount(group, weights=isRec, minlength=nG),
+                mean=mean, std=np.sqrt(var),
+                rec=(R[iN] - R[iR]) / np.where(meanR > 0, meanR, 1))
+
 def getResistance(data):
     """Return data resistance."""
     if data.allNonZero('r'):
@@ -261,25 +332,40 @@ def getReciprocals(data, change=False, remove=False):
 
     unF = uniqueERTIndex(data)
     unB = uniqueERTIndex(data, reverse=True)
-    rF, rB = [], []
+    iF = matchIndex(unB, unF)
+    iB = np.nonzero(iF >= 0)[0]
+    iF = iF[iB]
+    r = np.array(data['r'])
     rec = np.zeros(data.size())
-    data['rec'] = 0
-    for iB in range(data.size()):
-        if unB[iB] in unF:
-            iF = int(np.nonzero(unF == unB[iB])[0][0])
-            rF.append(data['r'][iF])
-            rB.append(data['r'][iB])
-            rec[iB] = (rF[-1]-rB[-1]) / (rF[-1]+rB[-1]) * 2
-            data['rec'][iF] = rec[iB]
-            IF, IB = data['i'][iF], data['i'][iB]  # use currents for weighting
-            if change and data['valid'][iF]:
-                data['r'][iF] = (rF[-1] * IF + rB[-1] * IB) / (IF + IB)
-                data['i'][iF] = (IF**2 + IB**2) / (IF + IB)  # according weight
-                data['u'][iF] = data['r'][iF] * data['i'][iF]
+    if change:  # sequential as a pair can be changed multiple times
+        cur = np.array(data['i'])
+        valid = np.array(data['valid'])
+        recF = np.zeros(data.size())
+        changed = np.zeros(data.size(), dtype=bool)
+        for f, b in zip(iF, iB):
+            rec[b] = (r[f] - r[b]) / (r[f] + r[b]) * 2
+            recF[f] = rec[b]
+            if valid[f]:
+                IF, IB = cur[f], cur[b]  # use currents for weighting
+                r[f] = (r[f] * IF + r[b] * IB) / (IF + IB)
+                cur[f] = (IF**2 + IB**2) / (IF + IB)  # according weight
+                changed[f] = True
                 if remove:
-                    data['valid'][iB] = 0  # for adding all others later on
+                    valid[b] = 0  # for adding all others later on
+
+        # only the averaged forward data change
+        ch = np.nonzero(changed)[0]
+        data['r'][ch] = r[ch]
+        data['i'][ch] = cur[ch]
+        data['u'][ch] = r[ch] * cur[ch]
+        data['valid'] = valid
+    else:
+        rec[iB] = (r[iF] - r[iB]) / (r[iF] + r[iB]) * 2
+        recF = np.zeros(data.size())
+        recF[iF] = rec[iB]
 
-    print(len(rF), "reciprocals")
+    data['rec'] = recF
+    print(len(iB), "reciprocals")
     if remove:
         data.removeInvalid()
 
@@ -289,25 +375,29 @@ def extractReciprocals(fwd, bwd):
     nMax = max(fwd.sensorCount(), bwd.sensorCount())
     unF = uniqueERTIndex(fwd, nI=nMax)
     unB = uniqueERTIndex(bwd, nI=nMax, reverse=True)
-    rF, rB = [], []
     rec = np.zeros(bwd.size())
     both = pg.DataContainerERT(fwd)
     both.set('rec', pg.Vector(both.size()))
     back = pg.DataContainerERT(bwd)
     back.set('rec', pg.Vector(back.size()))
-    for iB in range(bwd.size()):
-        if unB[iB] in unF:
-            iF = int(np.nonzero(unF == unB[iB])[0][0])
-            rF.append(fwd('r')[iF])
-            rB.append(bwd('r')[iB])
-            rec[iB] = (rF[-1]-rB[-1]) / (rF[-1]+rB[-1]) * 2
-            both('rec')[iF] = rec[iB]
-            IF, IB = fwd('i')[iF], bwd('i')[iB]  # use currents for weighting
-            both('r')[iF] = (rF[-1] * IF + rB[-1] * IB) / (IF + IB)
-            both('i')[iF] = (IF**2 + IB**2) / (IF + IB)  # according to weight
-            both('u')[iF] = fwd('r')[iF] * fwd('i')[iF]
-            back('valid')[iB] = 0  # for adding all others later on
-    print(len(rF), "reciprocals")
+    iF = matchIndex(unB, unF)
+    iB = np.nonzero(iF >= 0)[0]
+    iF = iF[iB]
+    rF, rB = np.array(fwd('r'))[iF], np.array(bwd('r'))[iB]
+    rec[iB] = (rF - rB) / (rF + rB) * 2
+    IF, IB = np.array(fwd('i'))[iF], np.array(bwd('i'))[iB]  # current weight
+    for tok, vals in [('rec', rec[iB]),
+                      ('r', (rF * IF + rB * IB) / (IF + IB)),
+                      ('i', (IF**2 + IB**2) / (IF + IB)),  # according weight
+                      ('u', rF * IF)]:
+        v = np.array(both(tok))
+        v[iF] = vals
+        both.set(tok, v)
+
+    valid = np.array(back('valid'))
+    valid[iB] = 0  # for adding all others later on
+    back.set('valid', valid)
+    print(len(iB), "reciprocals")
     back.removeInvalid()
     both.add(back)
     return rec, both
@@ -330,7 +420,7 @@ def combineMultipleData(DATA):
         scheme['k'] = createGeometricFactors(scheme)  # check numerical
 
     for i, di in enumerate(DATA):
-        ii = np.searchsorted(uI, uIs[i])
+        ii = matchIndex(uIs[i], uI)
         if not di.haveData('r'):
             if di.allNonZero('u') and di.allNonZero('i'):
                 di['r'] = di['u']/di['i']
@@ -8,6 +8,25 @@ from pygimli.physics import ert
 from .processing import combineMultipleData
 
 
+_TL_WORKER_ = None  # TimelapseERT instance inherited by forked workers
+
+
+def _invertFramesWorker(args):
+    """Worker task: invert a contiguous block of time steps."""
+    times, ind, startModel, warmStart, kwargs = args
+    tl = _TL_WORKER_
+    refModel = startModel
+    results = []
+    for i, ti in zip(ind, times):
+        model, response, chi2 = tl._invertFrame(ti, startModel, refModel,
+                                                warmStart=warmStart, **kwargs)
+        results.append((i, model, response, chi2))
+        if warmStart:
+            startModel = model
+
+    return results
+
+
 # move general timelapse stuff to method-independent class
 # class Timelapse():
 #     mask
@@ -96,7 +115,22 @@ class TimelapseERT():
         return "\n".join(out)
 
     def load(self, filename, **kwargs):
-        """Load or import data (or data files using *)."""
+        """Load or import data (or data files using *).
+
+        Binary .bdat files (see :py:func:`pygimli.core.saveBinaryData`)
+        are read without parsing any text.
+        """
+        if filename.endswith(".bdat"):
+            store = pg.core.loadBinaryData(filename)
+            self.data = store.toDataContainer()
+            if "rhoa" in store.timelapseTokens():
+                self.DATA = np.array(store.timelapse("rhoa"))
+            if "err" in store.timelapseTokens():
+                self.ERR = np.array(store.timelapse("err"))
+            self.times = store.times
+            self.name = filename[:-5]
+            return
+
         if os.path.isfile(filename):
             self.data = ert.load(filename)
             if os.path.isfile(filename[:-4]+".rhoa"):
@@ -114,8 +148,22 @@ class TimelapseERT():
         self.name = filename[:-4].replace("*", "All")
 
     def saveData(self, filename=None, masknan=True):
-        """Save all data as datacontainer, times, rhoa and error arrays."""
+        """Save all data as datacontainer, times, rhoa and error arrays.
+
+        A filename ending with .bdat writes everything into one binary file,
+        to which new time steps can be appended by
+        :py:func:`pygimli.core.appendBinaryData`.
+        """
         filename = filename or self.name
+        if filename.endswith(".bdat"):
+            matrices = dict(rhoa=self.DATA)
+            if np.any(self.ERR):
+                matrices["err"] = self.ERR
+            pg.core.saveBinaryData(filename, self.data, times=self.times,
+                                   **matrices)
+            self.name = filename[:-5]
+            return
+
         if filename.endswith(".shm"):
             filename = filename[:-4]
 
@@ -410,6 +458,10 @@ class TimelapseERT():
     def invert(self, t=None, reg=None, regTL=None, **kwargs):
         """Run inversion for a specific timestep or all subsequently.
 
+        The first time step is inverted first and serves as starting (and
+        by default reference) model for all others. Mesh, region manager
+        and constraints are set up once and shared by all time steps.
+
         Parameter
         ---------
         t : int|datetime|str|array
@@ -418,6 +470,18 @@ class TimelapseERT():
             regularization options (setRegularization) for all inversions
         regTL : dict
             regularization options for timesteps inversion only
+        creep : bool [False]
+            use the preceding model as starting model (forces nProc=1)
+        warmStart : bool [False]
+            start every time step from the model of the preceding one and
+            reuse its Jacobian matrix for the first iteration
+        nProc : int [1]
+            number of processes to distribute the time steps over, each
+            process inverts a contiguous block of time steps
+        checkpoint : str [None]
+            file (npz format, any name) to store the results after every
+            finished (block of) time step(s), an existing file is used to
+            resume the run
         **kwargs : dict
             keyword arguments passed to ERTManager.invert
         """
@@ -433,36 +497,167 @@ class TimelapseERT():
             t = np.arange(len(self.times))
 
         t = np.atleast_1d(t)
-        models = []
-        responses = []
-        self.chi2s = []
         startModel = kwargs.pop("startModel", 100)
         creep = kwargs.pop("creep", False)
+        warmStart = kwargs.pop("warmStart", False)
+        nProc = kwargs.pop("nProc", 1)
+        checkpoint = kwargs.pop("checkpoint", None)
         kwargs.setdefault("isReference", True)
-        for i, ti in enumerate(np.atleast_1d(t)):
-            self.mgr.setData(self.chooseTime(ti))
-            self.model = self.mgr.invert(startModel=startModel, **kwargs)
-            if i == 0 or creep:
-                startModel = self.model.copy()
-
-            models.append(self.model)
-            responses.append(self.mgr.inv.response)
-            self.chi2s.append(self.mgr.inv.chi2())
-            if i == 0 and isinstance(regTL, dict):
-                kwargs.update(regTL)
-                # self.mgr.inv.setRegularization(**regTL)
+        if creep and nProc > 1:
+            pg.warn("creep needs sequential inversion, setting nProc=1")
+            nProc = 1
+
+        done = np.zeros(len(t), dtype=bool)
+        if checkpoint is not None and os.path.isfile(checkpoint):
+            try:
+                with np.load(checkpoint) as cp:
+                    cp = dict(cp)
+            except Exception as e:
+                pg.warn("Could not read checkpoint, ignoring", checkpoint, e)
+                cp = dict(t=None)
+
+            if np.array_equal(cp["t"], t):
+                done = cp["done"]
+                self.models = cp["models"]
+                self.responses = cp["responses"]
+                self.chi2s = cp["chi2s"]
+                pg.info("Resuming from {}: {}/{} time steps done".format(
+                    checkpoint, sum(done), len(t)))
+            elif cp["t"] is not None:
+                pg.warn("Checkpoint does not match time steps, ignoring",
+                        checkpoint)
+
+        if not done[0]:
+            model, response, chi2 = self._invertFrame(t[0], startModel,
+                                                      **kwargs)
+            self.models = np.full((len(t), len(model)), np.nan)
+            self.responses = np.full((len(t), len(response)), np.nan)
+            self.chi2s = np.full(len(t), np.nan)
+            self._storeFrames([(0, model, response, chi2)], done, t,
+                              checkpoint)
+
+        startModel = self.models[0].copy()
+        if isinstance(regTL, dict):
+            kwargs.update(regTL)
+
+        todo = np.nonzero(~done)[0]
+        if nProc > 1 and len(todo) > 1:
+            self._invertFramesParallel(t, todo, startModel, warmStart, nProc,
+                                       done, checkpoint, **kwargs)
+        else:
+            refModel = None if creep else startModel
+            for i in todo:
+                if creep or (warmStart and done[i-1]):
+                    startModel = self.models[i-1].copy()
+
+                res = self._invertFrame(t[i], startModel, refModel,
+                                        warmStart=warmStart, **kwargs)
+                self._storeFrames([(i, *res)], done, t, checkpoint)
 
         if len(t) == 1:
             self.mgr.showResult()
 
-        self.models = np.array(models)
-        self.responses = np.array(responses)
+        self.model = self.models[-1]
         self.pd = self.mgr.paraDomain
 
+    def _invertFrame(self, ti, startModel, refModel=None, warmStart=False,
+                     **kwargs):
+        """Invert a single time step and return model, response and chi²."""
+        self.mgr.setData(self.chooseTime(ti))
+        inv = self.mgr.inv
+        if refModel is not None and kwargs.pop("isReference", False):
+            inv.inv.setReferenceModel(refModel)  # independent of startModel
+
+        preStep = inv._preStep
+        if warmStart and self.mgr.fop.jacobian().rows() > 0:
+            # reuse the Jacobian of the neighbouring time step for the
+            # first iteration and recompute it from the second on
+            inv.inv.setRecalcJacobian(False)
+
+            def restoreRecalc(i, inv_):
+                if i > 0:
+                    inv_.inv.setRecalcJacobian(True)
+                if callable(preStep):
+                    preStep(i, inv_)
+
+            inv.setPreStep(restoreRecalc)
+
+        try:
+            model = self.mgr.invert(startModel=startModel, **kwargs)
+        finally:
+            inv.inv.setRecalcJacobian(True)
+            inv.setPreStep(preStep)
+
+        self.model = model
+        return np.array(model), np.array(inv.response), inv.chi2()
+
+    def _storeFrames(self, results, done, t, checkpoint=None):
+        """Store results of finished time steps and write checkpoint."""
+        for i, model, response, chi2 in results:
+            self.models[i] = model
+            self.responses[i] = response
+            self.chi2s[i] = chi2
+            done[i] = True
+
+        if checkpoint is not None:
+            # write to a file object (savez would append .npz to the name)
+            # and move it in place, so an interrupted write never
+            # destroys the last checkpoint
+            tmp = checkpoint + ".tmp"
+            with open(tmp, "wb") as fid:
+                np.savez(fid, t=t, done=done, models=self.models,
+                         responses=self.responses, chi2s=self.chi2s)
+            os.replace(tmp, checkpoint)
+
+    def _invertFramesParallel(self, t, todo, startModel, warmStart, nProc,
+                              done, checkpoint=None, **kwargs):
+        """Invert time steps in contiguous blocks on a forked process pool.
+
+        The workers inherit the prepared manager (mesh, region manager and
+        constraints) so nothing needs to be set up or pickled again.
+        Results are stored as soon as a block has finished.
+        """
+        import multiprocessing
+
+        # several small blocks per process for load balance and frequent
+        # checkpoints, but long enough to profit from warm starts
+        nBlocks = min(len(todo), nProc * 4)
+        blocks = [b for b in np.array_split(todo, nBlocks) if len(b)]
+
+        global _TL_WORKER_
+        oldThreads = self.mgr.fop.threadCount()
+        self.mgr.fop.setThreadCount(1)
+        _TL_WORKER_ = self
+        try:
+            with multiprocessing.get_context('fork').Pool(nProc) as pool:
+                jobs = pool.imap_unordered(
+                    _invertFramesWorker,
+                    [(t[b], b, startModel, warmStart, kwargs)
+                     for b in blocks])
+                for results in jobs:
+                    self._storeFrames(results, done, t, checkpoint)
+                    pg.info("{}/{} time steps inverted".format(sum(done),
+                                                               len(t)))
+        finally:
+            _TL_WORKER_ = None
+            self.mgr.fop.setThreadCount(oldThreads)
+
     def fullInversion(self, scalef=1.0, **kwargs):
-        """Full (4D) inversion."""
+        """Full (4D) inversion.
+
+        Parameters
+        ----------
+        scalef : float [1.0]
+            scaling factor for the temporal constraints
+        nWorkers : int [1]
+            number of processes computing the frames concurrently
+        **kwargs : dict
+            keyword arguments passed to Inversion.run
+        """
         DATA = [self.chooseTime(ti) for ti in range(len(self.times))]
-        fop = pg.frameworks.MultiFrameModelling(ert.ERTModelling, scalef=scalef)
+        fop = pg.frameworks.MultiFrameModelling(
+            ert.ERTModelling, scalef=scalef,
+            nWorkers=kwargs.pop("nWorkers", 1))
         fop.setData(DATA)
         if self.mesh is None:
             self.createMesh()
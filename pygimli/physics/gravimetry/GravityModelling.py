@@ -1,12 +1,12 @@
 import numpy as np
 import pygimli as pg
-from .kernel import SolveGravMagHolstein
+from .kernel import SolveGravMagHolstein, holsteinACAMatrices
 
 
 class GravityModelling(pg.frameworks.MeshModelling):
     """Magnetics modelling operator using Holstein (2007)."""
 
-    def __init__(self, mesh, points, cmp=["gz"]):
+    def __init__(self, mesh, points, cmp=["gz"], acaTol=None, **kwargs):
         """Setup forward operator.
 
         Parameters
@@ -17,8 +17,20 @@ class GravityModelling(pg.frameworks.MeshModelling):
             measuring points
         cmp : list of str
             component of: gx, gy, gz, TFA, Bx, By, Bz, Bxy, Bxz, Byy, Byz, Bzz
+        acaTol : float [None]
+            Use a compressed kernel with this relative accuracy instead of
+            the dense one, see
+            :py:func:`pygimli.physics.gravimetry.holsteinACAMatrices`.
+
+        Keyword Arguments
+        -----------------
+        **kwargs :
+            Passed to the kernel computation (dtype, out, memory, nWorkers),
+            see :py:func:`pygimli.physics.gravimetry.SolveGravMagHolstein`.
         """
         # check if components do not contain g!
+        self.acaTol = acaTol
+        self.kernelArgs = kwargs
         super().__init__(mesh=mesh)
         self.createRefinedForwardMesh(refine=False, pRefine=False)
         self.mesh_ = mesh
@@ -29,18 +41,35 @@ class GravityModelling(pg.frameworks.MeshModelling):
         self.J = pg.matrix.BlockMatrix()
         self.createKernel()
 
-    def createKernel(self):
-        """Create computational kernel."""
-        self.kernel = SolveGravMagHolstein(self.mesh_,
-                                           pnts=self.sensorPositions,
-                                           cmp=self.components)
+    def createKernel(self, mesh=None):
+        """Create computational kernel.
+
+        The per-component matrices are views into the (possibly memory
+        mapped cached) kernel, so no copies are made. With acaTol they are
+        compressed kernels and no dense kernel is stored.
+        """
+        if mesh is not None:
+            self.mesh_ = mesh
+
         self.J = pg.matrix.BlockMatrix()
         self.Ki = []
-        self.Ji = []
-        for iC in range(self.kernel.shape[1]):
-            self.Ki.append(np.squeeze(self.kernel[:, iC, :]))
-            self.Ji.append(pg.matrix.NumpyMatrix(self.Ki[-1]))
-            self.J.addMatrix(self.Ji[-1], iC*self.kernel.shape[0], 0)
+        if self.acaTol is not None:
+            self.kernel = None
+            self.Ji = holsteinACAMatrices(self.mesh_, self.sensorPositions,
+                                          self.components, tol=self.acaTol,
+                                          verbose=self.verbose)
+        else:
+            self.kernel = SolveGravMagHolstein(self.mesh_,
+                                               pnts=self.sensorPositions,
+                                               cmp=self.components,
+                                               **self.kernelArgs)
+            self.Ji = []
+            for iC in range(self.kernel.shape[1]):
+                self.Ki.append(np.squeeze(self.kernel[:, iC, :]))
+                self.Ji.append(pg.matrix.NumpyMatrix(self.Ki[-1]))
+
+        for iC, Ji in enumerate(self.Ji):
+            self.J.addMatrix(Ji, iC*len(self.sensorPositions), 0)
 
         self.J.recalcMatrixSize()
         self.setJacobian(self.J)
@@ -1,13 +1,14 @@
 """Magnetics forward operator."""
 import numpy as np
 import pygimli as pg
-from .kernel import SolveGravMagHolstein
+from .kernel import SolveGravMagHolstein, holsteinACAMatrices
 
 
 class MagneticsModelling(pg.frameworks.MeshModelling):
     """Magnetics modelling operator using Holstein (2007)."""
 
-    def __init__(self, mesh=None, points=None, cmp=["TFA"], igrf=[50, 13]):
+    def __init__(self, mesh=None, points=None, cmp=["TFA"], igrf=[50, 13],
+                 acaTol=None, **kwargs):
         """Setup forward operator.
 
         Parameters
@@ -24,8 +25,20 @@ class MagneticsModelling(pg.frameworks.MeshModelling):
                                    X/Y/Z components, total field OR
             [X, Y, Z] - X/Y/Z components
             [lat, lon] - latitude, longitude (automatic IGRF)
+        acaTol : float [None]
+            Use a compressed kernel with this relative accuracy instead of
+            the dense one, see
+            :py:func:`pygimli.physics.gravimetry.holsteinACAMatrices`.
+
+        Keyword Arguments
+        -----------------
+        **kwargs :
+            Passed to the kernel computation (dtype, out, memory, nWorkers),
+            see :py:func:`pygimli.physics.gravimetry.SolveGravMagHolstein`.
         """
         # check if components do not contain g!
+        self.acaTol = acaTol
+        self.kernelArgs = kwargs
         super().__init__()
         self._refineH2 = False
         # self.createRefinedForwardMesh(refine=False, pRefine=False)
@@ -41,6 +54,7 @@ class MagneticsModelling(pg.frameworks.MeshModelling):
             else:
                 self.igrf = igrf
         self.kernel = None
+        self.Ji = []
         self.J = pg.matrix.BlockMatrix()
         if self.mesh_ is not None:
             self.setMesh(self.mesh_)
@@ -50,17 +64,26 @@ class MagneticsModelling(pg.frameworks.MeshModelling):
         points = np.column_stack([self.sensorPositions[:, 1],
                                   self.sensorPositions[:, 0],
                                   -np.abs(self.sensorPositions[:, 2])])
-        self.kernel = SolveGravMagHolstein(self.mesh().NED(),
-                                           pnts=points, igrf=self.igrf,
-                                           cmp=self.components)
-
         self.J = pg.matrix.BlockMatrix()
         self.Ki = []
-        self.Ji = []
-        for iC in range(self.kernel.shape[1]):
-            self.Ki.append(np.squeeze(self.kernel[:, iC, :]))
-            self.Ji.append(pg.matrix.NumpyMatrix(self.Ki[-1]))
-            self.J.addMatrix(self.Ji[-1], iC*self.kernel.shape[0], 0)
+        if self.acaTol is not None:
+            self.kernel = None
+            self.Ji = holsteinACAMatrices(self.mesh().NED(), points,
+                                          self.components, igrf=self.igrf,
+                                          tol=self.acaTol,
+                                          verbose=self.verbose)
+        else:
+            self.kernel = SolveGravMagHolstein(self.mesh().NED(),
+                                               pnts=points, igrf=self.igrf,
+                                               cmp=self.components,
+                                               **self.kernelArgs)
+            self.Ji = []
+            for iC in range(self.kernel.shape[1]):
+                self.Ki.append(np.squeeze(self.kernel[:, iC, :]))
+                self.Ji.append(pg.matrix.NumpyMatrix(self.Ki[-1]))
+
+        for iC, Ji in enumerate(self.Ji):
+            self.J.addMatrix(Ji, iC*len(points), 0)
 
         self.J.recalcMatrixSize()
         self.setJacobian(self.J)
@@ -73,7 +96,7 @@ class MagneticsModelling(pg.frameworks.MeshModelling):
 
     def response(self, model):
         """Compute forward response."""
-        if self.kernel is None:
+        if not self.Ji:
             self.computeKernel()
 
         return self.J.dot(model)
@@ -18,6 +18,7 @@ from . gravMagModelling import gradGZHalfPlateHoriz
 
 from . gravMagModelling import solveGravimetry, GravityModelling2D
 from . kernel import SolveGravMagHolstein
+from . kernel import holsteinACAMatrices, ACAKernelMatrix
 from . MagneticsModelling import MagneticsModelling
 from . magneticsManager import MagManager
 from . GravityModelling import GravityModelling
@@ -3,42 +3,33 @@ import numpy as np
 import pygimli as pg
 from pygimli.utils import ProgressBar
 
+__GLOBAL__holstein__ = None  # kernel geometry inherited by forked workers
+__GLOBAL__holsteinExec__ = {}  # execution options of the cached kernel
 
-@pg.cache
-def SolveGravMagHolstein(mesh, pnts, cmp, igrf=None):  # , foot=np.inf):
-    """Solve gravity and/or magnetics problem after Holstein (1997).
+# order of the components in the kernel, independent of the order in cmp
+_HOLSTEIN_COMPONENTS = ['gx', 'gy', 'gz', 'TFA', 'Bx', 'By', 'Bz',
+                        'Bxx', 'Bxy', 'Bxz', 'Byy', 'Byz', 'Bzz']
+_TENSOR_INDEX = {'Bxx': (0, 0), 'Bxy': (0, 1), 'Bxz': (0, 2),
+                 'Byy': (1, 1), 'Byz': (1, 2), 'Bzz': (2, 2)}
 
-    Parameters
-    ----------
-    mesh : pygimli:mesh
-        tetrahedral or hexahedral mesh
-    pnts : list|array of (x, y, z)
-        measuring points
-    cmp : list of str
-        component list of type str, valid values are:
-        gx, gy, gz, TFA, Bx, By, Bz, Bxx, Bxy, Bxz, Byy, Byz, Bzz
-    igrf : list|array of size 3 or 7
-        international geomagnetic reference field, either
-        [D, I, H, X, Y, Z, F] - declination, inclination, horizontal field,
-                               X/Y/Z components, total field OR
-        [X, Y, Z] - X/Y/Z components
 
-    Returns
-    -------
-    out : ndarray (nPoints x nComponents x nCells)
-        kernel matrix to be multiplied with density or susceptibility
-    """
-    if pnts is None:
-        pnts = [[0.0, 0.0]]
+def _holsteinGeometry(mesh, cmp, igrf=None):
+    """Collect everything needed to compute kernel rows for any point.
 
+    Returns a dictionary with the boundary node positions `nb`
+    (nBoundaries x nodesPerBoundary x 3), the sparse boundary to cell
+    operator `S` (+1 left, -1 right cell) and the field setup.
+    """
     doG = np.any([c[0] == "g" for c in cmp])
     doGT = np.any([c[0] == "g" and len(c) == 3 for c in cmp])
     doB = np.any([c[0] == "B" and len(c) == 2 for c in cmp]) or "TFA" in cmp
     doBT = np.any([c[0] == "B" and len(c) == 3 for c in cmp])
-    B_tens = None
 
-    kernel = np.zeros((mesh.cellCount(), len(pnts), len(cmp)))
-    if igrf:
+    if doGT:
+        raise Exception("Gravity tensor not yet supported!")
+
+    fakt, B_dir = 0.0, None
+    if igrf is not None and len(igrf) > 0:
         if len(igrf) == 3:  # an X, Y, Z vector
             F = np.linalg.norm(igrf)
             fakt = F / (4*np.pi)
@@ -49,160 +40,576 @@ def SolveGravMagHolstein(mesh, pnts, cmp, igrf=None):  # , foot=np.inf):
             B_dir = myigrf / np.linalg.norm(myigrf)
         else:
             raise Exception("Could not use IGRF vector. Len must be 3 or 7!")
-    elif doB or doB:
+    elif doB or doBT:
         raise Exception("Specify IGRF!")
 
-    b_list, c_list = [], []
-    for bd in mesh.boundaries():
-        b_list.append([n.id() for n in bd.allNodes()])
-        c_list.append([bd.leftCell(), bd.rightCell()])
-
-    b_list = np.array(b_list)
-    lb = b_list.shape
-
-    n_list = np.array([n.pos() for n in mesh.nodes()])
-
-    cl, cr = [], []
-    for i, c in enumerate(c_list):
-        if c[0]:
-            cl.append([i, c[0].id()])
-        if c[1]:
-            cr.append([i, c[1].id()])
-
-    cl = np.array(cl)
-    cr = np.array(cr)
-
-    rr = range(0, mesh.cellCount())
-    rs = np.roll(range(0, lb[1]), -1)
-
-    temp = np.zeros((len(pnts), lb[0], len(cmp)))
-    pBar = ProgressBar(its=len(pnts), width=40, sign='+')
-    nb = n_list[b_list]
-    for i, p in enumerate(pnts):
-        r1 = nb - p
-        r2 = r1[:, rs, :]
-        r0 = r2 - r1
-        u = np.sum(np.cross(r1, r2), 1)
-        u /= np.expand_dims(np.linalg.norm(u, axis=1)+1e-16, axis=1)
-        ut = np.tile(u, lb[1]).reshape((lb[0], lb[1], 3))  # broadcasting!
-        ll = np.linalg.norm(r0, axis=2)
-        t = r0 / np.expand_dims(ll, axis=2)
-        lm = (np.sum(r1*t, 2) + np.sum(r2*t, 2)) / 2
-        h = np.cross(t, ut)
-        hn = np.sum(h*r1, 2)
-        v = np.sum(ut*r1, 2)
-        r1n = np.linalg.norm(r1, axis=2)
-        r2n = np.linalg.norm(r2, axis=2)
-        rm = (r1n + r2n)/2
-        lumbda = ll / (2*rm)
-        jj = 0
-        if doG: # gravitational field
-            g = hn*np.arctanh(lumbda)-np.sign(v)*v*np.arctan2(
-                hn*lumbda, (rm*(1-lumbda**2)+abs(v)))
-            g_vec = 2 * u * np.expand_dims(np.sum(g, 1), axis=1)
-
-            if 'g' in cmp:
-                temp[i, :, jj] = g
-                jj += 0
-
-            if 'gx' in cmp:
-                temp[i, :, jj] = g_vec[:, 0]
-                jj += 1
+    from scipy.sparse import coo_matrix
 
-            if 'gy' in cmp:
-                temp[i, :, jj] = g_vec[:, 1]
-                jj += 1
+    b_list = np.array([[n.id() for n in bd.allNodes()]
+                       for bd in mesh.boundaries()])
+    lc = np.array([bd.leftCell().id() if bd.leftCell() else -1
+                   for bd in mesh.boundaries()])
+    rc = np.array([bd.rightCell().id() if bd.rightCell() else -1
+                   for bd in mesh.boundaries()])
+    il, ir = np.nonzero(lc >= 0)[0], np.nonzero(rc >= 0)[0]
+    S = coo_matrix((np.concatenate([np.ones(len(il)), -np.ones(len(ir))]),
+                    (np.concatenate([lc[il], rc[ir]]),
+                     np.concatenate([il, ir]))),
+                   shape=(mesh.cellCount(), len(b_list))).tocsr()
 
-            if 'gz' in cmp:
-                temp[i, :, jj] = g_vec[:, 2]
-                jj += 1
+    return dict(nb=np.asarray(mesh.positions())[b_list], S=S,
+                rs=np.roll(range(b_list.shape[1]), -1),
+                cmp=[c for c in _HOLSTEIN_COMPONENTS if c in cmp],
+                doG=doG, doB=doB, doBT=doBT, fakt=fakt, B_dir=B_dir)
+
+
+def _asPoints(pnts):
+    """Measuring points as (nPoints x 3) array."""
+    if pnts is None:
+        pnts = [[0.0, 0.0, 0.0]]
+    pnts = np.asarray(pnts, dtype=float)
+    if pnts.ndim == 1:
+        pnts = pnts[np.newaxis]
+    if pnts.shape[1] < 3:
+        pnts = np.column_stack([pnts, np.zeros((len(pnts),
+                                                3 - pnts.shape[1]))])
+    return pnts
+
+
+def _dot(a, b):
+    """Scalar product of component-major (3, ...) arrays."""
+    return a[0]*b[0] + a[1]*b[1] + a[2]*b[2]
+
+
+def _cross(a, b):
+    """Cross product of component-major (3, ...) arrays."""
+    return np.array([a[1]*b[2] - a[2]*b[1],
+                     a[2]*b[0] - a[0]*b[2],
+                     a[0]*b[1] - a[1]*b[0]])
 
-            if doGT:
-                raise Exception("Gravity tensor not yet supported!")
-                G_tens = np.zeros([3, 3, 3])
-                if 'gxx' in cmp:
-                    temp[:, jj]=G_tens[:, 0, 0]
-                if 'gxy' in cmp:
-                    temp[:, jj]=G_tens[:, 0, 1]
-                if 'gxz' in cmp:
-                    temp[:, jj]=G_tens[:, 0, 2]
-                if 'gyy' in cmp:
-                    temp[:, jj]=G_tens[:, 1, 1]
-                if 'gyz' in cmp:
-                    temp[:, jj]=G_tens[:, 1, 2]
-                if 'gzz' in cmp:
-                    temp[:, jj]=G_tens[:, 2, 2]
-
-        if doB or doBT:
-            # magnetic field vector and gravity gradient tensor
-            b = h*np.expand_dims(np.arctanh(lumbda), axis=2) - \
-                ut*np.expand_dims(np.sign(v)*np.arctan2(
-                    hn*lumbda, (rm*(1-lumbda**2)+abs(v))), axis=2)
-            P = np.dot(u, B_dir)
-            B_vec = np.expand_dims(P, 1) * np.sum(b, 1)
-            B_vec = 2 * np.expand_dims(P, 1) * np.sum(b, 1)
-
-            if 'TFA' in cmp:
-                temp[i, :, jj] = fakt*B_vec.dot(B_dir)
-                jj += 1
 
-            if 'Bx' in cmp:
-                temp[i, :, jj] = fakt*B_vec[:, 0]
+def _holsteinChunk(geom, pnts, dtype=float):
+    """Kernel rows (nPoints x nComponents x nCells) for a chunk of points.
+
+    All points of the chunk are treated at once. The vector arrays are
+    stored component-major (3 x nPoints x nBoundaries x nodesPerBoundary)
+    so all products and sums run over contiguous memory.
+    """
+    nb, rs, cmp = geom['nb'], geom['rs'], geom['cmp']
+    fakt, B_dir = geom['fakt'], geom['B_dir']
+    nP, nB = len(pnts), nb.shape[0]
+
+    nbT = nb.transpose(2, 0, 1)[:, np.newaxis]
+    r1 = nbT - np.asarray(pnts, dtype=float).T[:, :, None, None]
+    r2 = r1[..., rs]
+    r0 = r2 - r1
+    u = np.sum(_cross(r1, r2), 3)
+    u /= np.sqrt(_dot(u, u)) + 1e-16
+    ut = u[..., np.newaxis]  # broadcasting over the boundary nodes
+    ll = np.sqrt(_dot(r0, r0))
+    t = r0 / ll
+    lm = (_dot(r1, t) + _dot(r2, t)) / 2
+    h = _cross(t, ut)
+    hn = _dot(h, r1)
+    v = _dot(ut, r1)
+    r1n = np.sqrt(_dot(r1, r1))
+    r2n = np.sqrt(_dot(r2, r2))
+    rm = (r1n + r2n) / 2
+    lumbda = ll / (2*rm)
+    atanh = np.arctanh(lumbda)
+    atan = np.sign(v) * np.arctan2(hn*lumbda, (rm*(1-lumbda**2)+abs(v)))
+
+    temp = np.zeros((nB, nP, len(cmp)))
+    jj = 0
+    if geom['doG']:  # gravitational field
+        g = 2 * np.sum(hn*atanh - v*atan, 2)
+        for i, c in enumerate(['gx', 'gy', 'gz']):
+            if c in cmp:
+                temp[:, :, jj] = (u[i] * g).T
                 jj += 1
 
-            if 'By' in cmp:
-                temp[i, :, jj] = fakt*B_vec[:, 1]
+    if geom['doB'] or geom['doBT']:
+        # magnetic field vector
+        P = _dot(u, B_dir)
+        B_vec = 2 * P * np.sum(h*atanh - ut*atan, 3)
+
+        if 'TFA' in cmp:
+            temp[:, :, jj] = fakt * _dot(B_vec, B_dir).T
+            jj += 1
+
+        for i, c in enumerate(['Bx', 'By', 'Bz']):
+            if c in cmp:
+                temp[:, :, jj] = fakt * B_vec[i].T
                 jj += 1
 
-            if 'Bz' in cmp:
-                temp[i, :, jj] = fakt*B_vec[:, 2]
+        if geom['doBT']:  # magnetic gradient tensor, only needed entries
+            d = (-2*lumbda*hn) / (r1n*r2n*(1-lumbda**2))
+            e = (-lumbda*lm) / (r1n*r2n)
+            f = (-2*lumbda*v) / (r1n*r2n*(1-lumbda**2))
+
+            for c in cmp[jj:]:
+                k, l = _TENSOR_INDEX[c]
+                B = (h[k]*h[l] - ut[k]*ut[l])*d + \
+                    (t[k]*h[l] + h[k]*t[l])*e + \
+                    (h[k]*ut[l] + ut[k]*h[l])*f
+                temp[:, :, jj] = fakt * (P * np.sum(B, 2)).T
                 jj += 1
 
-            if doBT:  # magnetic gradient tensor
-                d = (-2*lumbda*hn) / (r1n*r2n*(1-lumbda**2))
-                e = (-2*lumbda*lm) / (r1n*r2n)
-                f = (-2*lumbda*v) / (r1n*r2n*(1-lumbda**2))
+    # sum up the boundary contributions of every cell
+    out = geom['S'].dot(temp.reshape(nB, -1))
+    return out.reshape(-1, nP, len(cmp)).transpose(1, 2, 0).astype(dtype)
+
+
+def _holsteinChunkWorker(chunk):
+    """Worker task: kernel rows for the points chunk[0]:chunk[1]."""
+    geom, pnts, dtype = __GLOBAL__holstein__
+    return chunk, _holsteinChunk(geom, pnts[chunk[0]:chunk[1]], dtype)
+
+
+def holsteinChunkSize(mesh, cmp, memory=512):
+    """Number of points treated at once to stay within a memory budget.
+
+    Parameters
+    ----------
+    mesh : pygimli:mesh
+        tetrahedral or hexahedral mesh
+    cmp : list of str
+        component list, see :py:func:`SolveGravMagHolstein`
+    memory : float [512]
+        Memory budget in MB for the temporaries of a chunk (per worker).
+    """
+    nb = mesh.boundaryCount() * max(mesh.boundary(0).allNodeCount(), 1) \
+        if mesh.boundaryCount() > 0 else 1
+    # about 40 (boundary x node) sized float arrays, 10 more for the tensor
+    nArrays = 40 + 10 * np.any([c[0] == "B" and len(c) == 3 for c in cmp])
+    return int(max(1, memory * 1024**2 // (nb * 8 * nArrays)))
+
 
-                h1 = np.expand_dims(h, axis=3)
-                h2 = np.swapaxes(h1, 2, 3)
-                t1 = np.expand_dims(t, axis=3)
-                t2 = np.swapaxes(t1, 2, 3)
-                u1 = np.expand_dims(ut, axis=3)
-                u2 = np.swapaxes(u1, 2, 3)
+def holsteinKernel(mesh, pnts, cmp, igrf=None, dtype=float, out=None,
+                   memory=512, nWorkers=1, verbose=True):
+    """Compute the gravity and/or magnetics kernel in chunks of points.
 
-                B = (h1*h2-u1*u2)*np.expand_dims(d, (2, 3)) + \
-                    (t1*h2+h1*t2)*np.expand_dims(e, (2, 3))/2 + \
-                    (h1*u2+u1*h2)*np.expand_dims(f, (2, 3))
+    See :py:func:`SolveGravMagHolstein` for the arguments.
+    """
+    pnts = _asPoints(pnts)
+    geom = _holsteinGeometry(mesh, cmp, igrf)
+    shape = (len(pnts), len(geom['cmp']), mesh.cellCount())
+
+    if out is None:
+        out = np.zeros(shape, dtype=dtype)
+    elif isinstance(out, str):
+        out = np.lib.format.open_memmap(out, mode='w+', dtype=dtype,
+                                        shape=shape)
+    elif tuple(out.shape) != shape:
+        pg.critical("Kernel buffer needs shape", shape, "but has", out.shape)
+
+    nChunk = holsteinChunkSize(mesh, cmp, memory)
+    chunks = [(i, min(i + nChunk, len(pnts)))
+              for i in range(0, len(pnts), nChunk)]
+    if nWorkers is None:
+        nWorkers = pg.getCPUCount()
+    nWorkers = max(1, min(nWorkers, len(chunks)))
+
+    pBar = ProgressBar(its=len(pnts), width=40, sign='+') if verbose else None
+
+    def _store(chunk, k):
+        out[chunk[0]:chunk[1]] = k
+        if pBar is not None:
+            pBar.update(chunk[1] - 1)
+
+    import multiprocessing
+    if nWorkers > 1 and \
+            'fork' in multiprocessing.get_all_start_methods():
+        global __GLOBAL__holstein__
+        __GLOBAL__holstein__ = (geom, pnts, dtype)
+        try:
+            with multiprocessing.get_context('fork').Pool(nWorkers) as pool:
+                for chunk, k in pool.imap_unordered(_holsteinChunkWorker,
+                                                    chunks):
+                    _store(chunk, k)
+        finally:
+            __GLOBAL__holstein__ = None
+    else:
+        for chunk in chunks:
+            _store(chunk, _holsteinChunk(geom, pnts[chunk[0]:chunk[1]],
+                                         dtype))
+
+    if isinstance(out, np.memmap):
+        out.flush()
+
+    return out
+
+
+@pg.cache(mmap=True)
+def _cachedHolsteinKernel(mesh, pnts, cmp, igrf=None, dtype=float):
+    """Cached kernel, only the arguments defining the result are hashed.
+
+    Execution options (memory, nWorkers, verbose) are taken from
+    __GLOBAL__holsteinExec__, see :py:func:`SolveGravMagHolstein`.
+    """
+    return holsteinKernel(mesh, pnts, cmp, igrf=igrf, dtype=dtype,
+                          **__GLOBAL__holsteinExec__)
 
-                B_tens = np.expand_dims(P, (1, 2)) * np.sum(B, 1)
 
-                if 'Bxx' in cmp:
-                    temp[i, :, jj] = fakt*B_tens[:, 0, 0]
-                    jj += 1
+def SolveGravMagHolstein(mesh, pnts, cmp, igrf=None, **kwargs):
+    """Solve gravity and/or magnetics problem after Holstein (1997).
 
-                if 'Bxy' in cmp:
-                    temp[i, :, jj] = fakt*B_tens[:, 0, 1]
-                    jj += 1
+    The measuring points are processed in chunks that fit into a memory
+    budget and can be distributed over several worker processes. The
+    result is cached unless an output buffer is given.
 
-                if 'Bxz' in cmp:
-                    temp[i, :, jj] = fakt*B_tens[:, 0, 2]
-                    jj += 1
+    Parameters
+    ----------
+    mesh : pygimli:mesh
+        tetrahedral or hexahedral mesh
+    pnts : list|array of (x, y, z)
+        measuring points
+    cmp : list of str
+        component list of type str, valid values are:
+        gx, gy, gz, TFA, Bx, By, Bz, Bxx, Bxy, Bxz, Byy, Byz, Bzz
+    igrf : list|array of size 3 or 7
+        international geomagnetic reference field, either
+        [D, I, H, X, Y, Z, F] - declination, inclination, horizontal field,
+                               X/Y/Z components, total field OR
+        [X, Y, Z] - X/Y/Z components
 
-                if 'Byy' in cmp:
-                    temp[i, :, jj] = fakt*B_tens[:, 1, 1]
-                    jj += 1
+    Keyword Arguments
+    -----------------
+    dtype : numpy dtype [float]
+        Kernel data type, e.g. np.float32 to halve the memory.
+    out : ndarray | str [None]
+        Preallocated kernel buffer (nPoints x nComponents x nCells) or a file
+        name for a memory mapped .npy file that is created. Skips the cache.
+    memory : float [512]
+        Memory budget in MB for the temporaries of every worker.
+    nWorkers : int [1]
+        Number of worker processes. None for the number of CPUs.
+    verbose : bool [True]
+        Show a progress bar.
 
-                if 'Byz' in cmp:
-                    temp[i, :, jj] = fakt*B_tens[:, 1, 2]
-                    jj += 1
+    Returns
+    -------
+    out : ndarray (nPoints x nComponents x nCells)
+        kernel matrix to be multiplied with density or susceptibility
+    """
+    if kwargs.get('out', None) is not None:
+        return holsteinKernel(mesh, pnts, cmp, igrf=igrf, **kwargs)
+
+    # execution options must not change the cache key
+    global __GLOBAL__holsteinExec__
+    __GLOBAL__holsteinExec__ = {k: kwargs.pop(k) for k in
+                                ['memory', 'nWorkers', 'verbose']
+                                if k in kwargs}
+    try:
+        return _cachedHolsteinKernel(mesh, pnts, cmp, igrf=igrf, **kwargs)
+    finally:
+        __GLOBAL__holsteinExec__ = {}
+
+
+###############################################################################
+# Compressed kernel: adaptive cross approximation on a block cluster tree
+###############################################################################
+def _clusterTree(pos, radius, leafSize):
+    """Binary cluster tree by recursive bisection along the largest extent.
+
+    Every node is a dict with the indices `idx`, the bounding box `lo`, `hi`
+    (enlarged by the radius of the objects) and its `children`.
+    """
+    def _split(idx):
+        p = pos[idx]
+        r = radius[idx].max()
+        node = dict(idx=idx, lo=p.min(0) - r, hi=p.max(0) + r, children=[])
+        if len(idx) > leafSize:
+            ax = np.argmax(p.max(0) - p.min(0))
+            order = np.argsort(p[:, ax], kind='stable')
+            h = len(idx) // 2
+            node['children'] = [_split(idx[order[:h]]),
+                                _split(idx[order[h:]])]
+        return node
+
+    return _split(np.arange(len(pos)))
+
+
+def _blockTree(rows, cols, eta):
+    """Split rows x cols into admissible (far field) and dense blocks."""
+    def _admissible(a, b):
+        dist = np.linalg.norm(np.maximum(0, np.maximum(b['lo'] - a['hi'],
+                                                       a['lo'] - b['hi'])))
+        diam = min(np.linalg.norm(a['hi'] - a['lo']),
+                   np.linalg.norm(b['hi'] - b['lo']))
+        return diam <= eta * dist
+
+    far, near = [], []
+
+    def _split(a, b):
+        if _admissible(a, b):
+            far.append((a['idx'], b['idx']))
+        elif not a['children'] and not b['children']:
+            near.append((a['idx'], b['idx']))
+        else:
+            for ca in a['children'] or [a]:
+                for cb in b['children'] or [b]:
+                    _split(ca, cb)
 
-                if 'Bzz' in cmp:
-                    temp[i, :, jj] = fakt * B_tens[:, 2, 2]
-                    jj += 1
+    _split(rows, cols)
+    return far, near
+
+
+def _aca(row, col, m, n, tol, maxRank):
+    """Adaptive cross approximation with partial pivoting.
+
+    Approximates a m x n block, given by functions for single rows and
+    columns, by U (m x k) @ V (k x n) up to the relative accuracy tol
+    (Frobenius norm). The cross approximation is recompressed by a
+    truncated SVD. Returns None if the rank exceeds maxRank.
+    """
+    U, V = [], []
+    norm2 = 0.0
+    usedRows = np.zeros(m, dtype=bool)
+    i = 0
+    while len(U) < maxRank:
+        usedRows[i] = True
+        r = row(i)
+        if U:
+            r -= np.array(U)[:, i].dot(V)
+        j = np.argmax(np.abs(r))
+        if abs(r[j]) <= 1e-300:  # row already exact, try another one
+            if usedRows.all():
+                break
+            i = np.argmin(usedRows)
+            continue
+
+        v = r / r[j]
+        u = col(j)
+        if U:
+            u -= np.array(V)[:, j].dot(U)
+
+        uu, vv = u.dot(u), v.dot(v)
+        if U:
+            norm2 += 2 * np.dot(np.array(U).dot(u), np.array(V).dot(v))
+        norm2 += uu * vv
+        U.append(u)
+        V.append(v)
+
+        if np.sqrt(uu * vv) <= tol * np.sqrt(abs(norm2)):
+            break
+
+        au = np.abs(u)
+        au[usedRows] = -1
+        if au.max() < 0:
+            break
+        i = np.argmax(au)
+    else:
+        return None
+
+    if not U:
+        return np.zeros((m, 0)), np.zeros((0, n))
+
+    # recompress, ACA overestimates the rank
+    U, V = np.array(U).T, np.array(V)
+    if U.shape[1] > 1:
+        qu, ru = np.linalg.qr(U)
+        qv, rv = np.linalg.qr(V.T)
+        w, sv, zt = np.linalg.svd(ru.dot(rv.T))
+        tail = np.sqrt(np.cumsum(sv[::-1]**2))[::-1]  # norm of sv[i:]
+        k = max(1, np.sum(tail > tol * tail[0]))
+        U, V = qu.dot(w[:, :k] * sv[:k]), zt[:k].dot(qv.T)
+    return U, V
+
+
+class ACAKernelMatrix(pg.matrix.MatrixBase):
+    """Compressed Holstein kernel of a single component.
+
+    The kernel (nPoints x nCells) is partitioned by cluster trees of the
+    measuring points and the cells. Blocks of distant clusters are
+    approximated by low-rank products U @ V computed with adaptive cross
+    approximation (ACA) from single kernel rows and columns, so the dense
+    kernel is never built. Near field blocks are stored dense.
+
+    Points and cells are renumbered in cluster tree order, so every block
+    covers a contiguous range of rows and columns. Blocks are kept as dense
+    arrays together with their index ranges, i.e., without per entry
+    indices.
+
+    Use :py:func:`holsteinACAMatrices` to create it.
+    """
 
-        pBar.update(i)
+    def __init__(self, geom, pnts, cellPos, cellRadius, tol=1e-4, eta=2.0,
+                 leafSize=32, verbose=False):
+        super().__init__()
+        self.ndim = 2
+        self.tol = tol
+        nRows, nCols = len(pnts), len(cellPos)
+        self._nRows, self._nCols = nRows, nCols
+
+        S = geom['S']
+        rows = _clusterTree(pnts, np.zeros(nRows), leafSize)
+        cols = _clusterTree(cellPos, cellRadius, leafSize)
+        far, near = _blockTree(rows, cols, eta)
+
+        def _leafOrder(node):
+            if not node['children']:
+                return [node['idx']]
+            return sum([_leafOrder(c) for c in node['children']], [])
+
+        # tree order: every cluster is a contiguous range of the leaf order
+        self.rowPerm = np.concatenate(_leafOrder(rows))
+        self.colPerm = np.concatenate(_leafOrder(cols))
+        rowPos = np.argsort(self.rowPerm)
+        colPos = np.argsort(self.colPerm)
+
+        def _range(pos, ids):
+            p = pos[ids]
+            return int(p.min()), int(p.min()) + len(ids)
+
+        def _sorted(pos, ids):
+            """Cluster indices in tree order."""
+            return ids[np.argsort(pos[ids])]
+
+        def _cells(cIds):
+            """Geometry restricted to the boundaries of some cells."""
+            Sc = S[cIds]
+            bIds = np.unique(Sc.indices)
+            return dict(geom, nb=geom['nb'][bIds], S=Sc[:, bIds])
+
+        def _block(g, rIds):
+            return _holsteinChunk(g, pnts[rIds])[:, 0, :]
+
+        # (rowRange, colRange, D) near field, (rowRange, colRange, U, V) far
+        self.dense, self.lowRank = [], []
+        self.rank = 0
+
+        far = [(_sorted(rowPos, r), _sorted(colPos, c)) for r, c in far]
+        near = [(_sorted(rowPos, r), _sorted(colPos, c)) for r, c in near]
+
+        for rIds, cIds in far:
+            gc = _cells(cIds)
+            m, n = len(rIds), len(cIds)
+            UV = _aca(lambda i: _block(gc, rIds[i:i+1])[0],
+                      lambda j: _block(_cells(cIds[j:j+1]), rIds)[:, 0],
+                      m, n, tol, maxRank=max(1, m * n // (2 * (m + n))))
+            rr, cr = _range(rowPos, rIds), _range(colPos, cIds)
+            if UV is None:
+                self.dense.append((rr, cr, _block(gc, rIds)))
+            elif UV[0].shape[1] > 0:
+                self.lowRank.append((rr, cr, UV[0], UV[1]))
+                self.rank += UV[0].shape[1]
+
+        for rIds, cIds in near:
+            self.dense.append((_range(rowPos, rIds), _range(colPos, cIds),
+                               _block(_cells(cIds), rIds)))
+
+        if verbose:
+            pg.info("ACA kernel {0} x {1}: {2} low-rank and {3} dense blocks "
+                    "(rank sum {4}), compression {5:.3f}".format(
+                        nRows, nCols, len(self.lowRank), len(self.dense),
+                        self.rank, self.compression()))
+
+    def rows(self):
+        """Number of measuring points."""
+        return self._nRows
+
+    def cols(self):
+        """Number of cells."""
+        return self._nCols
+
+    def nBytes(self):
+        """Memory of the stored blocks and permutations in bytes."""
+        return self.rowPerm.nbytes + self.colPerm.nbytes + \
+            sum(D.nbytes + 32 for _, _, D in self.dense) + \
+            sum(U.nbytes + V.nbytes + 32 for _, _, U, V in self.lowRank)
+
+    def compression(self):
+        """Stored size relative to the dense float64 kernel."""
+        return self.nBytes() / (8.0 * self._nRows * self._nCols)
+
+    def mult(self, x):
+        """Kernel times model vector."""
+        x = np.asarray(x)[self.colPerm]
+        y = np.zeros(self._nRows)
+        for (r0, r1), (c0, c1), D in self.dense:
+            y[r0:r1] += D.dot(x[c0:c1])
+        for (r0, r1), (c0, c1), U, V in self.lowRank:
+            y[r0:r1] += U.dot(V.dot(x[c0:c1]))
+
+        out = np.empty_like(y)
+        out[self.rowPerm] = y
+        return out
+
+    def transMult(self, y):
+        """Transposed kernel times data vector."""
+        y = np.asarray(y)[self.rowPerm]
+        x = np.zeros(self._nCols)
+        for (r0, r1), (c0, c1), D in self.dense:
+            x[c0:c1] += y[r0:r1].dot(D)
+        for (r0, r1), (c0, c1), U, V in self.lowRank:
+            x[c0:c1] += y[r0:r1].dot(U).dot(V)
+
+        out = np.empty_like(x)
+        out[self.colPerm] = x
+        return out
+
+    def toDense(self):
+        """Assemble the approximated kernel as dense array (for testing)."""
+        A = np.zeros((self._nRows, self._nCols))
+        for (r0, r1), (c0, c1), D in self.dense:
+            A[r0:r1, c0:c1] += D
+        for (r0, r1), (c0, c1), U, V in self.lowRank:
+            A[r0:r1, c0:c1] += U.dot(V)
+
+        out = np.empty_like(A)
+        out[np.ix_(self.rowPerm, self.colPerm)] = A
+        return out
+
+
+def holsteinACAMatrices(mesh, pnts, cmp, igrf=None, tol=1e-4, eta=2.0,
+                        leafSize=32, verbose=False):
+    """Compressed gravity and/or magnetics kernel after Holstein (1997).
+
+    Instead of the dense kernel of :py:func:`SolveGravMagHolstein`, a
+    hierarchical low-rank approximation is built for every component. Memory
+    and the cost of response and Jacobian products scale about linearly
+    with the number of points and cells instead of their product.
 
-    kernel += np.array([np.sum(temp[:, cl[cl[:, 1] == j, 0]], 1) for j in rr])
-    kernel -= np.array([np.sum(temp[:, cr[cr[:, 1] == j, 0]], 1) for j in rr])
+    Parameters
+    ----------
+    mesh : pygimli:mesh
+        tetrahedral or hexahedral mesh
+    pnts : list|array of (x, y, z)
+        measuring points
+    cmp : list of str
+        component list, see :py:func:`SolveGravMagHolstein`
+    igrf : list|array of size 3 or 7
+        international geomagnetic reference field
+    tol : float [1e-4]
+        Relative accuracy of the low-rank blocks.
+    eta : float [2.0]
+        Admissibility parameter. Blocks are approximated if the smaller
+        cluster diameter is below eta times the cluster distance.
+    leafSize : int [32]
+        Maximum number of points or cells of a leaf cluster.
+    verbose : bool [False]
+        Print the compression of every component.
 
-    return kernel.transpose([1, 2, 0])
+    Returns
+    -------
+    mats : list of ACAKernelMatrix
+        One matrix (nPoints x nCells) per component, in the same order as
+        the components of the dense kernel.
+    """
+    pnts = _asPoints(pnts)
+    geom = _holsteinGeometry(mesh, cmp, igrf)
+
+    cellPos = np.array([c.center() for c in mesh.cells()])
+    cellRadius = np.array([max(c.center().distance(n.pos())
+                               for n in c.nodes()) for c in mesh.cells()])
+
+    mats = []
+    for c in geom['cmp']:
+        gc = dict(geom, cmp=[c], doG=c[0] == 'g',
+                  doB=c == 'TFA' or (c[0] == 'B' and len(c) == 2),
+                  doBT=c[0] == 'B' and len(c) == 3)
+        mats.append(ACAKernelMatrix(gc, pnts, cellPos, cellRadius, tol=tol,
+                                    eta=eta, leafSize=leafSize,
+                                    verbose=verbose))
+    return mats
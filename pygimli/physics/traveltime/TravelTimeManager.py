@@ -9,7 +9,8 @@ import pygimli as pg
 from pygimli.frameworks import MeshMethodManager
 
 from pygimli.utils import getSavePath
-from . modelling import TravelTimeDijkstraModelling, FatrayDijkstraModelling
+from . modelling import (TravelTimeDijkstraModelling, FatrayDijkstraModelling,
+                         EikonalModelling)
 from . plotting import drawFirstPicks
 
 
@@ -30,6 +31,7 @@ class TravelTimeManager(MeshMethodManager):
             when calling the inversion.
         """
         self.useFatray = kwargs.pop("fatray", False)
+        self.useEikonal = kwargs.pop("eikonal", False)
         self.frequency = kwargs.pop("frequency", 100.)
         self.secNodes = kwargs.pop("secNodes", 2)
 
@@ -47,10 +49,14 @@ class TravelTimeManager(MeshMethodManager):
         """Create default forward operator for Traveltime modelling.
 
         Your want your Manager use a special forward operator you can add them
-        here on default Dijkstra is used.
+        here on default Dijkstra is used. With eikonal=True, the eikonal
+        equation is solved on the mesh nodes without secondary nodes.
         """
         if self.useFatray:
             fop = FatrayDijkstraModelling(frequency=self.frequency, **kwargs)
+        elif self.useEikonal:
+            kwargs.setdefault('verbose', self.verbose)
+            fop = EikonalModelling(**kwargs)
         else:
             fop = TravelTimeDijkstraModelling(verbose=self.verbose)
         return fop
@@ -399,11 +405,8 @@ class TravelTimeManager(MeshMethodManager):
         startPos = startPos or self.data.sensor(0)
         fop = self.fop
         mesh = fop.mesh()
-        Di = fop.dijkstra
-        slowPerCell = fop.createMappedModel(1/v, 1e16)
-        Di.setGraph(fop._core.createGraph(slowPerCell))
-        Di.setStartNode(mesh.findNearestNode(startPos))
-        dist = Di.distances()
+        dist = fop.travelTimeTable([mesh.findNearestNode(startPos)],
+                                   1/np.asarray(v))[0]
         if withSec:
             return dist
         else:
@@ -11,6 +11,7 @@ from .utils import (createGradientModel2D, createRAData, shotReceiverDistances,
 #from .refraction import Refraction, Tomography # will be removed(201909)
 from .refraction1d import RefractionNLayer, RefractionNLayerFix1stLayer
 from .TravelTimeManager import TravelTimeDijkstraModelling, TravelTimeManager
+from .modelling import EikonalModelling
 
 Manager = TravelTimeManager
 DataContainer = DataContainerTT
@@ -27,5 +28,6 @@ __all__ = [
     'RefractionNLayerFix1stLayer',
     'shotReceiverDistances',
     'TravelTimeManager',
-    'TravelTimeDijkstraModelling'
+    'TravelTimeDijkstraModelling',
+    'EikonalModelling'
 ]
@@ -0,0 +1,503 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Eikonal (fast marching type) travel time solver for unstructured meshes."""
+
+from itertools import combinations
+
+import numpy as np
+import pygimli as pg
+
+# split of non-simplex cells into simplices (local node indices)
+_SIMPLEX_SPLIT = {
+    (2, 3): [(0, 1, 2)],
+    (2, 4): [(0, 1, 2), (0, 2, 3)],  # quadrangle
+    (3, 4): [(0, 1, 2, 3)],
+    (3, 6): [(0, 1, 2, 3), (1, 2, 3, 4), (2, 3, 4, 5)],  # triangle prism
+    (3, 8): [(0, 1, 2, 6), (0, 2, 3, 6), (0, 3, 7, 6),  # hexahedron
+             (0, 7, 4, 6), (0, 4, 5, 6), (0, 5, 1, 6)],
+}
+
+
+def meshSimplices(mesh):
+    """Split the mesh cells into triangles (2D) or tetrahedrons (3D).
+
+    Parameters
+    ----------
+    mesh : :gimliapi:`GIMLI::Mesh`
+        Linear mesh of triangles, quadrangles, tetrahedrons, prisms or
+        hexahedrons.
+
+    Returns
+    -------
+    simplices : np.ndarray (nSimplices, dim + 1)
+        Node indices of the simplices.
+    cellIds : np.ndarray (nSimplices)
+        Cell id of the simplices.
+    """
+    dim = mesh.dim()
+    simplices, cellIds = [], []
+    for c in mesh.cells():
+        ids = np.fromiter((c.node(i).id() for i in range(c.nodeCount())),
+                          dtype=int, count=c.nodeCount())
+        split = _SIMPLEX_SPLIT.get((dim, len(ids)))
+        if split is None:
+            pg.critical("Cell type with {0} nodes not supported in {1}D."
+                        .format(len(ids), dim))
+        for s in split:
+            simplices.append(ids[list(s)])
+            cellIds.append(c.id())
+
+    return np.array(simplices, dtype=int), np.array(cellIds, dtype=int)
+
+
+class EikonalSolver(object):
+    """First order eikonal solver on triangle and tetrahedral meshes.
+
+    Travel times are defined on the mesh nodes and linear inside a simplex of
+    constant slowness. A node is updated from the opposite vertices, edges
+    and faces of its adjacent simplices with the smallest travel time of a
+    straight ray segment to the linearly interpolated wave front
+    (Hopf-Lax update, Bornemann & Rasch, 2006). The updates are iterated on
+    the active nodes only until the travel times stop changing (fast
+    iterative method, Jeong & Whitaker, 2008). All sources are computed
+    simultaneously.
+
+    The update winning for each node stores the point where the ray crosses
+    the upwind face. Backtracing these points from a receiver gives the ray
+    path and the Jacobian (way matrix) :math:`\\partial t/\\partial s` of
+    the discrete travel times, see :py:meth:`jacobian`.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> import pygimli as pg
+    >>> from pygimli.physics.traveltime.eikonal import EikonalSolver
+    >>> mesh = pg.createGrid(np.linspace(0, 10, 21), np.linspace(0, 5, 11))
+    >>> es = EikonalSolver(mesh)
+    >>> T = es.solve([0], np.ones(mesh.cellCount()))
+    >>> print(np.round([T[-1, 0], np.hypot(10, 5)], 2))  # corner, exact
+    [11.26 11.18]
+    """
+
+    def __init__(self, mesh, sourceRings=3, verbose=False):
+        """Initialize solver and geometry of all updates for given mesh.
+
+        Parameters
+        ----------
+        mesh : :gimliapi:`GIMLI::Mesh`
+            Mesh, non-simplex cells are split into simplices.
+        sourceRings : int [3]
+            Node rings around the source initialized with straight rays to
+            avoid the first order error of the point source singularity.
+            The slowness is integrated along the rays through all cells
+            they cross.
+        verbose : bool [False]
+            Be verbose.
+        """
+        from scipy.sparse import csr_matrix
+
+        self.verbose = verbose
+        self.mesh = mesh
+        self.sourceRings = sourceRings
+        self.nNodes = mesh.nodeCount()
+        self.nCells = mesh.cellCount()
+        dim = mesh.dim()
+        self._pos = pos = np.asarray(mesh.positions())[:, :dim]
+        simplices, cellIds = meshSimplices(mesh)
+        self._simplices, self._simplexCells = simplices, cellIds
+        # barycentric coordinates: lambda[1:] = B (x - x0)
+        self._bary = np.linalg.inv(np.transpose(
+            pos[simplices[:, 1:]] - pos[simplices[:, :1]], (0, 2, 1)))
+
+        i, j = np.triu_indices(dim + 1, 1)
+        a, b = simplices[:, i].ravel(), simplices[:, j].ravel()
+        self._adjacency = csr_matrix((np.ones(2 * len(a)),
+                                      (np.r_[a, b], np.r_[b, a])),
+                                     shape=(self.nNodes, self.nNodes))
+
+        # updates grouped by number of upwind (support) nodes
+        self._updates = {}
+        for m in range(1, dim + 1):
+            X, S, C = [], [], []
+            for j in range(dim + 1):
+                others = [k for k in range(dim + 1) if k != j]
+                for sup in combinations(others, m):
+                    X.append(simplices[:, j])
+                    S.append(simplices[:, list(sup)])
+                    C.append(cellIds)
+            X, S, C = np.concatenate(X), np.concatenate(S), np.concatenate(C)
+
+            if m == 1:  # edges are shared by cells, keep unique ones
+                _, idx = np.unique(np.column_stack([X, S[:, 0], C]),
+                                   axis=0, return_index=True)
+            else:
+                idx = np.argsort(X, kind='stable')
+            X, S, C = X[idx], S[idx], C[idx]  # sorted by target node
+
+            u = dict(X=X, S=S, C=C)
+            r = pos[X] - pos[S[:, 0]]
+            if m == 1:
+                u['L'] = np.linalg.norm(r, axis=1)
+            else:
+                E = pos[S[:, 1:]] - pos[S[:, :1]]
+                G = np.einsum('nid,njd->nij', E, E)
+                u['Ginv'] = np.linalg.inv(G)
+                Er = np.einsum('nid,nd->ni', E, r)
+                u['c'] = np.einsum('nij,nj->ni', u['Ginv'], Er)
+                u['h2'] = np.maximum(np.einsum('nd,nd->n', r, r) -
+                                     np.einsum('ni,ni->n', u['c'], Er), 0.0)
+            self._updates[m] = u
+
+        self.T = None
+        self._slowness = None
+        self._winner = None
+        self._straight = None
+
+    def _update(self, m, idx, src, T, slowness):
+        """Travel times for the updates idx of group m and sources src.
+
+        Returns
+        -------
+        t : np.ndarray (len(idx))
+            Updated travel time (inf if not valid).
+        mu : np.ndarray (len(idx), m)
+            Weights of the support nodes for the ray crossing point.
+        L : np.ndarray (len(idx))
+            Length of the ray segment.
+        """
+        u = self._updates[m]
+        s = slowness[u['C'][idx]]
+        Ts = T[u['S'][idx], np.asarray(src)[:, None]]  # (n, m)
+
+        if m == 1:
+            L = u['L'][idx]
+            return Ts[:, 0] + s * L, np.ones_like(Ts), L
+
+        T0 = Ts[:, 0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            g = Ts[:, 1:] - T0[:, None]
+            a = np.einsum('nij,nj->ni', u['Ginv'][idx], g) / s[:, None]
+            q = np.einsum('ni,ni->n', g, a) / s
+            L = np.sqrt(u['h2'][idx] / (1.0 - q))
+            mu = u['c'][idx] - a * L[:, None]
+            t = T0 + np.einsum('ni,ni->n', g, mu) + s * L
+
+            eps = 1e-12
+            muSum = mu.sum(axis=1)
+            valid = np.isfinite(t) & (q < 1.0) & \
+                np.all(mu >= -eps, axis=1) & (muSum <= 1.0 + eps)
+        t[~valid] = np.inf
+        mu = np.column_stack([1.0 - muSum, mu])
+        return t, mu, L
+
+    def solve(self, sources, slowness, tol=1e-10, maxIter=None):
+        """Compute the travel times for several source nodes at once.
+
+        Parameters
+        ----------
+        sources : iterable
+            Source node indices.
+        slowness : iterable
+            Slowness per cell.
+        tol : float [1e-10]
+            Relative change of travel time to keep a node active.
+        maxIter : int [None]
+            Maximum number of iterations, defaults to number of nodes.
+
+        Returns
+        -------
+        T : np.ndarray (nNodes, nSources)
+            Travel times.
+        """
+        sources = np.asarray(sources, dtype=int)
+        slowness = np.asarray(slowness, dtype=float)
+        if len(slowness) != self.nCells:
+            pg.critical("Slowness needs to be given per cell:",
+                        len(slowness), "!=", self.nCells)
+
+        nSrc = len(sources)
+        T = np.full((self.nNodes, nSrc), np.inf)
+        T[sources, np.arange(nSrc)] = 0.0
+        winM = np.zeros((self.nNodes, nSrc), dtype=np.int8)
+        winI = np.zeros((self.nNodes, nSrc), dtype=np.int64)
+
+        # straight rays for the nodes around the sources
+        R = np.zeros((self.nNodes, nSrc))
+        R[sources, np.arange(nSrc)] = 1.0
+        for _ in range(self.sourceRings):
+            R += self._adjacency @ R
+        if self.sourceRings > 0:
+            X, iS, self._straight = self._straightRays(sources, R > 0,
+                                                       slowness)
+            T[X, iS] = self._straight @ slowness
+            winM[X, iS] = -1
+            winI[X, iS] = np.arange(len(X))
+
+        active = R > 0  # per node and source
+        Tf = T.ravel()  # view
+        maxIter = maxIter or self.nNodes
+        it = 0
+        while active.any() and it < maxIter:
+            T0 = T.copy()
+            for m, u in self._updates.items():
+                act = active[u['S'][:, 0]]
+                for k in range(1, m):
+                    act |= active[u['S'][:, k]]
+                idx, src = np.nonzero(act)
+                if len(idx) == 0:
+                    continue
+                t = self._update(m, idx, src, T, slowness)[0]
+                key = u['X'][idx] * nSrc + src
+                Tb = Tf[key]
+                np.minimum.at(Tf, key, t)
+                w = np.nonzero((t < Tb) & (t <= Tf[key]))[0]
+                winM.ravel()[key[w]] = m
+                winI.ravel()[key[w]] = idx[w]
+
+            with np.errstate(invalid='ignore'):
+                active = T0 - T > tol * T
+            it += 1
+
+        if self.verbose:
+            pg.info("Eikonal solver: {0} iterations for {1} sources".format(
+                it, nSrc))
+
+        self.T = T
+        self._slowness = slowness
+        self._winner = (winM, winI)
+        return T
+
+    def _straightRays(self, sources, near, slowness):
+        """Straight rays from the sources to the nodes near them.
+
+        Every ray is clipped by all simplices touching the near nodes, so
+        its length is split exactly over the cells it crosses. Parts on a
+        cell boundary count for the adjacent cell of minimum slowness. Rays
+        leaving these simplices (e.g. at concave boundaries) are skipped.
+
+        Returns
+        -------
+        X, iS : arrays
+            Node and source index of the rays.
+        D : scipy.sparse.csr_matrix (len(X), nCells)
+            Ray length per cell.
+        """
+        from scipy.sparse import csr_matrix
+
+        pos, simp, B = self._pos, self._simplices, self._bary
+        sSlow = slowness[self._simplexCells]
+        nodeSimplex = csr_matrix(
+            (np.ones(simp.size), (simp.ravel(),
+                                  np.repeat(np.arange(len(simp)),
+                                            simp.shape[1]))),
+            shape=(self.nNodes, len(simp)))
+        eps = 1e-10
+        X, iS, rows, cols, vals = [], [], [], [], []
+        nRays = 0
+        for i, src in enumerate(sources):
+            nodes = np.nonzero(near[:, i])[0]
+            cand = np.unique(nodeSimplex[nodes].indices)
+            nodes = nodes[nodes != src]
+            if len(nodes) == 0 or len(cand) == 0:
+                continue
+
+            # barycentric coordinates along the rays: lam0 + t * dLam
+            x0 = pos[simp[cand, 0]]
+            lamS = np.einsum('cij,cj->ci', B[cand], pos[src] - x0)
+            lamN = np.einsum('cij,ncj->nci', B[cand],
+                             pos[nodes][:, None] - x0[None])
+            lam0 = np.concatenate([1 - lamS.sum(1, keepdims=True), lamS],
+                                  axis=1)[None]
+            dLam = np.concatenate([1 - lamN.sum(2, keepdims=True), lamN],
+                                  axis=2) - lam0
+
+            # parameter interval [tLo, tHi] of every ray inside a simplex
+            with np.errstate(divide='ignore', invalid='ignore'):
+                tb = -lam0 / dLam
+            up, down = dLam > eps, dLam < -eps
+            tLo = np.max(np.where(up, tb, 0.0), axis=2)
+            tHi = np.min(np.where(down, tb, 1.0), axis=2)
+            inside = np.all(up | down | (lam0 >= -eps), axis=2)
+            tLo, tHi = np.maximum(tLo, 0.0), np.minimum(tHi, 1.0)
+            inside &= tHi - tLo > eps
+
+            # split rays at all interval ends, cheapest simplex per piece
+            ends = np.sort(np.concatenate([np.where(inside, tLo, 1.0),
+                                           np.where(inside, tHi, 1.0)],
+                                          axis=1), axis=1)
+            ends = np.concatenate([np.zeros((len(nodes), 1)), ends], axis=1)
+            mid = (ends[:, :-1] + ends[:, 1:]) / 2
+            dt = np.diff(ends, axis=1)
+            cover = inside[:, None, :] & \
+                (tLo[:, None, :] <= mid[:, :, None]) & \
+                (mid[:, :, None] <= tHi[:, None, :])
+            sMid = np.where(cover, sSlow[cand][None, None, :], np.inf)
+            best = np.argmin(sMid, axis=2)
+            hit = np.isfinite(np.min(sMid, axis=2)) & (dt > 0)
+
+            complete = np.abs(np.sum(np.where(hit, dt, 0.0), axis=1) -
+                              1.0) < 1e-8
+            r, k = np.nonzero(hit & complete[:, None])
+            L = np.linalg.norm(pos[nodes] - pos[src], axis=1)
+            rows.append(nRays + (np.cumsum(complete) - 1)[r])
+            cols.append(self._simplexCells[cand[best[r, k]]])
+            vals.append(L[r] * dt[r, k])
+            X.append(nodes[complete])
+            iS.append(np.full(complete.sum(), i))
+            nRays += complete.sum()
+
+        if nRays == 0:
+            return (np.zeros(0, dtype=int), np.zeros(0, dtype=int),
+                    csr_matrix((0, self.nCells)))
+
+        X, iS = np.concatenate(X), np.concatenate(iS)
+        D = csr_matrix((np.concatenate(vals), (np.concatenate(rows),
+                                               np.concatenate(cols))),
+                       shape=(len(X), self.nCells))
+        return X, iS, D
+
+    def _upwind(self, iSrc):
+        """Winning update for all nodes of source iSrc.
+
+        Returns
+        -------
+        X, S, mu, L, C : arrays
+            Node, support nodes (padded with -1), support weights, segment
+            length and cell of the winning updates.
+        """
+        winM, winI = self._winner[0][:, iSrc], self._winner[1][:, iSrc]
+        dim = max(self._updates)
+        out = []
+        for m, u in self._updates.items():
+            X = np.nonzero(winM == m)[0]
+            idx = winI[X]
+            _, mu, L = self._update(m, idx, np.full(len(X), iSrc), self.T,
+                                    self._slowness)
+            S = np.full((len(X), dim), -1, dtype=int)
+            S[:, :m] = u['S'][idx]
+            Mu = np.zeros((len(X), dim))
+            Mu[:, :m] = mu
+            out.append((X, S, Mu, L, u['C'][idx]))
+
+        X = np.nonzero(winM == -1)[0]
+        D = self._straight[winI[X]].tocoo()  # several cells per ray
+        out.append((X[D.row], np.full((D.nnz, dim), -1, dtype=int),
+                    np.zeros((D.nnz, dim)), D.data, D.col))
+
+        return [np.concatenate(o) for o in zip(*out)]
+
+    def jacobian(self, iSrc, receivers):
+        """Jacobian (ray path lengths per cell) for one source.
+
+        The travel times fulfil :math:`t = Wt + Ds`, with the sparse matrix
+        W holding the upwind weights and D the ray segment lengths per cell,
+        so that the sensitivity rows are :math:`(I-W)^{-1}D` for the receiver
+        nodes. W is acyclic, so the receiver weights are pushed back to the
+        source through the upwind nodes in topological order. Only the nodes
+        on the ray tubes are touched and all matrices stay sparse.
+
+        Parameters
+        ----------
+        iSrc : int
+            Index of the source in the last solve call.
+        receivers : iterable
+            Receiver node indices.
+
+        Returns
+        -------
+        J : scipy.sparse.csr_matrix (len(receivers), nCells)
+            Derivative of travel times with respect to cell slowness.
+        """
+        from scipy.sparse import csr_matrix, coo_matrix
+
+        X, S, Mu, L, C = self._upwind(iSrc)
+        mask = (S >= 0) & (Mu != 0)
+        W = csr_matrix((Mu[mask], (np.repeat(X, mask.sum(axis=1)),
+                                   S[mask])), shape=(self.nNodes,) * 2)
+        D = csr_matrix((L, (X, C)), shape=(self.nNodes, self.nCells))
+
+        receivers = np.asarray(receivers, dtype=int)
+        nRec = len(receivers)
+
+        # nodes upwind of the receivers
+        reached = np.zeros(self.nNodes, dtype=bool)
+        reached[receivers] = True
+        front = np.unique(receivers)
+        while len(front):
+            front = np.unique(W[front].indices)
+            front = front[~reached[front]]
+            reached[front] = True
+
+        # level: longest path from any receiver, all nodes pushing to a
+        # node have a smaller level (Kahn's algorithm on the reached nodes)
+        nIn = np.bincount(W[reached].indices, minlength=self.nNodes)
+        level = np.full(self.nNodes, -1)
+        ready = np.nonzero(reached & (nIn == 0))[0]
+        nLevels = 0
+        while len(ready):
+            level[ready] = nLevels
+            sup = W[ready].indices
+            np.subtract.at(nIn, sup, 1)
+            ready = np.unique(sup[nIn[sup] == 0])
+            nLevels += 1
+
+        if np.any(reached & (level < 0)):
+            pg.warn("Cyclic upwind dependencies, Jacobian is incomplete.")
+
+        # push receiver weights level by level, Y = (I-W)^-T E
+        buckets = [[] for _ in range(nLevels)]
+        ok = level[receivers] >= 0
+        for n, r in zip(receivers[ok], np.nonzero(ok)[0]):
+            buckets[level[n]].append((np.array([n]), np.array([r]),
+                                      np.ones(1)))
+        rows, cols, vals = [], [], []
+        for k in range(nLevels):
+            if not buckets[k]:
+                continue
+            r, c, v = (np.concatenate(b) for b in zip(*buckets[k]))
+            buckets[k] = None
+            nodes, iN = np.unique(r, return_inverse=True)
+            Yk = coo_matrix((v, (iN, c)), shape=(len(nodes), nRec)).tocsr()
+            Yk.sum_duplicates()
+            Yc = Yk.tocoo()
+            rows.append(nodes[Yc.row])
+            cols.append(Yc.col)
+            vals.append(Yc.data)
+
+            # push to the support nodes, compact columns to stay local
+            Wk = W[nodes]
+            sup, iS = np.unique(Wk.indices, return_inverse=True)
+            Wk = csr_matrix((Wk.data, iS.ravel(), Wk.indptr),
+                            shape=(len(nodes), len(sup)))
+            P = (Wk.T @ Yk).tocoo()
+            pRow = sup[P.row]
+            lv = level[pRow]
+            for lk in np.unique(lv[lv > k]):
+                sel = lv == lk
+                buckets[lk].append((pRow[sel], P.col[sel], P.data[sel]))
+
+        if not rows:
+            return csr_matrix((nRec, self.nCells))
+
+        Y = csr_matrix((np.concatenate(vals), (np.concatenate(rows),
+                                               np.concatenate(cols))),
+                       shape=(self.nNodes, nRec))
+        return (D.T @ Y).T.tocsr()
+
+    def way(self, iSrc, node):
+        """Node indices of the ray path from the source to node.
+
+        Follows the upwind support node with the largest weight.
+        """
+        winM, winI = self._winner[0][:, iSrc], self._winner[1][:, iSrc]
+        way = [node]
+        while winM[way[-1]] > 0 and len(way) <= self.nNodes:
+            m = winM[way[-1]]
+            idx = winI[way[-1]:way[-1]+1]
+            mu = self._update(m, idx, [iSrc], self.T, self._slowness)[1][0]
+            way.append(self._updates[m]['S'][idx[0], np.argmax(mu)])
+
+        if winM[way[-1]] == -1:  # straight ray to the source
+            way.append(np.nonzero(self.T[:, iSrc] == 0)[0][0])
+
+        return np.array(way[::-1])
@@ -16,6 +16,7 @@ class TravelTimeDijkstraModelling(MeshModelling):
 
     def __init__(self, **kwargs):
         secNodes = kwargs.pop("secNodes", 3)
+        self.nWorkers = kwargs.pop('nWorkers', None)
         super().__init__(**kwargs)
 
         self._core = pg.core.TravelTimeDijkstraModelling()
@@ -28,6 +29,8 @@ class TravelTimeDijkstraModelling(MeshModelling):
         self.setThreadCount = self._core.setThreadCount
         # self.createJacobian = self.dijkstra.createJacobian
         self.setJacobian(self._core.jacobian())
+        self._graphTopo = None  # node pairs of the graph for current mesh
+        self._ttTable = None  # last travel time table
 
     @property
     def dijkstra(self):
@@ -63,6 +66,184 @@ class TravelTimeDijkstraModelling(MeshModelling):
         """Create Dijkstra graph."""
         return self._core.createGraph(slowness)
 
+    def _graphTopology(self):
+        """Edges of the Dijkstra graph for the forward mesh.
+
+        Like the core graph, all nodes of a cell including the secondary
+        nodes of the cell and its boundaries are connected. Only depends on
+        the mesh and is therefore cached.
+
+        Returns
+        -------
+        a, b : array
+            Start and end node of all edges (a < b).
+        dist : array
+            Edge length.
+        cellIds : array
+            Cell id for every cell contribution of the edges.
+        edge : array
+            Edge index for every cell contribution.
+        """
+        mesh = self.mesh()
+        key = (mesh.hash(), mesh.secondaryNodeCount())
+        if self._graphTopo is not None and self._graphTopo[0] == key:
+            return self._graphTopo[1]
+
+        groups = {}  # cell node ids grouped by number of nodes
+        for c in mesh.cells():
+            ids = [n.id() for n in c.allNodes()]
+            for i in range(c.boundaryCount()):
+                ids.extend([n.id() for n in c.boundary(i).secondaryNodes()])
+            g = groups.setdefault(len(ids), [[], []])
+            g[0].append(ids)
+            g[1].append(c.id())
+
+        pairs, cellIds = [], []
+        for n, (ids, cIds) in groups.items():
+            ids = np.asarray(ids)
+            j, k = np.triu_indices(n, 1)
+            pairs.append(np.sort(np.stack([ids[:, j].ravel(),
+                                           ids[:, k].ravel()]), axis=0))
+            cellIds.append(np.repeat(cIds, len(j)))
+
+        pairs = np.concatenate(pairs, axis=1)
+        cellIds = np.concatenate(cellIds)
+        pairs, edge = np.unique(pairs, axis=1, return_inverse=True)
+        pos = np.asarray(mesh.positions(withSecNodes=True))
+        dist = np.linalg.norm(pos[pairs[0]] - pos[pairs[1]], axis=1)
+        # ensure connection between 3d boundaries
+        dist = np.maximum(dist, 1e-8)
+
+        topo = (pairs[0], pairs[1], dist, cellIds, edge.ravel())
+        self._graphTopo = (key, topo)
+        return topo
+
+    def _edgeSlowness(self, slowPerCell):
+        """Minimum slowness of the cells adjacent to every graph edge."""
+        a, b, dist, cellIds, edge = self._graphTopology()
+        edgeSlow = np.full(len(a), np.inf)
+        np.minimum.at(edgeSlow, edge, slowPerCell[cellIds])
+        return edgeSlow
+
+    def createGraphMatrix(self, slowness):
+        """Create the Dijkstra graph as sparse (CSR) adjacency matrix.
+
+        Parameters
+        ----------
+        slowness : iterable
+            Slowness model, mapped to the cells like for the core graph.
+
+        Returns
+        -------
+        G : scipy.sparse.csr_matrix
+            Symmetric matrix holding the edge travel times, i.e., edge length
+            times the minimum slowness of the adjacent cells.
+        """
+        from scipy.sparse import csr_matrix
+
+        a, b, dist, cellIds, edge = self._graphTopology()
+        slowPerCell = np.asarray(self.createMappedModel(slowness, 1e16))
+        t = dist * self._edgeSlowness(slowPerCell)
+        nNodes = self.mesh().nodeCount() + self.mesh().secondaryNodeCount()
+        return csr_matrix((np.concatenate([t, t]),
+                           (np.concatenate([a, b]), np.concatenate([b, a]))),
+                          shape=(nNodes, nNodes))
+
+    def travelTimeTable(self, nodes, slowness, dtype=float):
+        """Travel times from several source nodes to all nodes.
+
+        The shortest path searches run in chunks of sources on a thread pool
+        of nWorkers (default: number of CPUs) threads. The table and the
+        path predecessors are cached, so repeated calls for the same model
+        (e.g. by response, way and createJacobian) do not search again.
+
+        Parameters
+        ----------
+        nodes : iterable
+            Source node indices of the forward mesh.
+        slowness : iterable
+            Slowness model.
+        dtype : type [float]
+            Data type of the table, e.g. np.float32 to save memory.
+
+        Returns
+        -------
+        T : np.ndarray
+            Contiguous travel time table of shape (len(nodes), nNodes)
+            including the secondary nodes.
+        """
+        from scipy.sparse.csgraph import dijkstra
+
+        nodes = np.asarray(nodes, dtype=int)
+        key = (hash(np.asarray(slowness, dtype=float).tobytes()),
+               self.mesh().hash(), np.dtype(dtype))
+        tt = self._ttTable
+        if tt is not None and tt['key'] == key and \
+                np.all(np.isin(nodes, tt['nodes'])):
+            idx = np.searchsorted(tt['nodes'], nodes)
+            return tt['table'][idx]
+
+        G = self.createGraphMatrix(slowness)
+        uNodes = np.unique(nodes)
+        table = np.empty((len(uNodes), G.shape[0]), dtype=dtype)
+        pred = np.empty((len(uNodes), G.shape[0]), dtype=np.int32)
+
+        def _search(sl):
+            table[sl], pred[sl] = dijkstra(G, directed=True,
+                                           indices=uNodes[sl],
+                                           return_predecessors=True)
+
+        nWorkers = max(1, min(self.nWorkers or pg.getCPUCount(),
+                              len(uNodes)))
+        chunks = [slice(i, i + int(np.ceil(len(uNodes) / nWorkers)))
+                  for i in range(0, len(uNodes),
+                                 int(np.ceil(len(uNodes) / nWorkers)))]
+        if len(chunks) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=nWorkers) as pool:
+                list(pool.map(_search, chunks))
+        else:
+            for sl in chunks:
+                _search(sl)
+
+        self._ttTable = dict(key=key, nodes=uNodes, table=table, pred=pred)
+        return table[np.searchsorted(uNodes, nodes)]
+
+    def shortestPath(self, start, end):
+        """Node indices of the shortest path from the cached travel times.
+
+        Needs a preceding call of travelTimeTable holding the start node.
+        """
+        tt = self._ttTable
+        if tt is None or start not in tt['nodes']:
+            pg.critical("No travel time table for node", start)
+
+        pred = tt['pred'][np.searchsorted(tt['nodes'], start)]
+        way = [end]
+        while way[-1] != start:
+            if pred[way[-1]] < 0:
+                pg.critical("Node", end, "can't be reached from", start)
+            way.append(pred[way[-1]])
+
+        return np.array(way[::-1])
+
+    @staticmethod
+    def _toSparseMatrix(A):
+        """Convert scipy csr into pg.matrix.SparseMatrix keeping its shape.
+
+        The number of columns is derived from the largest column index, so
+        an explicit zero is stored in the last column if it is unused.
+        """
+        indptr, indices, vals = A.indptr, A.indices, A.data
+        if A.shape[0] > 0 and (len(indices) == 0 or
+                               indices.max() < A.shape[1] - 1):
+            indices = np.append(indices, A.shape[1] - 1)
+            vals = np.append(vals, 0.0)
+            indptr = indptr.copy()
+            indptr[-1] += 1
+
+        return pg.matrix.SparseMatrix(indptr, indices, vals)
+
     def createStartModel(self, dataVals):
         """Create a starting model from data values (gradient or constant)."""
         sm = None
@@ -85,25 +266,114 @@ class TravelTimeDijkstraModelling(MeshModelling):
 
         return sm
 
+    def _dataNodes(self):
+        """Forward mesh node indices of shot and geophone of all data."""
+        mesh = self.mesh()
+        key = (mesh.hash(), self.data.hash())
+        if getattr(self, '_dataNodeIds', (None,))[0] != key:
+            s = np.asarray(self.data("s"), dtype=int)
+            g = np.asarray(self.data("g"), dtype=int)
+            sensors, idx = np.unique(np.concatenate([s, g]),
+                                     return_inverse=True)
+            nodes = np.array([mesh.findNearestNode(
+                self.data.sensorPosition(int(i))) for i in sensors])
+            self._dataNodeIds = (key, nodes[idx[:len(s)]],
+                                 nodes[idx[len(s):]])
+        return self._dataNodeIds[1:]
+
+    def _shotTable(self, par):
+        """Travel times from all shot nodes and the shot row of all data."""
+        sNodes, gNodes = self._dataNodes()
+        shots = np.unique(sNodes)
+        T = self.travelTimeTable(shots, par)
+        return T, np.searchsorted(shots, sNodes), gNodes
+
     def createJacobian(self, par):
-        """Create Jacobian (way matrix)."""
+        """Create Jacobian (way matrix).
+
+        The rays are the shortest paths of the travel time table, i.e., no
+        further search is needed after a response for the same model. Every
+        ray segment is assigned to the adjacent cell(s) of minimum
+        slowness.
+        """
+        from scipy.sparse import csr_matrix
+
         if not self.mesh():
             pg.critical("no mesh")
 
-        return self._core.createJacobian(par)
+        self._shotTable(par)
+        sNodes, gNodes = self._dataNodes()
+        tt = self._ttTable
+        pred = tt['pred'][np.searchsorted(tt['nodes'], sNodes)]
+
+        a, b, dist, cellIds, edge = self._graphTopology()
+        nNodes = pred.shape[1]
+        edgeIdx = csr_matrix((np.arange(1, len(a) + 1).repeat(2),
+                              (np.stack([a, b], axis=1).ravel(),
+                               np.stack([b, a], axis=1).ravel())),
+                             shape=(nNodes, nNodes))
+
+        # walk all rays backwards at once
+        rows, edges = [], []
+        iData = np.arange(len(sNodes))
+        cur = np.array(gNodes)
+        active = cur != sNodes
+        while np.any(active):
+            iData, cur = iData[active], cur[active]
+            prev = pred[iData, cur]
+            if np.any(prev < 0):
+                pg.critical("Receiver can't be reached for data",
+                            iData[prev < 0])
+            rows.append(iData)
+            edges.append(np.asarray(edgeIdx[prev, cur]).ravel() - 1)
+            cur = prev
+            active = cur != sNodes[iData]
+
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=int)
+        edges = np.concatenate(edges) if edges else np.zeros(0, dtype=int)
+
+        # edge length distributed over the adjacent cells of minimum slowness
+        slowPerCell = np.asarray(self.createMappedModel(par, 1e16))
+        edgeSlow = self._edgeSlowness(slowPerCell)
+        fast = np.abs(slowPerCell[cellIds] - edgeSlow[edge]) < 1e-4
+        nCells = np.bincount(edge[fast], minlength=len(a))
+        marker = np.asarray(self.mesh().cellMarkers())[cellIds[fast]]
+        valid = marker >= 0
+        eF = edge[fast][valid]
+        W = csr_matrix((dist[eF] / nCells[eF], (eF, marker[valid])),
+                       shape=(len(a), len(par)))
+        P = csr_matrix((np.ones(len(rows)), (rows, edges)),
+                       shape=(len(sNodes), len(a)))
+        J = (P @ W).tocoo()
+
+        jac = self.jacobian()
+        jac.clear()
+        jac.setRows(len(sNodes))
+        jac.setCols(len(par))
+        jac.add(J.row.astype(np.uint64), J.col.astype(np.uint64), J.data)
+        return jac
 
     def response(self, par):
-        """Return forward response (simulated traveltimes)."""
+        """Return forward response (simulated traveltimes).
+
+        The travel time table of all shots is cached for createJacobian and
+        way.
+        """
         if not self.mesh():
             pg.critical("no mesh")
-        return self._core.response(par)
+
+        T, iShot, gNodes = self._shotTable(par)
+        return pg.Vector(T[iShot, gNodes])
 
     def way(self, s, g):
         """Return node indices for the way from the shot to the receiver.
 
         The index is based on the given data, mesh and last known model.
         """
-        return self._core.way(s, g)
+        mesh = self.mesh()
+        return self.shortestPath(
+            mesh.findNearestNode(self.data.sensorPosition(int(s))),
+            mesh.findNearestNode(self.data.sensorPosition(int(g))))
 
     def drawModel(self, ax, model, **kwargs):
         """Draw the model."""
@@ -140,55 +410,134 @@ class TravelTimeDijkstraModelling(MeshModelling):
 
 
 class FatrayDijkstraModellingInterpolate(TravelTimeDijkstraModelling):
-    """Shortest-path (Dijkstra) based travel time with fat ray jacobian."""
+    """Shortest-path (Dijkstra) based travel time with fat ray jacobian.
+
+    The Jacobian and the Fresnel weights only hold the cells inside the
+    Fresnel volume and are stored as sparse (CRS) matrices.
+    """
 
     def __init__(self, frequency=100., **kwargs):
         super().__init__(**kwargs)
         self.frequency = frequency
         self.iMat = pg.matrix.SparseMapMatrix()
-        self.J = pg.Matrix()
+        self._iMat = None  # scipy copy of iMat
+        self.J = pg.matrix.SparseMatrix()
+        self.FresnelWeight = pg.matrix.SparseMatrix()
         self.setJacobian(self.J)
         self._core.setJacobian(self.J)
         self.sensorNodes = None
 
+    def _findSensorNodes(self):
+        """Mesh node indices of the sensor positions."""
+        self.mesh()  # ensures meshNoSec
+        return [self.meshNoSec.findNearestNode(pos)
+                for pos in self.data.sensorPositions()]
+
+    def response(self, par):
+        """Return forward response (simulated traveltimes).
+
+        The travel time table for all sensors is kept for createJacobian.
+        """
+        if not self.mesh():
+            pg.critical("no mesh")
+
+        self.sensorNodes = self._findSensorNodes()
+        T = self.travelTimeTable(self.sensorNodes, par)
+        sNodes = np.asarray(self.sensorNodes)
+        return pg.Vector(T[np.asarray(self.data.id("s"), dtype=int),
+                           sNodes[np.asarray(self.data.id("g"), dtype=int)]])
+
+    def _fatRays(self, shot, idx, cellTimes):
+        """Fresnel weights for all data of one shot as sparse triplets.
+
+        Parameters
+        ----------
+        shot : int
+            Shot (sensor) index.
+        idx : array
+            Data indices with this shot.
+        cellTimes : callable
+            Travel times in the cell centers for given sensor indices,
+            returning an array (nSensors, nCells).
+
+        Returns
+        -------
+        rows, cols, weights : arrays
+            Data index, cell index and (unnormalized) weight.
+        """
+        geo = self._geophones[idx]
+        tsr = self._Dmat[shot, geo]  # shot-receiver travel times
+        Tc = cellTimes([shot])[0]
+
+        rows, cols, vals = [], [], []
+        # chunk to limit the dense (nData, nCells) intermediate
+        nChunk = max(1, int(2**22 // max(len(Tc), 1)))
+        for i0 in range(0, len(idx), nChunk):
+            sl = slice(i0, i0 + nChunk)
+            dt = Tc + cellTimes(geo[sl]) - tsr[sl, None]
+            r, c = np.nonzero(dt < 0.5 / self.frequency)
+            w = 1 - 2 * self.frequency * dt[r, c]  # 1 on ray
+            rows.append(idx[sl][r])
+            cols.append(c)
+            vals.append(w)
+
+        return np.concatenate(rows), np.concatenate(cols), \
+            np.concatenate(vals)
+
     def createJacobian(self, slowness):
-        """Generate Jacobian matrix using fat-ray after Jordi et al. (2016)."""
+        """Generate Jacobian matrix using fat-ray after Jordi et al. (2016).
+
+        All data of a shot are computed at once, shots are distributed over
+        nWorkers threads (default: number of CPUs).
+        """
+        from scipy.sparse import csr_matrix
+
         # mesh = self.mesh()
         mesh = self.meshNoSec  # change back with pgcore=1.5
-        self.J.resize(self.data.size(), mesh.cellCount())
-        self.sensorNodes = [mesh.findNearestNode(pos)
-                            for pos in self.data.sensorPositions()]
+        self.sensorNodes = self._findSensorNodes()
         if (self.iMat.cols() != mesh.nodeCount() or
-                self.iMat.rows() != mesh.cellCount()):
+                self.iMat.rows() != mesh.cellCount() or self._iMat is None):
             self.iMat = mesh.interpolationMatrix(mesh.cellCenters())
+            self._iMat = pg.utils.sparseMatrix2csr(self.iMat)
 
-        Di = self.dijkstra
-        slowPerCell = self.createMappedModel(slowness, 1e16)
-        Di.setGraph(self._core.createGraph(slowPerCell))
         numN = mesh.nodeCount()
         data = self.data
-        numS = data.sensorCount()
-        Tmat = pg.Matrix(numS, numN)
-        Dmat = pg.Matrix(numS, numS)
-        for i, node in enumerate(self.sensorNodes):
-            Di.setStartNode(node)
-            Tmat[i] = Di.distances()[:numN]  # change back with pgcore=1.5
-            Dmat[i] = Tmat[i][self.sensorNodes]
-
-        self.FresnelWeight = pg.Matrix(data.size(), len(slowness))
-        for i in range(data.size()):
-            iS = int(data("s")[i])
-            iG = int(data("g")[i])
-            tsr = Dmat[iS][iG]  # shot-receiver travel time
-            dt = self.iMat * (Tmat[iS] + Tmat[iG]) - tsr
-            weight = np.maximum(1 - 2 * self.frequency * dt, 0.0)  # 1 on ray
-            wa = weight  # * np.sqrt(self.mesh().cellSizes())
-            if np.sum(wa) > 0:  # not if all values are zero
-                wa /= np.sum(wa)
-
-            self.J[i] = wa * tsr / slowness
-            self.FresnelWeight[i] = wa
+        Tmat = self.travelTimeTable(self.sensorNodes, slowness)[:, :numN]
+        self._Dmat = Tmat[:, self.sensorNodes]
+        shots = np.asarray(data.id("s"), dtype=int)
+        self._geophones = np.asarray(data.id("g"), dtype=int)
+
+        def _cellTimes(sensors):
+            return (self._iMat @ Tmat[sensors].T).T
+
+        jobs = [(s, np.nonzero(shots == s)[0]) for s in np.unique(shots)]
+        nWorkers = self.nWorkers or pg.getCPUCount()
+        nWorkers = max(1, min(nWorkers, len(jobs)))
+        if nWorkers > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=nWorkers) as pool:
+                res = list(pool.map(lambda j: self._fatRays(*j, _cellTimes),
+                                    jobs))
+        else:
+            res = [self._fatRays(*j, _cellTimes) for j in jobs]
 
+        shape = (data.size(), mesh.cellCount())
+        if len(res) > 0:
+            rows, cols, w = [np.concatenate(r) for r in zip(*res)]
+        else:
+            rows, cols, w = np.zeros(0, int), np.zeros(0, int), np.zeros(0)
+
+        W = csr_matrix((w, (rows, cols)), shape=shape)
+        W.sort_indices()
+        # normalize rows, not if all values are zero
+        wSum = np.asarray(W.sum(axis=1)).ravel()
+        W = csr_matrix(W.multiply(1. / np.where(wSum > 0, wSum, 1.)[:, None]))
+        tsr = self._Dmat[shots, self._geophones]
+        J = csr_matrix(W.multiply(tsr[:, None]).multiply(
+            1. / np.asarray(slowness)[None, :]))
+
+        self.FresnelWeight = self._toSparseMatrix(W)
+        self.J = self._toSparseMatrix(J)
         self.setJacobian(self.J)
         self._core.setJacobian(self.J)
 
@@ -256,5 +605,151 @@ class FatrayDijkstraModellingMidpoint(TravelTimeDijkstraModelling):
         self._core.setJacobian(self.J)
 
 
+class EikonalModelling(TravelTimeDijkstraModelling):
+    """Travel time modelling by solving the eikonal equation on the mesh.
+
+    The first order eikonal solver (see
+    :py:class:`pygimli.physics.traveltime.eikonal.EikonalSolver`) works
+    directly on the mesh nodes, so no secondary nodes are created. The
+    Jacobian is obtained by backtracing the rays along the upwind updates.
+    """
+
+    def __init__(self, sourceRings=3, **kwargs):
+        super().__init__(**kwargs)
+        self.sourceRings = sourceRings
+        self._solver = None
+        self.J = pg.matrix.SparseMatrix()
+        self.setJacobian(self.J)
+        self._core.setJacobian(self.J)
+        self.sensorNodes = None
+
+    def createRefinedFwdMesh(self, mesh):
+        """Return a copy of the mesh as no secondary nodes are needed."""
+        self.meshNoSec = pg.Mesh(mesh)
+        return pg.Mesh(mesh)
+
+    @property
+    def solver(self):
+        """Eikonal solver for the current forward mesh."""
+        from .eikonal import EikonalSolver
+
+        mesh = self.mesh()
+        if self._solver is None or self._solver[0] != mesh.hash():
+            self._solver = (mesh.hash(),
+                            EikonalSolver(mesh, sourceRings=self.sourceRings,
+                                          verbose=self.verbose))
+        return self._solver[1]
+
+    def travelTimeTable(self, nodes, slowness, dtype=float):
+        """Travel times from several source nodes to all nodes.
+
+        All sources are solved at once and the result is cached, so
+        repeated calls for the same model (e.g. by response, way and
+        createJacobian) do not solve again.
+
+        Parameters
+        ----------
+        nodes : iterable
+            Source node indices of the forward mesh.
+        slowness : iterable
+            Slowness model.
+        dtype : type [float]
+            Data type of the table, e.g. np.float32 to save memory.
+
+        Returns
+        -------
+        T : np.ndarray
+            Contiguous travel time table of shape (len(nodes), nNodes).
+        """
+        nodes = np.asarray(nodes, dtype=int)
+        key = (hash(np.asarray(slowness, dtype=float).tobytes()),
+               self.mesh().hash(), np.dtype(dtype))
+        tt = self._ttTable
+        if tt is not None and tt['key'] == key and \
+                np.all(np.isin(nodes, tt['nodes'])):
+            return tt['table'][np.searchsorted(tt['nodes'], nodes)]
+
+        uNodes = np.unique(nodes)
+        slowPerCell = self.createMappedModel(slowness, 1e16)
+        table = np.ascontiguousarray(
+            self.solver.solve(uNodes, slowPerCell).T, dtype=dtype)
+        self._ttTable = dict(key=key, nodes=uNodes, table=table)
+        return table[np.searchsorted(uNodes, nodes)]
+
+    def shortestPath(self, start, end):
+        """Node indices of the ray path from the cached travel times.
+
+        Needs a preceding call of travelTimeTable holding the start node.
+        """
+        tt = self._ttTable
+        if tt is None or start not in tt['nodes']:
+            pg.critical("No travel time table for node", start)
+
+        return self.solver.way(np.searchsorted(tt['nodes'], start), end)
+
+    def _findSensorNodes(self):
+        """Mesh node indices of the sensor positions."""
+        return [self.mesh().findNearestNode(pos)
+                for pos in self.data.sensorPositions()]
+
+    def response(self, par):
+        """Return forward response (simulated traveltimes)."""
+        if not self.mesh():
+            pg.critical("no mesh")
+
+        self.sensorNodes = self._findSensorNodes()
+        T = self.travelTimeTable(self.sensorNodes, par)
+        sNodes = np.asarray(self.sensorNodes)
+        return pg.Vector(T[np.asarray(self.data.id("s"), dtype=int),
+                           sNodes[np.asarray(self.data.id("g"), dtype=int)]])
+
+    def way(self, s, g):
+        """Return node indices for the way from the shot to the receiver.
+
+        The index is based on the given data, mesh and last known model.
+        """
+        if self.sensorNodes is None:
+            pg.critical("No model known yet, call response or createJacobian.")
+
+        return self.shortestPath(self.sensorNodes[int(s)],
+                                 self.sensorNodes[int(g)])
+
+    def createJacobian(self, par):
+        """Create Jacobian (ray path lengths per model cell)."""
+        from scipy.sparse import csr_matrix
+
+        if not self.mesh():
+            pg.critical("no mesh")
+
+        self.sensorNodes = self._findSensorNodes()
+        sNodes = np.asarray(self.sensorNodes)
+        self.travelTimeTable(sNodes, par)
+        iSrc = np.searchsorted(self._ttTable['nodes'], sNodes)
+        shots = np.asarray(self.data.id("s"), dtype=int)
+        recNodes = sNodes[np.asarray(self.data.id("g"), dtype=int)]
+
+        rows, cols, vals = [], [], []
+        for shot in np.unique(shots):
+            idx = np.nonzero(shots == shot)[0]
+            Js = self.solver.jacobian(iSrc[shot], recNodes[idx]).tocoo()
+            rows.append(idx[Js.row])
+            cols.append(Js.col)
+            vals.append(Js.data)
+
+        # cells to model parameters (-1 for background)
+        nModel = len(par)
+        cellPara = np.asarray(self.createMappedModel(
+            np.arange(nModel, dtype=float), -1), dtype=int)
+        rows, cols = np.concatenate(rows), cellPara[np.concatenate(cols)]
+        vals = np.concatenate(vals)
+        use = cols >= 0
+        J = csr_matrix((vals[use], (rows[use], cols[use])),
+                       shape=(self.data.size(), nModel))
+
+        self.J = self._toSparseMatrix(J)
+        self.setJacobian(self.J)
+        self._core.setJacobian(self.J)
+
+
 FatrayDijkstraModelling = FatrayDijkstraModellingInterpolate
 # FatrayDijkstraModelling = FatrayDijkstraModellingMidpoint
@@ -30,6 +30,9 @@ class VESModelling(Block1DModelling):
         B is second current, N is second potential electrode.
     """
 
+    #: batchResponse holds (models x distances x 801 filter) temporaries
+    batchSize = 100
+
     def __init__(self, ab2=None, mn2=None, **kwargs):
         """Initialize with distances.
 
@@ -152,6 +155,50 @@ class VESModelling(Block1DModelling):
 
         return fop.response(par)
 
+    def batchResponse(self, models, **kwargs):
+        """Apparent resistivities for many models (rows) at once.
+
+        The layered earth kernel of all models is computed for all electrode
+        distances at once and Hankel transformed with the filter of
+        pg.core.DC1dModelling (:py:func:`pygimli.utils.dc1dFilter`), i.e.
+        the results agree with :py:meth:`response` to rounding errors.
+        """
+        if self.am is None or self.bm is None:
+            pg.critical("No data space defined don't know what to calculate.")
+
+        models = np.asarray(models, dtype=float)
+        nLayers = (models.shape[1] + 1) // 2
+        thk = models[:, :nLayers-1, np.newaxis, np.newaxis]
+        res = models[:, nLayers-1:, np.newaxis, np.newaxis]
+        if nLayers == 1:
+            return np.repeat(models, len(self.am), axis=1)
+
+        r, rIdx = np.unique(np.abs(np.concatenate([self.am, self.an,
+                                                   self.bm, self.bn])),
+                            return_inverse=True)
+        x, w = pg.utils.dc1dFilter()
+        # exp(-2 lam h1) underflows to zero beyond, so do these terms
+        nX = np.searchsorted(x, 750. * r[-1] / 2. / max(thk[:, 0].min(),
+                                                        1e-300))
+        x, w = x[:nX+1], w[:nX+1]
+        lam = x[np.newaxis, :] / r[:, np.newaxis]
+
+        # kernel recursion from bottom to top as in DC1dModelling::kern1d
+        z = np.broadcast_to(res[:, -1], (len(models),) + lam.shape)
+        for i in range(nLayers - 2, -1, -1):
+            p = (z - res[:, i]) / (z + res[:, i])
+            th = np.tanh(lam * thk[:, i])
+            z = res[:, i] * (z + th * res[:, i]) / (z * th + res[:, i])
+
+        ehl = np.exp(-2.0 * lam * thk[:, 0]) * p
+        kern = ehl / (1.0 - ehl) * res[:, 0] / 2.0 / np.pi
+
+        U = (w * kern * 2.0).sum(-1) / r
+        U = U[:, rIdx].reshape(len(models), 4, -1)
+        k = (2.0 * np.pi) / (1.0 / self.am - 1.0 / self.an -
+                             1.0 / self.bm + 1.0 / self.bn)
+        return (U[:, 0] - U[:, 1] - U[:, 2] + U[:, 3]) * k + res[:, 0, :, 0]
+
     def drawModel(self, ax, model, **kwargs):
         """Draw model as 1D block model."""
         pg.viewer.mpl.drawModel1D(ax=ax,
@@ -5,7 +5,92 @@ import pygimli as pg
 from pygimli.math import dot
 
 
-def lsqr(A, b, x=None, maxiter=200, tol=1e-8, verbose=False, damp=0.0):
+def squaredColumnNorms(A, w=None):
+    """Squared (row-weighted) column norms, i.e., diag(A^T W^2 A).
+
+    Works for dense, sparse and numpy matrices, for the row and column
+    scaled matrices of :py:mod:`pygimli.math.matrix` and for block matrices
+    of them, so the diagonal of the normal equations of the stacked
+    Jacobian and constraint matrices is obtained without forming them.
+
+    Parameters
+    ==========
+    A : pg.MatrixBase or derived class
+        matrix
+    w : iterable [None]
+        row weights
+
+    Returns
+    =======
+    d : np.array
+        squared column norms
+
+    Raises
+    ======
+    TypeError if the entries of A are not accessible.
+    """
+    w2 = None if w is None else np.asarray(w, dtype=float)**2
+
+    if isinstance(A, pg.matrix.BlockMatrix):
+        d = np.zeros(A.cols())
+        for e in A.entries():
+            if e.transpose:
+                raise TypeError("Transposed block matrix entries.")
+            M = A.mat(e.matrixID)
+            wi = None if w is None else w[e.rowStart:e.rowStart+M.rows()]
+            d[e.colStart:e.colStart+M.cols()] += \
+                squaredColumnNorms(M, wi) * e.scale**2
+        return d
+
+    if isinstance(A, (pg.matrix.MultLeftMatrix,
+                      pg.matrix.MultLeftRightMatrix)):
+        wl = np.asarray(A.l, dtype=float)
+        d = squaredColumnNorms(A.A, wl if w is None else wl * w)
+    elif isinstance(A, pg.matrix.MultMatrix):
+        d = squaredColumnNorms(A.A, w)
+    elif isinstance(A, pg.matrix.ScaledMatrix):
+        return squaredColumnNorms(A._A, w) * A._scale**2
+    elif isinstance(A, pg.matrix.DiagonalMatrix):
+        d = np.asarray(A.d, dtype=float)**2
+        return d if w2 is None else d * w2
+    elif isinstance(A, (pg.matrix.SparseMapMatrix, pg.matrix.SparseMatrix)):
+        S = pg.utils.sparseMatrix2csr(A)
+        S = S.multiply(S)
+        return np.asarray(S.sum(axis=0) if w2 is None else
+                          S.T.dot(w2)).ravel()
+    elif isinstance(A, (pg.matrix.Matrix, np.ndarray,
+                        pg.matrix.RealNumpyMatrix)):
+        M = np.asarray(getattr(A, 'M', A), dtype=float)
+        return (M**2).sum(axis=0) if w2 is None else w2.dot(M**2)
+    else:
+        raise TypeError("Column norms unknown for {0}.".format(type(A)))
+
+    if isinstance(A, (pg.matrix.MultRightMatrix,
+                      pg.matrix.MultLeftRightMatrix)):
+        d *= np.asarray(A.r, dtype=float)**2
+    return d
+
+
+def columnScaling(A):
+    """Column scaling preconditioner 1/||A_j|| for least-squares solvers.
+
+    For the stacked Jacobian and constraint matrix of an inversion this is
+    the inverse square root of the diagonal of J^T J + lam C^T C, i.e. the
+    Jacobi preconditioner of the normal equations. Returns None if the
+    column norms cannot be computed for A.
+    """
+    try:
+        d = np.sqrt(squaredColumnNorms(A))
+    except TypeError as e:
+        pg.verbose(e, "No preconditioning.")
+        return None
+
+    d[d <= 0] = 1.0
+    return pg.Vector(1.0 / d)
+
+
+def lsqr(A, b, x=None, maxiter=200, tol=1e-8, verbose=False, damp=0.0,
+         precond=None, scaleStart=False, nData=0, dPhi=0.0):
     """Solve A x = b in a Least-Squares sense using LSQR algorithm.
 
     After Page and Saunders (1982)
@@ -17,7 +102,7 @@ def lsqr(A, b, x=None, maxiter=200, tol=1e-8, verbose=False, damp=0.0):
     b : pg.Vector
         right-hand-side vector (typically data misfit and model roughness)
     x : pg.Vector [zero vector]
-        starting vector
+        starting vector, e.g. the previous model update (warm start)
     damp : float [0.0]
         damping value for very ill-conditioned systems
     maxiter : int [200]
@@ -26,19 +111,57 @@ def lsqr(A, b, x=None, maxiter=200, tol=1e-8, verbose=False, damp=0.0):
         solution tolerance
     verbose : bool [False]
         print out convergence every 10th iteration
+    precond : str|iterable [None]
+        Right (column) preconditioner D, i.e. A D y = b is solved for
+        x = D y. 'column' uses :py:func:`columnScaling`.
+    scaleStart : bool [False]
+        Scale the starting vector x by the factor minimizing |b - A x|, so
+        a warm start never increases the starting residual.
+    nData : int [0]
+        Number of (data) rows of A used for the early stopping by dPhi.
+    dPhi : float [0.0]
+        Stop if the misfit of the first nData rows changes by less than
+        this relative amount within 10 iterations. Later iterations mainly
+        balance the regularization and hardly change the data fit.
 
     Returns
     =======
     x : pg.Vector
         solution x for A^T A x = A^T b
     """
+    if isinstance(precond, str):
+        if precond.lower().startswith('col'):
+            precond = columnScaling(A)
+        else:
+            pg.critical("Unknown preconditioner", precond)
+
+    if precond is not None:
+        D = pg.Vector(precond)
+        if x is not None:
+            x = x / D
+        y = lsqr(pg.matrix.MultRightMatrix(A, D), b, x=x, maxiter=maxiter,
+                 tol=tol, verbose=verbose, damp=damp,
+                 scaleStart=scaleStart, nData=nData, dPhi=dPhi)
+        return y * D
+
     if x is None:  # no starting vector
         x = pg.Vector(A.cols())
         u = b.copy()
     else:
-        u = b - A.mult(x)
+        Ax = A.mult(x)
+        if scaleStart:
+            AxAx = dot(Ax, Ax)
+            alpha = dot(Ax, b) / AxAx if AxAx > 0 else 0.0
+            x = x * max(alpha, 0.0)
+            Ax = Ax * max(alpha, 0.0)
+        u = b - Ax
 
     beta = norm(u)
+    if beta == 0.0:
+        return x
+
+    r = u.copy() if nData else None  # explicit residual for early stopping
+    phiD = [dot(r[:nData], r[:nData])] if nData else []
     u /= beta
     v = A.transMult(u)
     alfa = norm(v)
@@ -46,13 +169,19 @@ def lsqr(A, b, x=None, maxiter=200, tol=1e-8, verbose=False, damp=0.0):
     Arnorm0 = alfa * 1.0
     Arnorm = Arnorm0 * 1.0
     w = v.copy()
+    Aw = None
+    wFac = 0.0
     phiU = beta
     rhoU = alfa
     for i in range(maxiter):
         if verbose and (i % 10 == 0):
             pg.debug(i, Arnorm, Arnorm/Arnorm0)
 
-        u = A.mult(v) - alfa * u
+        Av = A.mult(v)
+        if nData:  # A*w by the same recursion as w
+            Aw = Av.copy() if Aw is None else Av + Aw * wFac
+
+        u = Av - alfa * u
         beta = norm(u)
         if np.isclose(beta, 0.0):
             if verbose:
@@ -73,7 +202,8 @@ def lsqr(A, b, x=None, maxiter=200, tol=1e-8, verbose=False, damp=0.0):
         phiU = s * phiU
         x += (phi/rho) * w
         # w = v - (theta/rho) * w
-        w *= -theta / rho
+        wFac = -theta / rho
+        w *= wFac
         w += v
         Arnorm = phiU * alfa * abs(c)
         if Arnorm / Arnorm0 < tol:
@@ -83,6 +213,15 @@ def lsqr(A, b, x=None, maxiter=200, tol=1e-8, verbose=False, damp=0.0):
 
             break
 
+        if nData:
+            r -= (phi/rho) * Aw
+            phiD.append(dot(r[:nData], r[:nData]))
+            if i >= 10 and abs(phiD[-11] - phiD[-1]) < dPhi * phiD[-11]:
+                if verbose:
+                    pg.debug("Data misfit settled", i, phiD[-1])
+
+                break
+
     if verbose:
         pg.debug("Maximum iteration reached")
         pg.debug(i, Arnorm, Arnorm/Arnorm0)
@@ -1075,9 +1075,13 @@ class LinSolver(object):
         solver: str [None]
             Name for the used solver (pg (umfpack or cholmod), scipy).
             If solver is none decide from matrix type.
+        stype: int [None]
+            Matrix symmetry type for the pg solver, None uses the matrix
+            settings.
         """
         self._m = None  # hold local copy if we need to convert the matrix
         self.verbose = verbose
+        self._stype = kwargs.pop('stype', None)
         self._solver = None
         self.factorTime = 0.0
         self.solvingTime = 0.0
@@ -1129,7 +1133,11 @@ class LinSolver(object):
         """"""
         self._m = pg.utils.toSparseMatrix(mat)
         self._desiredArrayType = pg.Vector
-        self._solver = pg.core.LinSolver(self._m, verbose=self.verbose)
+        if self._stype is None:
+            self._solver = pg.core.LinSolver(self._m, verbose=self.verbose)
+        else:
+            self._solver = pg.core.LinSolver(self.verbose)
+            self._solver.setMatrix(self._m, self._stype)
 
     def factorizeSciPy(self, mat):
         """"""
@@ -1152,14 +1160,153 @@ class LinSolver(object):
         return b
 
     def solve(self, b):
-        """ """
+        """Solve for right hand side b.
+
+        b can be a single vector or a (nRHS, n) array of right hand sides,
+        then all are solved with the same factorization and a (nRHS, n)
+        array is returned.
+        """
         swatch = pg.Stopwatch()
-        x = self._solver(self._convertRHS(b))
+        if getattr(b, 'ndim', 1) == 2:
+            x = self._solveBlock(b)
+        else:
+            x = self._solver(self._convertRHS(b))
         self.solverTime = swatch.duration(restart=True)
         if self.verbose:
             pg.info("Matrix solve:", self.solverTime)
         return x
 
+    def _solveBlock(self, B):
+        """Solve for all rows of B as right hand sides."""
+        B = np.asarray(B)
+        if self.solver == 'SciPy':
+            try:
+                # SuperLU solves for all columns in one sweep
+                return np.asarray(self._solver(B.T)).T
+            except Exception:
+                # e.g. umfpack only accepts single vectors
+                pass
+
+        X = np.zeros(B.shape, dtype=np.result_type(B, float))
+        if self.solver == 'PG':
+            # reuse one solution vector and the factorization
+            if np.iscomplexobj(B):
+                x = pg.CVector(B.shape[1], 0.0)
+                for i, r in enumerate(B):
+                    self._solver.solve(pg.core.toComplex(r.real, r.imag), x)
+                    X[i] = x.array()
+            else:
+                x = pg.Vector(B.shape[1], 0.0)
+                for i, r in enumerate(B):
+                    self._solver.solve(pg.Vector(r), x)
+                    X[i] = x.array()
+        else:
+            for i, r in enumerate(B):
+                X[i] = self._solver(self._convertRHS(r))
+        return X
+
+
+def _roundedHash(vals):
+    """Hash of float values compared with about 10 significant digits.
+
+    Round-off differences, e.g. of time steps from np.linspace, must not
+    prevent the reuse of a factorization.
+    """
+    from pygimli.utils.cache import valHash
+
+    vals = np.ascontiguousarray(vals)
+    if vals.dtype.kind not in 'fc':
+        return valHash(vals)
+    bits = vals.view(np.uint64) & ~np.uint64((1 << 20) - 1)
+    return valHash(bits) ^ hash(vals.dtype.kind)
+
+
+def _matrixHash(mat):
+    """Hash of a system matrix values to identify unchanged systems.
+
+    For core sparse matrices only the values are hashed, the sparsity
+    pattern is given by the mesh and boundary conditions only change
+    values.
+    """
+    from pygimli.utils.cache import valHash
+
+    if isinstance(mat, (pg.matrix.SparseMatrix, pg.matrix.CSparseMatrix)):
+        return _roundedHash(mat.vecVals().array()) ^ hash((mat.rows(),
+                                                           mat.cols()))
+    if isinstance(mat, np.ndarray):
+        return _roundedHash(mat)
+    mat = pg.utils.sparseMatrix2csr(mat)
+    return _roundedHash(mat.data) ^ valHash(mat.indices) ^ \
+        valHash(mat.indptr)
+
+
+class FactorizationCache(object):
+    """Cache of factorized linear solvers for recurring system matrices.
+
+    Transient problems with constant time step and coefficients assemble
+    the same system matrix in every step. Solvers are looked up by a hash
+    of the matrix values (including the Dirichlet rows, compared with
+    about 10 significant digits) and an optional additional key like the
+    time step, so any changed matrix is factorized again.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> import pygimli as pg
+    >>> mesh = pg.createGrid(5, 5)
+    >>> A = pg.solver.createStiffnessMatrix(mesh, np.ones(mesh.cellCount()))
+    >>> A = A + pg.solver.createMassMatrix(mesh, np.ones(mesh.cellCount()))
+    >>> cache = pg.solver.FactorizationCache()
+    >>> s1 = cache(A, key=0.1)
+    >>> s2 = cache(A, key=0.1)
+    >>> print(s1 is s2, cache.hits, cache.misses)
+    True 1 1
+    """
+
+    def __init__(self, solver=None, maxSize=4, verbose=False):
+        """
+        Args
+        ----
+        solver: str [None]
+            Solver name passed to LinSolver (pg, scipy).
+        maxSize: int [4]
+            Number of factorizations kept, the oldest is dropped first.
+        """
+        self.solver = solver
+        self.maxSize = maxSize
+        self.verbose = verbose
+        self.hits = 0
+        self.misses = 0
+        self._solvers = {}
+
+    def __len__(self):
+        return len(self._solvers)
+
+    def clear(self):
+        """Remove all factorizations."""
+        self._solvers = {}
+
+    def __call__(self, mat, key=None):
+        """Return a factorized LinSolver for mat."""
+        try:
+            key = _roundedHash(np.asarray(key, dtype=float).ravel())
+        except (TypeError, ValueError):
+            pass
+        h = hash((key, _matrixHash(mat)))
+
+        if h in self._solvers:
+            self.hits += 1
+            # mark as recently used
+            self._solvers[h] = self._solvers.pop(h)
+            return self._solvers[h]
+
+        self.misses += 1
+        solver = LinSolver(mat, solver=self.solver, verbose=self.verbose)
+        self._solvers[h] = solver
+        while len(self._solvers) > self.maxSize:
+            self._solvers.pop(next(iter(self._solvers)))
+        return solver
+
 
 def linSolve(mat, b, solver=None, verbose=False, **kwargs):
     r"""Direct linear solution after :math:`\textbf{x}` using core LinSolver.
@@ -1772,7 +1919,52 @@ def createForceVector(mesh, f, userData={}):
     return rhs
 
 
-def createLoadVector(mesh, f=1.0, userData={}):
+__loadIntegrals__ = {}  # mesh hash -> (nNodes x nCells) shape function integrals
+
+
+def _loadIntegrals(mesh):
+    r"""Integrals of the shape functions for all cells as sparse matrix.
+
+    :math:`U_{ij} = \int_{\Omega_j} N_i d\Omega` so that the load vector
+    for cell-wise sources :math:`f` is :math:`U f`. The matrix only depends
+    on the mesh and is cached for the last used mesh.
+
+    Returns
+    -------
+    U: scipy.sparse.csr_matrix (mesh.nodeCount(), mesh.cellCount())
+    """
+    from scipy.sparse import coo_matrix
+
+    key = mesh.hash()
+    if key in __loadIntegrals__:
+        return __loadIntegrals__[key]
+
+    ids, _, size = _simplexGradients(mesh)
+    if ids is not None:
+        # linear simplex: every shape function integrates to size / nNodes
+        vals = np.repeat(size / ids.shape[1], ids.shape[1])
+        cols = np.repeat(np.arange(len(ids)), ids.shape[1])
+        ids = ids.ravel()
+    else:
+        b_l = pg.matrix.ElementMatrix()
+        idList, valList = [], []
+        for c in mesh.cells():
+            b_l.u(c)
+            idList.append(np.array(b_l.ids()))
+            valList.append(np.array(b_l.row(0)))
+        cols = np.repeat(np.arange(mesh.cellCount()),
+                         [len(i) for i in idList])
+        ids = np.concatenate(idList)
+        vals = np.concatenate(valList)
+
+    U = coo_matrix((vals, (ids, cols)),
+                   shape=(mesh.nodeCount(), mesh.cellCount())).tocsr()
+    __loadIntegrals__.clear()
+    __loadIntegrals__[key] = U
+    return U
+
+
+def createLoadVector(mesh, f=1.0, userData={}, vectorized=False):
     """Create right hand side vector based on the given mesh and load values
     (scalar solution) or force vectors (vector value solution).
 
@@ -1798,15 +1990,32 @@ def createLoadVector(mesh, f=1.0, userData={}):
             value for each cell and can have  optional a userData dictionary:
             `f_cell = f(cell, [userData={}])`
             rhs = rhs(f(c, userData) for c in mesh.cells())
+        * vectorized callable (vectorized=True) is called once with all cell
+            centers as ndarray (mesh.cellCount(), 3) and returns the load
+            values for all cells, or a (nSources, mesh.cellCount()) array:
+            `f_cells = f(pos, [userData={}])`
+        * 2d array (nSources, mesh.cellCount()) of cell-wise loads for many
+            sources gives a (nSources, mesh.nodeCount()) stack of load vectors
         * list with length of mesh.dimension() of float or array entries will
             create a squeezed rhs for vector valued problems
             rhs = squeeze([rhs(f[0]), rhs(f[1]), rhs(f[2])])
 
+    vectorized: bool [False]
+        f is a callable for all cell centers at once (see above).
+
     Returns
     -------
     rhs: pg.Vector(mesh.nodeCount())
         Right-hand side load vector for scalar values or squeezed vector values
+        or ndarray (nSources, mesh.nodeCount()) for multiple sources.
     """
+    if vectorized and callable(f):
+        pos = np.array(mesh.cellCenters())
+        if userData is not None and userData.keys():
+            f = np.asarray(f(pos, userData))
+        else:
+            f = np.asarray(f(pos))
+
     # f is dict('Node':callable, 'Cell': callable)
     if isinstance(f, dict):
         if 'Node' in f:
@@ -1846,8 +2055,9 @@ def createLoadVector(mesh, f=1.0, userData={}):
             # assume rhs [n, nNodes] array is already a valid
             if len(f[0]) == mesh.nodeCount():
                 return f
-
-    rhs = pg.Vector(mesh.nodeCount(), 0)
+            if len(f[0]) == mesh.cellCount():
+                # cell-wise loads for several sources at once
+                return np.asarray((_loadIntegrals(mesh) @ f.T).T)
 
     fArray = None
 
@@ -1875,48 +2085,145 @@ def createLoadVector(mesh, f=1.0, userData={}):
         fArray = cellValues(mesh, f, userData=userData)
 
     if len(fArray) == mesh.cellCount():
-        b_l = pg.matrix.ElementMatrix()
-
-        for c in mesh.cells():
-            if fArray[c.id()] != 0.0:
-                b_l.u(c)
-                rhs.add(b_l, fArray[c.id()])
-
-#            print("test reference solution:")
-#            rhsRef = pg.Vector(mesh.nodeCount(), 0)
-#            for c in mesh.cells():
-#                b_l.u(c)
-#                for i, idx in enumerate(b_l.idx()):
-#                    rhsRef[idx] += b_l.row(0)[i] * fArray[c.id()]
-#            np.testing.assert_allclose(rhs, rhsRef)
-#            print("Remove revtest in assembleLoadVector after check")
+        rhs = _loadIntegrals(mesh) @ np.asarray(fArray)
 
     elif len(fArray) == mesh.nodeCount():
-        # nodal values
-        fA = pg.Vector(fArray)
-        b_l = pg.matrix.ElementMatrix()
-        for c in mesh.cells():
-            b_l.u(c)
-            # rhs.addVal(b_l.row(0) * fArray[b_l.idx()], b_l.idx())
-            rhs.add(b_l, fA)
+        # nodal values weighted by the integrated shape functions
+        rhs = np.asarray(fArray) * np.asarray(
+            _loadIntegrals(mesh).sum(axis=1)).ravel()
 
-        # print("test reference solution:")
-        # rhsRef = pg.Vector(mesh.nodeCount(), 0)
-        # for c in mesh.cells():
-        #     b_l.u(c)
-        #     for i, idx in enumerate(b_l.idx()):
-        #         rhsRef[idx] += b_l.row(0)[i] * fA[idx]
-
-        # np.testing.assert_allclose(rhs, rhsRef)
-        # print("Remove revtest in assembleLoadVector after check",
-        #       sum(rhs), sum(rhsRef))
-
-            # rhs = pg.Vector(fArray)
     else:
         raise Exception("Load vector have the wrong size: " +
                         str(len(fArray)))
 
-    return rhs
+    if np.iscomplexobj(rhs):
+        return rhs
+    return pg.Vector(rhs)
+
+
+def _simplexGradients(mesh):
+    """Shape function gradients for meshes of linear simplex cells.
+
+    The gradients of the linear shape functions are constant per cell,
+    so they are computed for all cells at once from the edge vectors.
+
+    Returns
+    -------
+    ids: ndarray (nCells, dim + 1)
+        Node ids for each cell or None if the mesh does not only consist of
+        edges (1D), triangles (2D) or tetrahedrons (3D).
+    grad: ndarray (nCells, dim, dim + 1)
+        Gradients of the shape functions.
+    size: ndarray (nCells)
+        Cell sizes.
+    """
+    dim = mesh.dimension()
+    cells = mesh.cells()
+    if any(c.nodeCount() != dim + 1 for c in cells):
+        return None, None, None
+
+    # faster than converting the IndexArray of each cell
+    ids = np.fromiter((c.node(i).id() for c in cells for i in range(dim + 1)),
+                      dtype=int, count=len(cells) * (dim + 1))
+    ids = ids.reshape(len(cells), dim + 1)
+    X = np.array(mesh.positions())[:, :dim][ids]
+    E = X[:, 1:] - X[:, :1]  # dx_j / dxi_i
+    dNdL = np.hstack([-np.ones((dim, 1)), np.eye(dim)])
+    grad = np.linalg.solve(E, np.broadcast_to(dNdL, (len(ids), dim, dim + 1)))
+    size = np.abs(np.linalg.det(E)) / np.prod(np.arange(1, dim + 1))
+    return ids, grad, size
+
+
+def _strainDisplacement(grad, voigtNotation=False):
+    """Strain-displacement matrices for linear simplex cells.
+
+    Strain order is xx, yy, xy (2D) and xx, yy, zz, xy, yz, xz (3D) with
+    the shear strain scaled for Voigt's or Kelvin's notation like the core
+    ElementMatrix.
+
+    Returns
+    -------
+    B: ndarray (nCells, nStrain, dim * nNodes)
+        With displacement components as slowest running index.
+    """
+    nC, dim, nN = grad.shape
+    sc = 1.0 if voigtNotation else 1.0 / np.sqrt(2.0)
+    shear = [(0, 1)] if dim == 2 else [(0, 1), (1, 2), (0, 2)]
+    B = np.zeros((nC, dim + len(shear), dim, nN))
+    for i in range(dim):
+        B[:, i, i] = grad[:, i]
+    for r, (i, j) in enumerate(shear, start=dim):
+        B[:, r, i] = sc * grad[:, j]
+        B[:, r, j] = sc * grad[:, i]
+    return B.reshape(nC, dim + len(shear), dim * nN)
+
+
+def _sparseFromElements(K, dofs, nDof):
+    """Assemble element matrices K (nCells, n, n) for dofs (nCells, n).
+
+    Returns
+    -------
+    A: :gimliapi:`GIMLI::RSparseMatrix`
+    """
+    from scipy.sparse import coo_matrix
+    n = dofs.shape[1]
+    rows = np.broadcast_to(dofs[:, :, None], (len(dofs), n, n))
+    cols = np.broadcast_to(dofs[:, None, :], (len(dofs), n, n))
+    A = coo_matrix((K.ravel(), (rows.ravel(), cols.ravel())),
+                   shape=(nDof, nDof)).tocsr()
+    A.sort_indices()
+    return pg.matrix.SparseMatrix(A.indptr, A.indices, A.data)
+
+
+def _fillComplex(mesh, a, fill):
+    """Fill complex matrix from real and imaginary part with core methods.
+
+    Both parts are filled with the same sparsity pattern given by the mesh.
+    """
+    a = np.asarray(a, dtype=complex)
+    Re = pg.matrix.SparseMatrix()
+    getattr(Re, fill)(mesh, a.real)
+    Im = pg.matrix.SparseMatrix()
+    getattr(Im, fill)(mesh, a.imag)
+    return pg.matrix.CSparseMatrix(Re.vecColPtr(), Re.vecRowIdx(),
+                                   pg.core.toComplex(Re.vecVals(),
+                                                     Im.vecVals()))
+
+
+def _createStiffnessMatrixSimplex(mesh, a, isVector):
+    """Batched assembly for anisotropic or elastic coefficient matrices.
+
+    Only for real valued coefficient matrices on meshes with linear simplex
+    cells, returns None otherwise.
+    """
+    dim = mesh.dimension()
+    vN = getattr(a[0], 'voigtNotation', False)
+    try:
+        C = np.array(a, dtype=float)
+    except (TypeError, ValueError):
+        return None
+
+    nS = dim if not isVector else {2: 3, 3: 6}.get(dim)
+    if C.shape != (mesh.cellCount(), nS, nS):
+        return None
+
+    ids, grad, size = _simplexGradients(mesh)
+    if ids is None:
+        return None
+
+    if isVector:
+        B = _strainDisplacement(grad, voigtNotation=vN)
+        dofs = (ids[:, None, :] +
+                np.arange(dim)[None, :, None] * mesh.nodeCount())
+        dofs = dofs.reshape(len(ids), -1)
+        nDof = mesh.nodeCount() * dim
+    else:
+        B = grad
+        dofs = ids
+        nDof = mesh.nodeCount()
+
+    K = np.einsum('c,cki,ckl,clj->cij', size, B, C, B, optimize=True)
+    return _sparseFromElements(K, dofs, nDof)
 
 
 def createStiffnessMatrix(mesh, a=None, isVector=False):
@@ -1948,6 +2255,13 @@ def createStiffnessMatrix(mesh, a=None, isVector=False):
     -------
     A : :gimliapi:`GIMLI::[C]SparseMatrix` | [C]SparseMapMatrix
         Stiffness matrix, with real or complex values.
+
+    Note
+    ----
+    Real and complex scalar values are assembled in the core. Anisotropy
+    and elastic matrices are assembled for all cells at once if the mesh
+    consists of linear simplex cells (edges, triangles, tetrahedrons),
+    other cell types are assembled cell by cell.
     """
     if mesh.cellCount() == 0:
         print(mesh)
@@ -1966,12 +2280,20 @@ def createStiffnessMatrix(mesh, a=None, isVector=False):
             A.fillStiffnessMatrix(mesh, a)
             return A
 
+        if pg.isScalar(a[0]) and pg.isComplex(a[0]):
+            return _fillComplex(mesh, a, 'fillStiffnessMatrix')
+
         dof = 0
         nDof = mesh.nodeCount()
     else:
         dof = mesh.nodeCount()
         nDof = mesh.nodeCount() * mesh.dimension()
 
+    if not pg.isScalar(a[0]) and not pg.isComplex(a[0]):
+        A = _createStiffnessMatrixSimplex(mesh, a, isVector)
+        if A is not None:
+            return A
+
     # if vector or scalar(Complex)
     if pg.isComplex(a[0]):
         isComplex = True
@@ -2026,11 +2348,11 @@ def createMassMatrix(mesh, b=None):
         Type of base and shape functions depends on the cell types.
 
     b : array
-        Per cell values. If None given default is 1.
+        Per cell values, real or complex. If None given default is 1.
 
     Returns
     -------
-    A : :gimliapi:`GIMLI::RSparseMatrix`
+    A : :gimliapi:`GIMLI::[C]SparseMatrix`
         Mass element matrix
     """
 
@@ -2038,7 +2360,13 @@ def createMassMatrix(mesh, b=None):
     if b is None:
         b = pg.Vector(mesh.cellCount(), 1.0)
     elif not hasattr(b, '__iter__'):
-        b = pg.Vector(mesh.cellCount(), b)
+        if pg.isComplex(b):
+            b = np.full(mesh.cellCount(), b)
+        else:
+            b = pg.Vector(mesh.cellCount(), b)
+
+    if pg.isComplex(b):
+        return _fillComplex(mesh, b, 'fillMassMatrix')
 
     B = pg.matrix.SparseMatrix()
     B.fillMassMatrix(mesh, b)
@@ -2296,6 +2624,11 @@ def solveFiniteElements(mesh, a=1.0, b=None, f=0.0, bc=None,
             Any keyvalue 'u' in the dictionary is used for the resulting array.
         vectorValued: bool (False)
             Solution forced to vector valued, in case the auto detection fails
+        solver: str ['pg']
+            Linear solver backend ('pg' or 'scipy') for multiple forces
+            and dynamic time stepping. Factorizations of unchanged system
+            matrices are reused over the time steps, see
+            :py:class:`FactorizationCache`.
 
     Returns
     -------
@@ -2327,6 +2660,7 @@ def solveFiniteElements(mesh, a=1.0, b=None, f=0.0, bc=None,
     workSpace = kwargs.pop('ws', dict())
     debug = kwargs.pop('debug', False)
     stats = kwargs.pop('stats', False)
+    backend = kwargs.pop('solver', 'pg')
 
     mesh.createNeighborInfos()
     if verbose:
@@ -2437,20 +2771,19 @@ def solveFiniteElements(mesh, a=1.0, b=None, f=0.0, bc=None,
             else:
                 pg.critical(
                     'Non-single force for pure Neumann not yet implemented')
-        else:
+        elif singleForce:
             solver = pg.core.LinSolver(False)
             solver.setMatrix(A, 0)
 
-            if singleForce:
-                if isComplex is True:
-                    # clean this up
-                    rhs = pg.core.toComplex(rhs.real, rhs.imag)
-                    u = solver.solve(rhs).array()
-                else:
-                    u = solver.solve(rhs)
+            if isComplex is True:
+                # clean this up
+                rhs = pg.core.toComplex(rhs.real, rhs.imag)
+                u = solver.solve(rhs).array()
             else:
-                for i, r in enumerate(rhs):
-                    u[i] = solver.solve(r)
+                u = solver.solve(rhs)
+        else:
+            # one factorization for all forces
+            u[:] = LinSolver(A, solver=backend, stype=0).solve(rhs)
 
         solverTime = swatch.duration(True)
         if verbose:
@@ -2502,8 +2835,9 @@ def solveFiniteElements(mesh, a=1.0, b=None, f=0.0, bc=None,
         U = np.zeros((len(times), dof))
         U[0, :] = u0
 
-        # init state
-        u = pg.Vector(dof, 0.0)
+        factorizations = workSpace.setdefault(
+            'factorizations', FactorizationCache(solver=backend,
+                                                 verbose=verbose))
 
         if debug:
             print("u0", swatch.duration())
@@ -2542,10 +2876,9 @@ def solveFiniteElements(mesh, a=1.0, b=None, f=0.0, bc=None,
             if 'assembleOnly' in kwargs:
                 return A, br
 
-            # u = S/b
+            # u = S/b, factorize only if the system has changed
             t_prep = swatch.duration(True)
-            solver = pg.core.LinSolver(A, verbose)
-            solver.solve(br, u)
+            u = factorizations(A, key=(dt, theta)).solve(br)
 
             if 'plotTimeStep' in kwargs:
                 kwargs['plotTimeStep'](u, times[n])
@@ -0,0 +1,516 @@
+# coding=utf-8
+"""
+Benchmark suite for the performance critical parts of pyGIMLi.
+
+Every benchmark is registered with :py:func:`benchmark` and set up for a
+named problem size (`small`, `medium`, `large`). Only the returned callable
+is timed. Each case runs in its own forked process, so peak memory is
+recorded per case and no caches are shared between cases. The results can
+be written to JSON and compared against a stored baseline.
+
+From the command line::
+
+    python -m pygimli.testing.benchmark --size small -o bench.json
+    python -m pygimli.testing.benchmark --size small --baseline bench.json
+
+The second call exits with a non-zero code if a case is slower (or needs
+more memory) than the baseline by more than the given tolerance.
+"""
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import pygimli as pg
+
+__BENCHMARKS__ = {}
+
+SIZES = ('small', 'medium', 'large')
+
+
+def benchmark(**sizes):
+    """Register a benchmark.
+
+    The decorated function gets the problem parameter for the chosen size
+    and returns a callable without arguments that is timed.
+
+    Parameters
+    ----------
+    **sizes:
+        Problem parameter for each size in `SIZES`.
+
+    Examples
+    --------
+    >>> from pygimli.testing.benchmark import benchmark
+    >>> @benchmark(small=10, medium=100, large=1000) # doctest: +SKIP
+    ... def cumsum(n):
+    ...     x = np.ones(n)
+    ...     return lambda: np.cumsum(x)
+    """
+    def _register(func):
+        __BENCHMARKS__[func.__name__] = (func, sizes)
+        return func
+    return _register
+
+
+def benchmarks(pattern=None):
+    """Return the names of all registered benchmarks matching `pattern`."""
+    return [n for n in __BENCHMARKS__
+            if pattern is None or pattern.lower() in n.lower()]
+
+
+###############################################################################
+# Benchmarks
+###############################################################################
+def _ert2DModelling(area):
+    import pygimli.meshtools as mt
+    from pygimli.physics import ert
+
+    data = ert.createData(elecs=np.linspace(0, 20, 21), schemeName='dd')
+    world = mt.createWorld([-20, -10], [40, 0], worldMarker=True)
+    for p in data.sensors():
+        world.createNode(p)
+        world.createNode(p - [0, 0.1])
+    mesh = mt.createMesh(world, quality=32, area=area)
+    fop = ert.ERTModelling(verbose=False)
+    fop.setData(data)
+    fop.setMesh(mesh)
+    return fop, pg.Vector(fop.paraDomain.cellCount(), 100.0)
+
+
+def _ert3DModelling(dx):
+    from pygimli.physics import ert
+
+    x = np.arange(-10, 20 + dx / 2, dx)
+    y = np.arange(-10, 10 + dx / 2, dx)
+    z = np.arange(-10, dx / 2, dx)
+    mesh = pg.createGrid(x, y, z, marker=2)
+    for b in mesh.boundaries():
+        if b.outside():
+            if b.center().z() == 0:
+                b.setMarker(pg.core.MARKER_BOUND_HOMOGEN_NEUMANN)
+            else:
+                b.setMarker(pg.core.MARKER_BOUND_MIXED)
+
+    data = ert.createData(elecs=np.linspace(0, 10, 11), schemeName='dd')
+    fop = ert.ERTModelling(verbose=False)
+    fop.setData(data)
+    fop.setMesh(mesh)
+    return fop, pg.Vector(fop.paraDomain.cellCount(), 100.0)
+
+
+def _ttModelling(n):
+    from pygimli.physics import traveltime as tt
+
+    mesh = pg.createGrid(np.linspace(0, 20, n + 1),
+                         np.linspace(-10, 0, n // 2 + 1))
+    mgr = tt.TravelTimeManager(verbose=False)
+    mgr.fop.setData(tt.createRAData(np.linspace(0, 20, 21)))
+    mgr.applyMesh(mesh, secNodes=2)
+    v = 500 - 200 * pg.y(mgr.fop.paraDomain.cellCenters())
+    return mgr.fop, 1.0 / v
+
+
+def _feMesh(n):
+    import pygimli.meshtools as mt
+    return mt.createMesh(mt.createRectangle([0, 0], [1, 1]), quality=33,
+                         area=1.0 / n**2)
+
+
+@benchmark(small=4.0, medium=1.0, large=0.25)
+def ert2DResponse(area):
+    """ERT 2.5D forward response."""
+    fop, model = _ert2DModelling(area)
+    return lambda: fop.response(model)
+
+
+@benchmark(small=4.0, medium=1.0, large=0.25)
+def ert2DJacobian(area):
+    """ERT 2.5D Jacobian."""
+    fop, model = _ert2DModelling(area)
+    return lambda: fop.createJacobian(model)
+
+
+@benchmark(small=2.0, medium=1.0, large=0.5)
+def ert3DResponse(dx):
+    """ERT 3D forward response."""
+    fop, model = _ert3DModelling(dx)
+    return lambda: fop.response(model)
+
+
+@benchmark(small=2.0, medium=1.0, large=0.5)
+def ert3DJacobian(dx):
+    """ERT 3D Jacobian."""
+    fop, model = _ert3DModelling(dx)
+    return lambda: fop.createJacobian(model)
+
+
+@benchmark(small=20, medium=60, large=150)
+def ttDijkstra(n):
+    """Traveltime Dijkstra response and way matrix Jacobian."""
+    fop, slowness = _ttModelling(n)
+
+    def _run():
+        fop.response(slowness)
+        fop.createJacobian(slowness)
+    return _run
+
+
+@benchmark(small=30, medium=100, large=300)
+def feAssembly(n):
+    """Assembly of the FE stiffness and mass matrix."""
+    mesh = _feMesh(n)
+
+    def _run():
+        pg.solver.createStiffnessMatrix(mesh)
+        pg.solver.createMassMatrix(mesh)
+    return _run
+
+
+@benchmark(small=30, medium=100, large=300)
+def linSolver(n):
+    """Sparse factorization of a FE system matrix with LinSolver."""
+    mesh = _feMesh(n)
+    A = pg.solver.createStiffnessMatrix(mesh) + \
+        pg.solver.createMassMatrix(mesh)
+    return lambda: pg.solver.LinSolver(A)
+
+
+@benchmark(small=10, medium=30, large=60)
+def inversion(n):
+    """Gauss-Newton Inversion.run with a traveltime forward operator."""
+    fop, slowness = _ttModelling(n)
+    t = fop.response(slowness)
+
+    def _run():
+        inv = pg.Inversion(fop=fop, verbose=False)
+        inv.run(t, relativeError=0.01, maxIter=3, lam=100,
+                startModel=np.median(slowness))
+    return _run
+
+
+@benchmark(small=50, medium=200, large=500)
+def interpolate(n):
+    """Interpolation of nodal data with pg.interpolate."""
+    mesh = _feMesh(n)
+    u = pg.x(mesh) * pg.y(mesh)
+    pnts = np.random.RandomState(1337).rand(n**2, 2)
+    x, y = pnts[:, 0], pnts[:, 1]
+    return lambda: pg.interpolate(mesh, u, x=x, y=y)
+
+
+@benchmark(small=0.01, medium=0.001, large=0.0001)
+def meshGeneration(area):
+    """Triangle mesh generation with meshtools.createMesh."""
+    import pygimli.meshtools as mt
+    plc = mt.createRectangle([0, 0], [1, 1]) + \
+        mt.createCircle([0.5, 0.5], radius=0.2, marker=2)
+    return lambda: mt.createMesh(plc, quality=33, area=area)
+
+
+@benchmark(small=10, medium=30, large=60)
+def meshIO(n):
+    """Save and load a 3D mesh with data in binary and vtk format."""
+    import tempfile
+    mesh = pg.createGrid(*[np.linspace(0, 1, n + 1)] * 3)
+    mesh['data'] = np.arange(mesh.cellCount())
+    fName = os.path.join(tempfile.mkdtemp(), 'mesh')
+
+    def _run():
+        mesh.save(fName)
+        pg.load(fName + '.bms')
+        mesh.exportVTK(fName)
+        pg.load(fName + '.vtk')
+    return _run
+
+
+###############################################################################
+# Runner
+###############################################################################
+def _resetPeakMemory():
+    """Reset the resident set high water mark of the process (Linux only)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as fi:
+            fi.write('5')
+    except OSError:
+        pass
+
+
+def _memory(key='VmHWM'):
+    """Resident (peak) memory of the process in MB."""
+    try:
+        with open('/proc/self/status') as fi:
+            for line in fi:
+                if line.startswith(key + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024**2 if sys.platform == 'darwin' else rss / 1024
+
+
+def _runCase(name, size, threads, repeat):
+    """Set up and time one benchmark case in the current process."""
+    func, sizes = __BENCHMARKS__[name]
+    pg.setThreadCount(threads)
+    np.random.seed(1337)
+
+    _resetPeakMemory()
+    mem0 = _memory('VmRSS')
+    swatch = pg.Stopwatch(True)
+    run = func(sizes[size])
+    setup = swatch.duration(True)
+
+    times = []
+    for _ in range(repeat):
+        swatch.restart()
+        run()
+        times.append(swatch.duration())
+
+    peak = _memory()
+    return dict(name=name, size=size, param=sizes[size], threads=threads,
+                time=min(times), times=times, setup=setup,
+                peakMemory=peak, memory=peak - mem0)
+
+
+def _caseWorker(conn, *args):
+    try:
+        conn.send(_runCase(*args))
+    except BaseException as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+def runCase(name, size='small', threads=1, repeat=3, fork=True):
+    """Run a single benchmark case.
+
+    Parameters
+    ----------
+    name: str
+        Name of the registered benchmark.
+    size: str ['small']
+        Problem size, one of `SIZES`.
+    threads: int [1]
+        Number of threads for the core library, see `pg.setThreadCount`.
+    repeat: int [3]
+        Number of timed repetitions. The fastest one is reported as `time`.
+    fork: bool [True]
+        Run the case in a forked process to isolate memory usage. Falls back
+        to the current process if fork is not available.
+
+    Returns
+    -------
+    res: dict
+        Wall times (s) and peak resident memory (MB) of the case.
+    """
+    import multiprocessing as mp
+
+    if name not in __BENCHMARKS__:
+        pg.critical("Unknown benchmark:", name, "available:", benchmarks())
+
+    if not fork or 'fork' not in mp.get_all_start_methods():
+        return _runCase(name, size, threads, repeat)
+
+    ctx = mp.get_context('fork')
+    recv, send = ctx.Pipe(duplex=False)
+    p = ctx.Process(target=_caseWorker,
+                    args=(send, name, size, threads, repeat))
+    p.start()
+    send.close()
+    try:
+        res = recv.recv()
+    except EOFError:
+        res = RuntimeError("Benchmark process died with exit code "
+                           "{0}".format(p.join() or p.exitcode))
+    p.join()
+    if isinstance(res, BaseException):
+        raise res
+    return res
+
+
+def machineInfo():
+    """Return a dictionary describing the current machine and versions."""
+    return dict(version=pg.__version__, core=pg.versionStr(),
+                python=platform.python_version(), numpy=np.__version__,
+                platform=platform.platform(), machine=platform.machine(),
+                processor=platform.processor(), cpuCount=pg.getCPUCount(),
+                date=time.strftime('%Y-%m-%dT%H:%M:%S'))
+
+
+def runBenchmarks(pattern=None, size='small', threads=None, repeat=3,
+                  fork=True, verbose=True):
+    """Run all benchmarks matching pattern.
+
+    Parameters
+    ----------
+    pattern: str [None]
+        Only run benchmarks whose name contains this (case insensitive).
+    size: str | list ['small']
+        Problem size(s), out of `SIZES`.
+    threads: int | list [None]
+        Thread counts for the scaling test. Default is [1].
+    repeat: int [3]
+        Number of timed repetitions per case.
+    fork: bool [True]
+        Run each case in its own process, see :py:func:`runCase`.
+    verbose: bool [True]
+        Print a line per case.
+
+    Returns
+    -------
+    results: dict
+        `info` describes the machine, `results` holds one dict per case
+        including `speedup` with respect to the smallest thread count.
+    """
+    sizes = [size] if isinstance(size, str) else list(size)
+    threads = [1] if threads is None else \
+        sorted(set(np.atleast_1d(threads).tolist()))
+
+    results = []
+    for name in benchmarks(pattern):
+        for s in sizes:
+            t1 = None
+            for nt in threads:
+                res = runCase(name, s, nt, repeat=repeat, fork=fork)
+                if t1 is None:  # smallest thread count
+                    t1 = res['time']
+                res['speedup'] = t1 / res['time'] if res['time'] > 0 else 1.0
+                results.append(res)
+                if verbose:
+                    pg.info("{name:>16s} {size:>6s} threads: {threads:2d} "
+                            "time: {time:8.4f} s (setup: {setup:.3f} s) "
+                            "peak memory: {peakMemory:7.1f} MB "
+                            "speedup: {speedup:.2f}".format(**res))
+
+    return dict(info=machineInfo(), results=results)
+
+
+def saveBenchmarks(results, fileName):
+    """Write benchmark results to a json file."""
+    with open(fileName, 'w') as fi:
+        json.dump(results, fi, indent=1)
+
+
+def loadBenchmarks(fileName):
+    """Read benchmark results from a json file."""
+    with open(fileName) as fi:
+        return json.load(fi)
+
+
+def compareBenchmarks(results, baseline, tolerance=0.25, minTime=0.01,
+                      minMemory=10.0, verbose=True):
+    """Compare benchmark results against a baseline.
+
+    A case is a regression if it is slower by more than the relative
+    `tolerance` and `minTime` or needs more memory by more than `tolerance`
+    and `minMemory`. Baseline cases without a matching result are
+    regressions too (key 'missing'), new cases without baseline are ignored.
+
+    Parameters
+    ----------
+    results: dict | str
+        Results from :py:func:`runBenchmarks` or json file name.
+    baseline: dict | str
+        Baseline results or json file name.
+    tolerance: float [0.25]
+        Allowed relative increase.
+    minTime: float [0.01]
+        Ignore time differences below this (s) to skip timer noise.
+    minMemory: float [10]
+        Ignore memory differences below this (MB).
+    verbose: bool [True]
+        Warn for every regression.
+
+    Returns
+    -------
+    regressions: list
+        One dict (name, size, threads, key, value, baseline, ratio) per
+        regression. Missing cases have value None and ratio inf.
+    """
+    if isinstance(results, str):
+        results = loadBenchmarks(results)
+    if isinstance(baseline, str):
+        baseline = loadBenchmarks(baseline)
+
+    def _key(r):
+        return r['name'], r['size'], r['threads']
+
+    base = {_key(r): r for r in baseline['results']}
+    found = set(_key(r) for r in results['results'])
+    regressions = []
+    for b in baseline['results']:
+        if _key(b) not in found:
+            reg = dict(name=b['name'], size=b['size'], threads=b['threads'],
+                       key='missing', value=None, baseline=b.get('time'),
+                       ratio=np.inf)
+            regressions.append(reg)
+            if verbose:
+                pg.warn("Regression {name} ({size}, {threads} threads): "
+                        "no result for baseline case".format(**reg))
+
+    for r in results['results']:
+        b = base.get(_key(r))
+        if b is None:
+            continue
+        for key, minDiff in (('time', minTime), ('memory', minMemory)):
+            if key not in b:
+                continue
+            diff = r[key] - b[key]
+            if diff > minDiff and diff > tolerance * abs(b[key]):
+                ratio = r[key] / b[key] if b[key] > 0 else np.inf
+                reg = dict(name=r['name'], size=r['size'],
+                           threads=r['threads'], key=key, value=r[key],
+                           baseline=b[key], ratio=ratio)
+                regressions.append(reg)
+                if verbose:
+                    pg.warn("Regression {name} ({size}, {threads} threads): "
+                            "{key} {value:.4g} vs. {baseline:.4g} "
+                            "({ratio:.2f}x)".format(**reg))
+    return regressions
+
+
+def main(argv=None):
+    """Command line interface, see module documentation."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-k', '--pattern', default=None,
+                        help='Only run benchmarks containing this name.')
+    parser.add_argument('-s', '--size', nargs='+', default=['small'],
+                        choices=SIZES)
+    parser.add_argument('-t', '--threads', nargs='+', type=int, default=[1])
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', default=None,
+                        help='Write results to this json file.')
+    parser.add_argument('-b', '--baseline', default=None,
+                        help='Compare against results in this json file.')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('-l', '--list', action='store_true',
+                        help='List the available benchmarks.')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in benchmarks(args.pattern):
+            func, sizes = __BENCHMARKS__[name]
+            print('{0:>16s}: {1} {2}'.format(name, func.__doc__, sizes))
+        return 0
+
+    results = runBenchmarks(args.pattern, size=args.size,
+                            threads=args.threads, repeat=args.repeat)
+    if args.output:
+        saveBenchmarks(results, args.output)
+
+    if args.baseline:
+        if compareBenchmarks(results, args.baseline,
+                             tolerance=args.tolerance):
+            return 1
+        pg.info('No regressions with respect to', args.baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
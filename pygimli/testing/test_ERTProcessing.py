@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+import unittest
+
+import numpy as np
+import pygimli as pg
+
+from pygimli.physics.ert import (matchIndex, reciprocalIndices,
+                                 reciprocalStatistics)
+from pygimli.physics.ert.processing import getReciprocals
+
+
+class TestERTProcessing(unittest.TestCase):
+
+    def setUp(self):
+        self.data = pg.DataContainerERT()
+        for i in range(6):
+            self.data.createSensor([i, 0])
+        # normal, reciprocal, duplicate of the normal, unmatched
+        abmn = np.array([[0, 1, 3, 2], [3, 2, 0, 1], [0, 1, 3, 2],
+                         [1, 2, 4, 5]])
+        self.data.resize(len(abmn))
+        for i, tok in enumerate('abmn'):
+            self.data[tok] = abmn[:, i]
+        self.data['r'] = [10., 12., 11., 5.]
+        self.data['i'] = np.full(self.data.size(), 0.1)
+        self.data['u'] = self.data['r'] * self.data['i']
+        self.data['k'] = np.ones(self.data.size())
+        self.data['valid'] = 1
+
+    def test_matchIndex(self):
+        np.testing.assert_equal(matchIndex([5, 3, 7, 5], [5, 1, 7, 5]),
+                                [0, -1, 2, 0])
+
+    def test_reciprocals(self):
+        iF, iB = reciprocalIndices(self.data, onlyOnce=True)
+        # only the first duplicate is matched
+        np.testing.assert_equal(np.sort(np.column_stack([iF, iB]), axis=1),
+                                [[0, 1]])
+
+        st = reciprocalStatistics(self.data)
+        self.assertEqual(len(st['count']), 2)
+        np.testing.assert_equal(st['group'][:3], st['group'][0])
+        self.assertEqual(st['count'][st['group'][0]], 3)
+        self.assertEqual(st['nRec'][st['group'][0]], 1)
+        np.testing.assert_allclose(st['mean'][st['group'][3]], 5.)
+
+        getReciprocals(self.data)
+        # the duplicate (last match) determines the reciprocal's value
+        np.testing.assert_allclose(self.data['rec'], [-2 / 11, 2 / 23, 0, 0])
+
+        # only the averaged forward data (0, 1) change
+        data = pg.DataContainerERT(self.data)
+        data['u'] = data['u'] * 1.5  # e.g. not exactly r*i
+        u = np.array(data['u'])
+        getReciprocals(data, change=True)
+        np.testing.assert_equal(data['u'][2:], u[2:])
+        np.testing.assert_equal(np.asarray(data['i'])[2:], 0.1)
+        np.testing.assert_equal(data['r'][2:], self.data['r'][2:])
+        np.testing.assert_allclose(data['u'][:2],
+                                   data['r'][:2] * data['i'][:2])
+
+    def test_binaryData(self):
+        import os
+        import tempfile
+        from pygimli.physics.ert import TimelapseERT
+
+        fileName = tempfile.mktemp(suffix='.bdat')
+        DATA = np.outer(self.data['r'], [1., 2.])
+        pg.core.saveBinaryData(fileName, self.data, times=[0., 1.],
+                               rhoa=DATA)
+        pg.core.appendBinaryData(fileName, times=[2.], rhoa=self.data['r']*3)
+
+        store = pg.core.loadBinaryData(fileName)
+        self.assertIsInstance(store['r'], np.memmap)
+        self.assertTrue(store.isSensorIndex('a'))
+        np.testing.assert_equal(store.times, [0., 1., 2.])
+        np.testing.assert_allclose(store.timelapse('rhoa'),
+                                   np.outer(self.data['r'], [1., 2., 3.]))
+        np.testing.assert_allclose(store.frame('rhoa', -1), self.data['r']*3)
+
+        # an append interrupted before its trailer keeps the file readable
+        size = os.path.getsize(fileName)
+        pg.core.appendBinaryData(fileName, times=[3.], rhoa=self.data['r'])
+        with open(fileName, 'r+b') as fid:
+            fid.truncate(os.path.getsize(fileName) - 5)
+        self.assertGreater(os.path.getsize(fileName), size)
+        self.assertEqual(pg.core.loadBinaryData(fileName).nTimes(), 3)
+        pg.core.appendBinaryData(fileName, times=[3.], rhoa=self.data['r']*4)
+        store = pg.core.loadBinaryData(fileName)
+        np.testing.assert_allclose(store.frame('rhoa', 3), self.data['r']*4)
+        pg.core.appendBinaryData(fileName, times=[4.], rhoa=self.data['r']*5)
+        store = pg.core.loadBinaryData(fileName)
+        np.testing.assert_equal(store.times, [0., 1., 2., 3., 4.])
+
+        data = pg.load(fileName)
+        self.assertIsInstance(data, pg.DataContainerERT)
+        for tok in ['a', 'b', 'm', 'n', 'r', 'valid']:
+            np.testing.assert_equal(data[tok], self.data[tok])
+
+        tl = TimelapseERT(fileName)
+        tl.saveData(fileName)
+        tl = TimelapseERT(fileName)
+        self.assertEqual(tl.DATA.shape, (self.data.size(), 5))
+        np.testing.assert_equal(tl.times, [0., 1., 2., 3., 4.])
+        os.remove(fileName)
+
+    def test_timelapseCheckpoint(self):
+        import os
+        import tempfile
+        from pygimli.physics.ert import TimelapseERT
+
+        DATA = np.outer(self.data['r'], np.arange(1., 6.))
+        tl = TimelapseERT(data=self.data, DATA=DATA,
+                          mesh=pg.createGrid(6, 3))
+        calls = []
+
+        def fakeFrame(ti, startModel, refModel=None, warmStart=False,
+                      **kwargs):
+            if len(calls) == 3:
+                raise KeyboardInterrupt  # killed during the fourth step
+            calls.append(ti)
+            return np.full(10, ti + 1.), np.full(4, ti * 2.), 1.0
+
+        tl._invertFrame = fakeFrame
+        with tempfile.TemporaryDirectory() as path:
+            cp = os.path.join(path, 'run.cp')
+            with self.assertRaises(KeyboardInterrupt):
+                tl.invert(checkpoint=cp)
+            self.assertTrue(os.path.isfile(cp))
+
+            # a write interrupted by a kill leaves only the temporary file
+            with open(cp + '.tmp', 'wb') as fid:
+                fid.write(b'PK\x03\x04 truncated')
+
+            calls.clear()
+            tl = TimelapseERT(data=self.data, DATA=DATA,
+                              mesh=pg.createGrid(6, 3))
+            tl._invertFrame = fakeFrame
+            tl.invert(checkpoint=cp)
+            np.testing.assert_equal(calls, [3, 4])
+            np.testing.assert_equal(tl.models[:, 0], np.arange(1., 6.))
+            self.assertFalse(os.path.exists(cp + '.tmp'))
+
+
+if __name__ == '__main__':
+    unittest.main()
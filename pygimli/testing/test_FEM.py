@@ -365,6 +365,104 @@ class TestFiniteElementBasics(unittest.TestCase):
             pg.plt.legend()
 
 
+    def test_TimeSteppingFactorization(self):
+        mesh = pg.createGrid(np.linspace(0, 1, 11), np.linspace(0, 1, 11))
+        times = np.linspace(0, 0.5, 21)
+        bc = {'Dirichlet': {'1,2,3,4': 0.0}}
+
+        ws = {}
+        U = pg.solver.solveFiniteElements(mesh, a=1.0, f=1.0, bc=bc,
+                                          times=times, dynamic=True, ws=ws)
+        # constant time step, one factorization for all steps
+        self.assertEqual(ws['factorizations'].misses, 1)
+        self.assertEqual(ws['factorizations'].hits, len(times) - 2)
+
+        U2 = pg.solver.solveFiniteElements(mesh, a=1.0, f=1.0, bc=bc,
+                                           times=times, solver='scipy',
+                                           dynamic=True)
+        np.testing.assert_allclose(U2, U, atol=1e-12)
+
+        # changed time step needs a new factorization
+        times = np.append(times, [0.6, 0.62])
+        ws = {}
+        pg.solver.solveFiniteElements(mesh, a=1.0, f=1.0, bc=bc,
+                                      times=times, dynamic=True, ws=ws)
+        self.assertEqual(ws['factorizations'].misses, 3)
+
+    def test_MultipleRHS(self):
+        mesh = pg.createGrid(np.linspace(0, 1, 11), np.linspace(0, 1, 11))
+        A = pg.solver.createStiffnessMatrix(mesh, np.ones(mesh.cellCount()))
+        A = A + pg.solver.createMassMatrix(mesh, np.ones(mesh.cellCount()))
+        B = np.random.default_rng(0).standard_normal((3, A.rows()))
+
+        for solver in ['pg', 'scipy']:
+            X = pg.solver.LinSolver(A, solver=solver).solve(B)
+            self.assertEqual(X.shape, B.shape)
+            for x, b in zip(X, B):
+                np.testing.assert_allclose(A * pg.Vector(x), b, atol=1e-10)
+
+    def test_StiffnessMatrixCoefficients(self):
+        import pygimli.meshtools as mt
+
+        def _dense(A):
+            return pg.utils.sparseMatrix2csr(A).toarray()
+
+        grid = pg.createGrid(np.arange(5.), np.arange(4.))
+        for mesh in [mt.refineQuad2Tri(grid), grid,
+                     mt.refineHex2Tet(pg.createGrid(*[np.arange(3.)]*3))]:
+            a = np.linspace(1., 2., mesh.cellCount())
+            K = _dense(pg.solver.createStiffnessMatrix(mesh, a))
+
+            Kc = _dense(pg.solver.createStiffnessMatrix(mesh, a*(1+2j)))
+            np.testing.assert_allclose(Kc, K*(1+2j), atol=1e-12)
+
+            Mc = _dense(pg.solver.createMassMatrix(mesh, a*1j))
+            np.testing.assert_allclose(
+                Mc, _dense(pg.solver.createMassMatrix(mesh, a))*1j)
+
+            dim = mesh.dimension()
+            C = [ai * np.eye(dim) for ai in a]
+            Ka = _dense(pg.solver.createStiffnessMatrix(mesh, C))
+            np.testing.assert_allclose(Ka, K, atol=1e-12)
+
+            # rigid body movements are free of strain
+            C = [pg.solver.createConstitutiveMatrix(E=ai, nu=0.3, dim=dim)
+                 for ai in a]
+            Ke = _dense(pg.solver.createStiffnessMatrix(mesh, C,
+                                                        isVector=True))
+            np.testing.assert_allclose(Ke, Ke.T, atol=1e-12)
+            x, y = pg.x(mesh), pg.y(mesh)
+            for u in [np.ones(mesh.nodeCount()*dim),
+                      np.hstack([-y, x] + [pg.z(mesh)*0]*(dim-2))]:
+                np.testing.assert_allclose(Ke.dot(u), 0, atol=1e-12)
+
+    def test_LoadVector(self):
+        import pygimli.meshtools as mt
+
+        grid = pg.createGrid(np.arange(5.), np.arange(4.))
+        for mesh in [grid, mt.refineQuad2Tri(grid), grid.createP2()]:
+            f = np.linspace(1., 2., mesh.cellCount())
+            # reference: element-wise assembly
+            ref = pg.Vector(mesh.nodeCount(), 0.0)
+            b_l = pg.matrix.ElementMatrix()
+            for c in mesh.cells():
+                b_l.u(c)
+                ref.add(b_l, f[c.id()])
+
+            np.testing.assert_allclose(pg.solver.createLoadVector(mesh, f),
+                                       ref)
+            x = pg.x(mesh.cellCenters())
+            np.testing.assert_allclose(
+                pg.solver.createLoadVector(mesh, lambda pos: pos[:, 0],
+                                           vectorized=True),
+                pg.solver.createLoadVector(mesh, lambda c: c.center()[0]))
+
+            R = pg.solver.createLoadVector(mesh, np.vstack([f, x]))
+            self.assertEqual(R.shape, (2, mesh.nodeCount()))
+            np.testing.assert_allclose(R[0], ref)
+            np.testing.assert_allclose(R[1],
+                                       pg.solver.createLoadVector(mesh, x))
+
     def testElementMatrix(self):
         a = pg.core.ElementMatrix()
 
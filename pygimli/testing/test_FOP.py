@@ -2,6 +2,7 @@
 """
 Basic tests
 """
+import sys
 import unittest
 import time
 
@@ -108,6 +109,80 @@ class TestFOP(unittest.TestCase):
         # np.testing.assert_array_equal(J1 * 2.0, J2)
         #######  temporary deactivated  -- test me
 
+    @unittest.skipIf(sys.platform in ['win32', 'darwin'],
+                     'Multiprocess Jacobian needs fork.')
+    def test_JacobianPool(self):
+        """Brute force Jacobian and responses with persistent workers."""
+        from pygimli.physics.ves import VESModelling
+
+        ab2 = np.logspace(0, 2, 15)
+        fop = VESModelling(ab2=ab2, mn2=ab2/3, nLayers=3)
+        m = pg.Vector([2., 5., 10., 100., 30.])
+        ms = np.array([m * 1.1, m * 1.2, m * 1.3])
+
+        fop.setMultiThreadJacobian(1)
+        fop.createJacobian(m)
+        J1 = np.array(fop.jacobian())
+        ds1 = np.zeros((len(ms), len(ab2)))
+        fop.responses(ms, ds1)
+
+        fop.setMultiThreadJacobian(3)
+        fop.createJacobian(m)
+        pool = fop._mtPool
+        fop.createJacobian(m)
+        self.assertIs(fop._mtPool, pool)
+        np.testing.assert_allclose(np.array(fop.jacobian()), J1)
+
+        ds2 = np.zeros((len(ms), len(ab2)))
+        fop.responses(ms, ds2)
+        np.testing.assert_allclose(ds2, ds1)
+
+        # changed operator state must not reuse stale workers
+        fop.am = fop.am * 2.
+        fop.createJacobian(m)
+        self.assertIsNot(fop._mtPool, pool)
+        fop.releaseWorkerPool()
+
+    @unittest.skipIf(sys.platform in ['win32', 'darwin'],
+                     'Multiprocess Jacobian needs fork.')
+    def test_JacobianPoolModified(self):
+        """Reconfigured operators must not reuse stale workers."""
+        class ProductModelling(pg.Modelling):
+            def __init__(self):
+                super().__init__()
+                self.p = {'A': 1.0}
+                self.regionManager().setParameterCount(2)
+
+            def response_mt(self, model, i=0):
+                return self.response(model)
+
+            def response(self, model):
+                return pg.Vector([self.p['A'] * model[0] * model[1]])
+
+        fop = ProductModelling()
+        fop.setMultiThreadJacobian(2)
+        m = pg.Vector([2., 3.])
+
+        fop.createJacobian_mt(m, fop.response(m))
+        np.testing.assert_allclose(np.array(fop.jacobian()), [[3., 2.]],
+                                   rtol=0.06)
+        pool = fop._mtPool
+
+        # nested containers are part of the operator state
+        fop.p['A'] = 2.0
+        fop.createJacobian_mt(m, fop.response(m))
+        self.assertIsNot(fop._mtPool, pool)
+        np.testing.assert_allclose(np.array(fop.jacobian()), [[6., 4.]],
+                                   rtol=0.06)
+
+        # explicit notification and setters release the pool
+        fop.modified()
+        self.assertIsNone(fop._mtPool)
+        fop.createJacobian_mt(m, fop.response(m))
+        fop.setRegionProperties(0, limits=[1, 10])
+        self.assertIsNone(fop._mtPool)
+        fop.releaseWorkerPool()
+
 if __name__ == '__main__':
 
     fop  = TestFOP()
@@ -50,6 +50,191 @@ class TestFrameworks(unittest.TestCase):
         np.testing.assert_allclose(model, [1.1, 2.2])
         np.testing.assert_allclose(data, response)
 
+    def test_MatrixFreeInversion(self):
+        """NLCG and LBFGS without forming the Jacobian."""
+        from pygimli.frameworks.inversion import (NLCGInversion,
+                                                  LBFGSInversion)
+        grid = pg.createGrid(np.linspace(0, 1, 11), np.linspace(0, 1, 11))
+        rng = np.random.default_rng(1337)
+        A = rng.random((40, grid.cellCount()))
+        A *= rng.random(A.shape) < 0.3
+
+        class MatrixFreeModelling(pg.frameworks.MeshModelling):
+            def response(self, model):
+                return A.dot(model)
+
+            def createJacobian(self, model):
+                raise Exception("Jacobian should not be formed.")
+
+            def Sx(self, x):
+                return A.dot(x)
+
+            def STy(self, y):
+                return A.T.dot(y)
+
+            def createRefinedFwdMesh(self, mesh):
+                return mesh
+
+        synth = np.exp(1 + np.sin(pg.x(grid.cellCenters()) * 6))
+        data = A.dot(synth)
+
+        for Inv in [NLCGInversion, LBFGSInversion]:
+            fop = MatrixFreeModelling()
+            fop.setMesh(grid)
+            fop.createConstraints()
+            inv = Inv(fop=fop)
+            inv.dataTrans = 'log'
+            inv.lam = 10
+            inv.run(data, relativeError=0.01, startModel=3., maxIter=30)
+            self.assertLess(inv.chi2(), 1.0)
+
+    def test_LineSearch(self):
+        """Line search reuses its responses, also for concurrent steps."""
+        from pygimli.frameworks.inversion import GaussNewtonInversion
+        from pygimli.frameworks.linesearch import lineSearch
+
+        grid = pg.createGrid(np.linspace(0, 1, 6), np.linspace(0, 1, 6))
+        rng = np.random.default_rng(1337)
+        A = rng.random((30, grid.cellCount()))
+        calls = []
+
+        class PowerModelling(pg.frameworks.MeshModelling):
+            def response(self, model):
+                calls.append(1)
+                return A.dot(np.asarray(model)**1.5)
+
+            def createJacobian(self, model):
+                J = A * 1.5 * np.asarray(model)**0.5
+                self.jacobian().resize(*J.shape)
+                for i, row in enumerate(J):
+                    self.jacobian().setVal(i, row)
+
+            def createRefinedFwdMesh(self, mesh):
+                return mesh
+
+        synth = np.exp(1 + np.sin(pg.x(grid.cellCenters()) * 6))
+        data = A.dot(synth**1.5)
+        fop = PowerModelling()
+        fop.setMesh(grid)
+        fop.createConstraints()
+        inv = GaussNewtonInversion(fop=fop)
+        inv.dataTrans = 'log'
+        inv.lam = 10
+        inv.run(data, relativeError=0.01, startModel=3., maxIter=1)
+        dM = inv.modelUpdate()
+
+        tau, resp = lineSearch(inv, dM, method='exact')
+        tau2, resp2 = lineSearch(inv, dM, method='exact', nWorkers=2)
+        self.assertEqual(tau, tau2)
+        np.testing.assert_allclose(resp, resp2)
+        np.testing.assert_allclose(
+            resp, fop.response(inv.modelTrans.update(inv.model, dM*tau)))
+
+        for method in ['exact', 'quad', 'armijo']:
+            inv.lineSearchMethod = method
+            inv.run(data, relativeError=0.01, startModel=3., maxIter=10)
+            self.assertLess(inv.chi2(), 1.0)
+            # the step response is taken from the line search
+            del calls[:]
+            inv.oneStep()
+            nCalls = {'exact': 21, 'quad': 3, 'armijo': 1}[method]
+            self.assertLessEqual(len(calls), nCalls)
+            np.testing.assert_allclose(inv.response, fop.response(inv.model))
+
+    def test_LSQR(self):
+        """Preconditioned and warm-started LSQR for inversion systems."""
+        from pygimli.solver.leastsquares import lsqr, squaredColumnNorms
+
+        grid = pg.createGrid(np.linspace(0, 1, 11), np.linspace(0, 1, 6))
+        fop = pg.frameworks.MeshModelling()
+        fop.setMesh(grid)
+        fop.createConstraints()
+        C = fop.constraints()
+        rng = np.random.default_rng(1337)
+        nData, nModel = 30, grid.cellCount()
+        J = pg.Matrix(rng.random((nData, nModel)) *
+                      np.exp(-6 * rng.random(nModel)))
+        JJ = pg.matrix.MultLeftRightMatrix(J, pg.Vector(rng.random(nData)),
+                                           pg.Vector(rng.random(nModel)))
+        A = pg.matrix.BlockMatrix()
+        A.addMatrixEntry(A.addMatrix(JJ), 0, 0)
+        A.addMatrixEntry(A.addMatrix(C), nData, 0, 2.0)
+        A.recalcMatrixSize()
+        Ad = np.column_stack([A.mult(pg.Vector(e)) for e in np.eye(nModel)])
+        np.testing.assert_allclose(squaredColumnNorms(A),
+                                   (Ad**2).sum(axis=0))
+
+        b = pg.Vector(rng.random(A.rows()))
+        x = np.linalg.lstsq(Ad, b, rcond=None)[0]
+        err = lambda y: np.linalg.norm(y - x) / np.linalg.norm(x)
+        self.assertLess(err(lsqr(A, b, maxiter=500, precond='column')), 1e-6)
+        self.assertLess(err(lsqr(A, b, maxiter=30, precond='column')),
+                        err(lsqr(A, b, maxiter=30)))
+        # a scaled warm start never increases the starting residual
+        for x0 in [x * 0.5, -x, pg.Vector(nModel, 1.0)]:
+            y = lsqr(A, b, x=pg.Vector(x0), maxiter=0, scaleStart=True)
+            self.assertLessEqual(np.linalg.norm(b - Ad.dot(y)),
+                                 np.linalg.norm(b))
+        self.assertLess(err(lsqr(A, b, x=pg.Vector(x * 0.5), maxiter=10,
+                                 precond='column')),
+                        err(lsqr(A, b, maxiter=10, precond='column')))
+        # early stopping only if the data misfit has settled
+        y = lsqr(A, b, maxiter=500, precond='column', nData=nData,
+                 dPhi=1e-3)
+        rx, ry = np.asarray(b) - Ad.dot(x), np.asarray(b) - Ad.dot(y)
+        np.testing.assert_allclose(ry[:nData].dot(ry[:nData]),
+                                   rx[:nData].dot(rx[:nData]), rtol=1e-2)
+
+    def test_MultiFrameModelling(self):
+        """Concurrent frames give the same response and Jacobian."""
+        grid = pg.createGrid(np.linspace(0, 1, 6), np.linspace(0, 1, 6))
+        rng = np.random.default_rng(1337)
+        A = [rng.random((n, grid.cellCount())) for n in [7, 5, 6]]
+        frameOf = {len(Ai): Ai for Ai in A}  # frames identified by size
+
+        class FrameModelling(pg.frameworks.MeshModelling):
+            def response(self, model):
+                return frameOf[self.data.size()].dot(model)
+
+            def createJacobian(self, model):
+                Ai = frameOf[self.data.size()]
+                self.jacobian().resize(*Ai.shape)
+                for i, row in enumerate(Ai):
+                    self.jacobian().setVal(i, row)
+
+            def createRefinedFwdMesh(self, mesh):
+                return mesh
+
+        data = [pg.DataContainer() for Ai in A]
+        for d, Ai in zip(data, A):
+            d.resize(len(Ai))
+
+        model = rng.random(grid.cellCount() * len(A))
+        x = rng.random(len(model))
+        for nWorkers, pool in [(1, 'thread'), (2, 'thread'), (2, 'process')]:
+            fop = pg.frameworks.MultiFrameModelling(FrameModelling,
+                                                    nWorkers=nWorkers,
+                                                    pool=pool)
+            fop.setData(data)
+            fop.setMesh(grid)
+            fop.mesh()  # distributes the mesh and prepares the Jacobian
+            resp = fop.response(model)
+            fop.createJacobian(model)
+            mod = np.reshape(model, [len(A), -1])
+            np.testing.assert_allclose(
+                resp, np.concatenate([Ai.dot(m) for Ai, m in zip(A, mod)]))
+            np.testing.assert_allclose(fop.jac.mult(x), np.concatenate(
+                [Ai.dot(xi) for Ai, xi in zip(A, np.reshape(x, mod.shape))]))
+
+            if pool == 'process':
+                # one pool per operator state, renewed after modifications
+                p1 = fop._forkPool(nWorkers)
+                fop.response(model)
+                self.assertIs(fop._forkPool(nWorkers), p1)
+                fop.modified()
+                self.assertIsNot(fop._forkPool(nWorkers), p1)
+                fop._releaseFramePool()
+
 
 if __name__ == '__main__':
 
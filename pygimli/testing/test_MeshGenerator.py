@@ -258,7 +258,38 @@ class TestMeshGenerator(unittest.TestCase):
 
         np.testing.assert_array_equal(mesh2.nodeCount(), mesh.nodeCount())
         np.testing.assert_array_equal(mesh2.cellCount(), mesh.cellCount())
-        
+
+    def test_MeshQuality(self):
+        import pygimli.meshtools as mt
+        from pygimli.meshtools.quality import eta, nsr, minimumAngle
+
+        rect = mt.createRectangle([0, 0], [2, 1])
+        mesh = mt.createMesh(rect, quality=30, area=0.05)
+        for measure, f in [('eta', eta), ('nsr', nsr),
+                           ('minimumAngle', minimumAngle)]:
+            np.testing.assert_allclose(mt.qualities(mesh, measure),
+                                       [f(c) for c in mesh.cells()])
+            # square, cube and regular tetrahedron are ideal
+            for m in [pg.createGrid(3, 3), pg.createGrid(3, 3, 3)]:
+                np.testing.assert_allclose(mt.qualities(m, measure), 1.0)
+
+            tet = pg.Mesh(3)
+            for p in [[0, 0, 0], [1, 0, 0], [0.5, np.sqrt(3) / 2, 0],
+                      [0.5, np.sqrt(3) / 6, np.sqrt(2 / 3)]]:
+                tet.createNode(p)
+            tet.createCell([0, 1, 2, 3])
+            np.testing.assert_allclose(mt.qualities(tet, measure), 1.0)
+
+        rep = mt.qualityReport(mesh, nWorst=3)
+        self.assertEqual(sum(rep['hist']), mesh.cellCount())
+        self.assertEqual(rep['quality'][rep['worst'][0]], rep['min'])
+        self.assertTrue(np.all(np.diff(rep['quality'][rep['worst']]) >= 0))
+
+        rep0 = mt.qualityReport(mesh, nWorst=0)
+        self.assertEqual(len(rep0['worst']), 0)
+        self.assertEqual((rep0['min'], rep0['mean']),
+                         (rep['min'], rep['mean']))
+
 
 if __name__ == '__main__':
     # pg.setDeepDebug(1)
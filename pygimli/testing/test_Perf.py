@@ -26,6 +26,82 @@ st = range(N)
 
 class TestPerf(unittest.TestCase):
 
+    @staticmethod
+    def _importPygimli():
+        """Import pygimli in a fresh interpreter.
+
+        Returns the import time and the heavy modules that were loaded
+        eagerly.
+        """
+        import os
+        import subprocess
+        import sys
+
+        code = """\
+import sys, time
+t0 = time.perf_counter()
+import pygimli as pg
+t = time.perf_counter() - t0
+lazy = ['matplotlib', 'pygimli.viewer', 'pygimli.solver',
+        'pygimli.frameworks', 'pygimli.physics', 'pygimli.testing']
+print(t, *[m for m in lazy if m in sys.modules])
+assert callable(pg.show) and callable(pg.solve)
+assert pg.physics.ert.ERTManager is pg.physics.ERTManager
+assert 'matplotlib.pyplot' not in sys.modules
+"""
+        # import the same pygimli as we do
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        out = subprocess.run([sys.executable, '-c', code], check=True,
+                             capture_output=True, text=True,
+                             env=env).stdout.split()
+        return float(out[0]), out[1:]
+
+    def test_ImportTime(self):
+        """Heavy subpackages need to be loaded on first access only."""
+        t, eager = self._importPygimli()
+        print("import pygimli: {0:.3f} s".format(t))
+        self.assertEqual(eager, [])
+
+    @pg.skipOnDefaultTest
+    def test_ImportTimeBound(self):
+        """Importing pygimli takes less than 2 s (machine dependent)."""
+        self.assertLess(self._importPygimli()[0], 2.0)
+
+    def test_Benchmark(self):
+        """Benchmark suite runs and detects regressions to a baseline."""
+        import os
+        import tempfile
+        from pygimli.testing import benchmark as bm
+
+        res = bm.runBenchmarks('meshGeneration', repeat=1, verbose=False)
+        r = res['results'][0]
+        self.assertEqual((r['name'], r['size'], r['threads']),
+                         ('meshGeneration', 'small', 1))
+        self.assertGreater(r['time'], 0)
+        self.assertGreater(r['peakMemory'], 0)
+
+        fName = os.path.join(tempfile.mkdtemp(), 'bench.json')
+        bm.saveBenchmarks(res, fName)
+        self.assertEqual(bm.compareBenchmarks(res, fName), [])
+
+        slow = bm.loadBenchmarks(fName)
+        slow['results'][0]['time'] = r['time'] + 1.0
+        reg = bm.compareBenchmarks(slow, fName, verbose=False)
+        self.assertEqual([(g['name'], g['key']) for g in reg],
+                         [('meshGeneration', 'time')])
+
+        # baseline cases without result are reported too
+        slow['results'][0]['threads'] = 2
+        reg = bm.compareBenchmarks(res, slow, verbose=False)
+        self.assertEqual([(g['name'], g['threads'], g['key']) for g in reg],
+                         [('meshGeneration', 2, 'missing')])
+
+        # speedup is relative to the smallest thread count
+        res = bm.runBenchmarks('meshGeneration', threads=[2, 1], repeat=1,
+                               fork=False, verbose=False)
+        self.assertEqual([r['threads'] for r in res['results']], [1, 2])
+        self.assertEqual(res['results'][0]['speedup'], 1.0)
+
     def test_Performance(self):
         """
         """
@@ -9,6 +9,7 @@ import pygimli as pg
 from pygimli.physics import ert
 from pygimli.physics import VESManager
 from pygimli.physics.em import VMDTimeDomainModelling
+from pygimli.physics.ves import VESModelling
 
 # pg.setTestingMode(True)
 np.random.seed(1337)
@@ -33,9 +34,162 @@ class TestManagers(unittest.TestCase):
         mod = mgr.invert(dat, mesh=mesh, maxIter=20, lam=10)
         np.testing.assert_approx_equal(mgr.inv.chi2(), 1.033, significant=3)
 
+    def test_ERTReference(self):
+        scheme = ert.createData(elecs=np.linspace(0, 10, 11), schemeName='dd')
+        scheme['k'] = ert.createGeometricFactors(scheme)
+        world = pg.meshtools.createWorld(start=[-30, 0], end=[40, -30],
+                                         worldMarker=True)
+        for p in scheme.sensors():
+            world.createNode(p)
+            world.createNode(p - [0, 0.1])
+        mesh = pg.meshtools.createMesh(world, quality=34, area=5)
+
+        fop = ert.ERTModellingReference(nWorkers=1)
+        fop.setData(scheme)
+        fop.setMesh(mesh)
+        res = np.ones(fop.parameterCount) * 100.
+        resp = fop.response(res)
+        np.testing.assert_allclose(resp, 100., rtol=0.02)
+        self.assertEqual(len(fop.subPotentials), len(fop.k))
+
+        # sensitivities of a homogeneous halfspace sum up to one
+        fop.createJacobian(res)
+        J = np.array(fop.jacobian())
+        np.testing.assert_allclose(J.sum(axis=1), 1., rtol=0.05)
+
+        fop = ert.ERTModellingReference(nWorkers=2, pool='thread',
+                                        memoryBudget=0.1)
+        fop.setData(scheme)
+        fop.setMesh(mesh)
+        np.testing.assert_allclose(fop.response(res), resp)
+        fop.createJacobian(res)
+        np.testing.assert_allclose(np.array(fop.jacobian()), J, atol=1e-12)
+
+    def test_Block1DResponses(self):
+        """Vectorized responses of many 1D models and LC Jacobians."""
+        from pygimli.physics.em.hemmodelling import HEMmodelling
+
+        ab2 = np.logspace(0, 2, 15)
+        models = np.array([[2., 10., 100., 10., 300.],
+                           [5., 20., 10., 100., 30.],
+                           [1., 4., 50., 500., 5.]])
+        fop = VESModelling(ab2=ab2, mn2=ab2/3, nLayers=3)
+        # same filter as the single sounding operator
+        np.testing.assert_allclose(fop.responses(models),
+                                   [fop.response(m) for m in models],
+                                   rtol=1e-8)
+
+        heights = [30., 50., 120.]
+        hem = HEMmodelling(nlay=3, height=30., r=7.9,
+                           f=HEMmodelling.fdefault)
+        resp = hem.responses(models, height=heights)
+        for m, h, r in zip(models, heights, resp):
+            hem.height = h
+            np.testing.assert_allclose(r, hem.response(m), atol=1e-8)
+
+        lc = pg.frameworks.LCModelling(HEMmodelling, nlay=3, height=heights,
+                                       r=7.9, f=HEMmodelling.fdefault)
+        lc.initJacobian([r for r in resp], nLayers=3)
+        np.testing.assert_allclose(lc.response(models.ravel()), resp.ravel())
+        lc.createJacobian(models.ravel())
+        for m, f in zip(models, lc._fops1D):
+            J = np.array(f.jacobian())
+            f.setMultiThreadJacobian(1)
+            f.createJacobian(m)
+            np.testing.assert_allclose(J, np.array(f.jacobian()),
+                                       rtol=1e-6, atol=1e-8)
+
     def test_TT(self, showProgress=False):
         pass
 
+    def test_GravMagKernel(self):
+        """Chunked and parallel Holstein kernel give the same result."""
+        import os
+        import tempfile
+        from pygimli.physics.gravimetry import (GravityModelling,
+                                                SolveGravMagHolstein)
+
+        mesh = pg.createGrid(*[np.linspace(-0.5, 0.5, 3)]*3)
+        pnts = [[0, 0, 20.], [0, 0, -20.], [20, 0, 0], [1, 2, 3]]
+        cmp = ['gz', 'gx', 'TFA', 'Bxy', 'Bzz']
+        igrf = [0.1, 2, 3, 1000, 2000, 40000, 44000]
+        K = SolveGravMagHolstein(mesh, pnts, cmp, igrf=igrf,
+                                 skipCache=True, verbose=False)
+        self.assertEqual(K.shape, (len(pnts), len(cmp), mesh.cellCount()))
+        # far field of a unit cube is a point mass, components gx, gz first
+        np.testing.assert_allclose(K[:3, :2].sum(axis=2),
+                                   [[0, 1/400], [0, -1/400], [1/400, 0]],
+                                   rtol=1e-5, atol=1e-12)
+
+        fName = os.path.join(tempfile.mkdtemp(), 'kernel.npy')
+        K2 = SolveGravMagHolstein(mesh, pnts, cmp, igrf=igrf, out=fName,
+                                  dtype=np.float32, memory=1e-4, nWorkers=2,
+                                  verbose=False)
+        self.assertEqual(K2.dtype, np.float32)
+        np.testing.assert_allclose(np.load(fName), K, rtol=1e-5,
+                                   atol=1e-6 * abs(K).max())
+
+        # execution options don't change the cache key
+        from pygimli.utils.cache import CacheManager
+        cwd = os.getcwd()
+        globalCache = pg.rc['globalCache']
+        with tempfile.TemporaryDirectory() as path:
+            os.chdir(path)
+            pg.rc['globalCache'] = False
+            try:
+                mgr = CacheManager()
+                s0 = mgr.statistics()
+                SolveGravMagHolstein(mesh, pnts, cmp, igrf=igrf,
+                                     verbose=False)
+                K3 = SolveGravMagHolstein(mesh, pnts, cmp, igrf=igrf,
+                                          memory=1e-4, nWorkers=2,
+                                          verbose=False)
+                s1 = mgr.statistics()
+                self.assertEqual(s1['misses'] - s0['misses'], 1)
+                self.assertEqual(s1['hits'] - s0['hits'], 1)
+                np.testing.assert_allclose(K3, K)
+            finally:
+                pg.rc['globalCache'] = globalCache
+                os.chdir(cwd)
+
+        fop = GravityModelling(mesh, np.array(pnts), memory=1e-4,
+                               skipCache=True, verbose=False)
+        np.testing.assert_allclose(fop.response(np.ones(mesh.cellCount())),
+                                   K[:, 1].sum(axis=1))
+
+    def test_GravMagACA(self):
+        """Compressed Holstein kernel approximates the dense one."""
+        from pygimli.physics.gravimetry import (GravityModelling,
+                                                SolveGravMagHolstein,
+                                                holsteinACAMatrices)
+
+        x = np.linspace(-10, 10, 11)
+        mesh = pg.createGrid(x, x, np.linspace(-6, 0, 4))
+        xp = np.linspace(-30, 30, 21)
+        pnts = np.array([[xi, yi, 1.] for xi in xp for yi in xp])
+        cmp = ['gz', 'Bz', 'Bzz']
+        igrf = [0.1, 2, 3, 1000, 2000, 40000, 44000]
+        K = SolveGravMagHolstein(mesh, pnts, cmp, igrf=igrf,
+                                 skipCache=True, verbose=False)
+        mats = holsteinACAMatrices(mesh, pnts, cmp, igrf=igrf, tol=1e-4,
+                                   leafSize=16)
+        x = np.random.rand(mesh.cellCount())
+        y = np.random.rand(len(pnts))
+        for iC, A in enumerate(mats):
+            self.assertEqual((A.rows(), A.cols()), K[:, iC].shape)
+            self.assertGreater(A.rank, 0)  # far field is compressed
+            self.assertLess(A.compression(), 1.0)
+            np.testing.assert_allclose(A.toDense(), K[:, iC],
+                                       atol=1e-4 * abs(K[:, iC]).max())
+            for Ax, Kx in [(A.mult(x), K[:, iC].dot(x)),
+                           (A.transMult(y), K[:, iC].T.dot(y))]:
+                np.testing.assert_allclose(Ax, Kx, atol=1e-4*abs(Kx).max())
+
+        fop = GravityModelling(mesh, pnts, acaTol=1e-4, verbose=False)
+        Kx = K[:, 0].dot(x)
+        np.testing.assert_allclose(fop.response(x), Kx,
+                                   atol=1e-4 * abs(Kx).max())
+
     @pg.skipOnDefaultTest
     def test_VMD(self, showProgress=False):
         t = np.logspace(-5.5, -2.2, 20)
@@ -65,6 +65,170 @@ class TestTT(unittest.TestCase):
         J = fop.jacobian()
         np.testing.assert_allclose(J * self.slo, np.sqrt(5))
 
+    def test_SharedTable(self):
+        """Response, Jacobian and way share one travel time table."""
+        from pygimli.physics.traveltime import createRAData
+        from pygimli.physics.traveltime.modelling import \
+            TravelTimeDijkstraModelling
+
+        data = createRAData(np.linspace(0, 10, 6))
+        mesh = pg.createGrid(np.linspace(0, 10, 11), np.linspace(-4, 0, 5))
+        slo = 1 / (1000 + 100 * np.abs(pg.y(mesh.cellCenters())))
+
+        fop = TravelTimeDijkstraModelling(secNodes=2)
+        fop.setData(data)
+        fop.setMesh(mesh)
+        searches = []
+        graph = fop.createGraphMatrix
+        fop.createGraphMatrix = lambda s: searches.append(1) or graph(s)
+
+        t = np.array(fop.response(slo))
+        fop.createJacobian(slo)
+        way = fop.way(0, 5)
+        self.assertEqual(len(searches), 1)
+
+        J = pg.utils.sparseMatrix2coo(fop.jacobian()).toarray()
+        fop._core.createJacobian(slo)
+        Jc = pg.utils.sparseMatrix2coo(fop._core.jacobian()).toarray()
+        np.testing.assert_allclose(J, Jc, atol=1e-12)
+        np.testing.assert_allclose(t, np.array(fop._core.response(slo)))
+        pos = np.array(fop.mesh().positions(withSecNodes=True))
+        np.testing.assert_allclose(pos[way[[0, -1]]], [[0, 0, 0],
+                                                       [10, 0, 0]])
+
+        fop.createJacobian(slo * 2)
+        self.assertEqual(len(searches), 2)
+
+    def test_FatrayJacobian(self):
+        from pygimli.physics.traveltime import createRAData
+        from pygimli.physics.traveltime.modelling import \
+            FatrayDijkstraModellingInterpolate
+
+        data = createRAData(np.linspace(0, 10, 6))
+        mesh = pg.createGrid(np.linspace(0, 10, 11), np.linspace(-4, 0, 5))
+        slo = 1 / (1000 + 100 * np.abs(pg.y(mesh.cellCenters())))
+
+        J = []
+        for nWorkers in [1, 2]:
+            fop = FatrayDijkstraModellingInterpolate(frequency=500.,
+                                                     nWorkers=nWorkers)
+            fop.setData(data)
+            fop.setMesh(mesh)
+            fop.response(slo)
+            fop.createJacobian(slo)
+            self.assertEqual(fop.jacobian().rows(), data.size())
+            self.assertEqual(fop.jacobian().cols(), mesh.cellCount())
+            J.append(pg.utils.sparseMatrix2csr(fop.jacobian()))
+
+        W = pg.utils.sparseMatrix2csr(fop.FresnelWeight)
+        # sparse, normalized weights and J*s reproduces the ray travel time
+        self.assertLess(W.nnz, 0.5 * np.prod(W.shape))
+        np.testing.assert_allclose(W.sum(axis=1), 1.)
+        tsr = fop._Dmat[data.id('s'), data.id('g')]
+        np.testing.assert_allclose(J[0] @ slo, tsr)
+        np.testing.assert_allclose(J[0].toarray(), J[1].toarray())
+
+    def test_TravelTimeTable(self):
+        fop = self.mgr.fop
+        fop.setData(self.data)
+        fop.setMesh(self.mesh.createMeshWithSecondaryNodes(n=3),
+                    ignoreRegionManager=True)
+
+        nodes = [0, 7, 4]  # sensor nodes and center
+        T = fop.travelTimeTable(nodes, self.slo)
+        self.assertEqual(T.shape, (3, fop.mesh().nodeCount() +
+                                   fop.mesh().secondaryNodeCount()))
+        np.testing.assert_allclose(T[[0, 1, 0], [0, 0, 7]],
+                                   [0, np.sqrt(5), np.sqrt(5)])
+
+        T32 = fop.travelTimeTable(nodes, self.slo, dtype=np.float32)
+        self.assertEqual(T32.dtype, np.float32)
+        np.testing.assert_allclose(T32, T, rtol=1e-6)
+
+        way = fop.shortestPath(7, 0)
+        self.assertEqual((way[0], way[-1]), (7, 0))
+
+    def test_Eikonal(self):
+        import pygimli.meshtools as mt
+        from pygimli.physics.traveltime import createRAData
+
+        data = createRAData(np.linspace(0, 10, 6))
+        geo = mt.createRectangle([0, -5], [10, 0])
+        for p in data.sensors():
+            geo.createNode(p)
+        mesh = mt.createMesh(geo, quality=33, area=0.1)
+        mgr = TravelTimeManager(eikonal=True)
+        fop = mgr.fop
+        self.assertEqual(type(fop).__name__, 'EikonalModelling')
+        fop.setData(data)
+        fop.setMesh(mesh, ignoreRegionManager=True)
+
+        slo = np.full(mesh.cellCount(), 1e-3)
+        t = fop.response(slo)
+        dist = np.abs(pg.x(data)[data['s']] - pg.x(data)[data['g']])
+        np.testing.assert_allclose(t, dist * 1e-3, rtol=0.02)
+
+        # Jacobian of the discrete travel times is exact
+        slo = 1e-3 * (1 - 0.1 * pg.y(mesh.cellCenters()))
+        fop.createJacobian(slo)
+        np.testing.assert_allclose(fop.jacobian() * slo, fop.response(slo))
+        way = fop.way(0, 5)
+        self.assertEqual(way[0], fop.sensorNodes[0])
+        self.assertEqual(way[-1], fop.sensorNodes[5])
+
+    def test_EikonalTwoLayer(self):
+        """Straight source rays through a slow layer over a fast one."""
+        from pygimli.physics.traveltime.eikonal import EikonalSolver
+
+        mesh = pg.createGrid(np.linspace(0, 40, 81), np.linspace(-10, 0, 21))
+        v1, v2, h = 1000., 3000., 0.5
+        slo = np.where(pg.y(mesh.cellCenters()) > -h, 1 / v1, 1 / v2)
+        es = EikonalSolver(mesh, sourceRings=3)
+        T = es.solve([mesh.findNearestNode([10, 0])], slo)[:, 0]
+
+        # vertical rays below the source, partly in the source rings
+        for d in [0.5, 1.0, 1.5, 2.5]:
+            n = mesh.findNearestNode([10, -d])
+            self.assertAlmostEqual(T[n], h / v1 + (d - h) / v2)
+
+        # direct wave and head wave along the surface
+        x = np.arange(11., 41.)
+        rec = [mesh.findNearestNode([xi, 0]) for xi in x]
+        tA = np.minimum((x - 10) / v1, (x - 10) / v2 +
+                        2 * h * np.sqrt(1 - (v1 / v2)**2) / v1)
+        np.testing.assert_allclose(T[rec], tA, rtol=0.02)
+        np.testing.assert_allclose(es.jacobian(0, rec) @ slo, T[rec],
+                                   rtol=1e-12)
+
+    def test_Eikonal3D(self):
+        """Eikonal solver on a regular 3D grid."""
+        import warnings
+        from pygimli.physics.traveltime.eikonal import EikonalSolver
+
+        x = np.linspace(0, 10, 11)
+        mesh = pg.createGrid(x, x, np.linspace(-10, 0, 11))
+        es = EikonalSolver(mesh)
+        src = mesh.findNearestNode([5, 5, 0])
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')  # no invalid value warnings
+            T = es.solve([src], np.ones(mesh.cellCount()))[:, 0]
+
+        dist = np.linalg.norm(np.asarray(mesh.positions()) -
+                              mesh.node(src).pos(), axis=1)
+        np.testing.assert_allclose(T, dist, rtol=0.1, atol=1e-12)  # 1st order
+
+        # sparse Jacobian, the number of cells grows with the ray length
+        rec = [mesh.findNearestNode([5, 5 + k, 0]) for k in range(1, 6)] + \
+            [mesh.findNearestNode([5, 5, -k]) for k in range(1, 11)]
+        J = es.jacobian(0, rec)
+        np.testing.assert_equal(np.diff(J.indptr), np.round(T[rec]))
+        rec = [mesh.findNearestNode([xi, yi, -5]) for xi in x for yi in x]
+        J = es.jacobian(0, rec)
+        self.assertLess(J.nnz, 0.05 * len(rec) * mesh.cellCount())
+        self.assertTrue(np.all(np.diff(J.indptr) <= 10 * T[rec]))
+        np.testing.assert_allclose(J @ np.ones(mesh.cellCount()), T[rec])
+
+
 if __name__ == '__main__':
 
     # fop  = TestTT()
@@ -203,7 +203,130 @@ class TestMisc(unittest.TestCase):
         m2.node(0).setPos([1.0, 0.0])
         self.assertTrue(m1.hash() == m2.hash())
 
-        
+    def test_Cache(self):
+        import os
+        import tempfile
+        from pygimli.utils.cache import CacheManager, valHash
+
+        a = np.arange(12.).reshape(3, 4)
+        self.assertEqual(valHash(a), valHash(a.copy()))
+        self.assertFalse(valHash(a) == valHash(a.reshape(4, 3)))
+
+        @pg.cache
+        def _ones(n):
+            return np.ones((n, 100))
+
+        cwd = os.getcwd()
+        globalCache = pg.rc['globalCache']
+        with tempfile.TemporaryDirectory() as path:
+            os.chdir(path)
+            pg.rc['globalCache'] = False
+            try:
+                mgr = CacheManager()
+                s0 = mgr.statistics()
+                np.testing.assert_equal(_ones(10), np.ones((10, 100)))
+                np.testing.assert_equal(_ones(10), np.ones((10, 100)))
+                _ones(20)
+                s1 = mgr.statistics()
+                self.assertEqual(s1['hits'] - s0['hits'], 1)
+                self.assertEqual(s1['misses'] - s0['misses'], 2)
+                self.assertEqual(s1['entries'], 2)
+
+                # only the last recently used entry fits
+                self.assertEqual(mgr.evict(maxSize=0.02), 1)
+                self.assertEqual(mgr.statistics()['entries'], 1)
+                hits = mgr.statistics()['hits']
+                _ones(20)
+                self.assertEqual(mgr.statistics()['hits'], hits + 1)
+                self.assertEqual(mgr.evict(maxAge=1e-9), 1)
+                self.assertEqual(mgr.statistics()['entries'], 0)
+
+                # the same kind of array on a miss and on a hit
+                @pg.cache(mmap=True)
+                def _onesMapped(n):
+                    return np.ones((n, 100))
+
+                for f, mapped in [(_ones, False), (_onesMapped, True)]:
+                    for b in [f(30), f(30)]:  # miss, hit
+                        self.assertEqual(isinstance(b, np.memmap), mapped)
+                        self.assertEqual(b.flags.writeable, not mapped)
+                        np.testing.assert_equal(b, np.ones((30, 100)))
+                b = _ones(30)
+                b *= 2
+                np.testing.assert_equal(_ones(30), np.ones((30, 100)))
+
+                A = np.exp(-np.abs(np.subtract.outer(np.arange(20.),
+                                                     np.arange(20.))))
+                C = pg.matrix.Cm05Matrix(A)
+                C.save('cm05')
+                C2 = pg.matrix.Cm05Matrix('cm05')
+                self.assertIsInstance(C2.EV, np.memmap)
+                x = np.arange(20.)
+                np.testing.assert_allclose(C2.mult(x), C.mult(x))
+            finally:
+                pg.rc['globalCache'] = globalCache
+                os.chdir(cwd)
+
+    def test_SparseGeostatistics(self):
+        import os
+        import tempfile
+        from pygimli.utils.geostatistics import covarianceMatrix
+
+        mesh = pg.createGrid(np.arange(21.), np.arange(11.))
+        kw = dict(I=[4, 2], dip=20)
+        C = covarianceMatrix(mesh, **kw)
+        Cs = covarianceMatrix(mesh, sparse=True, cutoff=3, **kw).toarray()
+        # tapered version of the dense matrix, zero beyond the cutoff
+        np.testing.assert_allclose(np.diag(Cs), 1.0)
+        self.assertTrue(np.all(Cs <= C + 1e-12))
+        self.assertTrue(np.all(Cs[C < np.exp(-3) * 0.999] == 0))
+        self.assertTrue(np.all(Cs[C > np.exp(-3) * 1.001] > 0))
+        self.assertTrue(np.linalg.eigvalsh(Cs)[0] > 0)
+
+        ew, EV = np.linalg.eigh(Cs)
+        x = np.random.default_rng(0).standard_normal(mesh.cellCount())
+        y = pg.matrix.SparseCm05Matrix(Cs).mult(x)
+        np.testing.assert_allclose(y, EV.dot(EV.T.dot(x) / np.sqrt(ew)),
+                                   rtol=0, atol=2e-3*np.abs(y).max())
+
+        # long correlation range, smallest eigenvalues matter most
+        mesh2 = pg.createGrid(np.arange(41.), np.arange(21.))
+        Cl = covarianceMatrix(mesh2, I=[20, 20], sparse=True)
+        x2 = np.random.default_rng(0).standard_normal(mesh2.cellCount())
+        y = pg.matrix.SparseCm05Matrix(Cl, tol=1e-3).mult(x2)
+        y0 = pg.matrix.Cm05Matrix(Cl.toarray()).mult(x2)
+        self.assertLess(np.linalg.norm(y - y0), 1e-3 * np.linalg.norm(y0))
+
+        cwd = os.getcwd()
+        globalCache = pg.rc['globalCache']
+        with tempfile.TemporaryDirectory() as path:
+            os.chdir(path)
+            pg.rc['globalCache'] = False
+            try:
+                G = pg.matrix.GeostatisticConstraintsMatrix(mesh=mesh,
+                                                            sparse=True, **kw)
+                self.assertIsInstance(G.Cm05, pg.matrix.SparseCm05Matrix)
+                self.assertEqual(G.rows(), mesh.cellCount())
+                G.save('G')
+                G2 = pg.matrix.GeostatisticConstraintsMatrix('G')
+                np.testing.assert_allclose(G2.mult(x), G.mult(x))
+
+                # the dense/sparse switch follows maxDense or the rc key
+                G = pg.matrix.GeostatisticConstraintsMatrix(
+                    mesh=mesh, maxDense=mesh.cellCount() - 1, **kw)
+                self.assertIsInstance(G.Cm05, pg.matrix.SparseCm05Matrix)
+                maxDense = pg.rc['geostatMaxDense']
+                pg.rc['geostatMaxDense'] = mesh.cellCount()
+                try:
+                    G = pg.matrix.GeostatisticConstraintsMatrix(mesh=mesh,
+                                                                **kw)
+                finally:
+                    pg.rc['geostatMaxDense'] = maxDense
+                self.assertNotIsInstance(G.Cm05, pg.matrix.SparseCm05Matrix)
+            finally:
+                pg.rc['globalCache'] = globalCache
+                os.chdir(cwd)
+
     # does not work .. need time to implement          
     # def test_DataContainerWrite(self):
     #     data = pg.DataContainer()
@@ -22,7 +22,7 @@ from .cache import (cache, strHash, noCache)
 from .geostatistics import (computeInverseRootMatrix, covarianceMatrix,
                             generateGeostatisticalModel)
 from .gps import GKtoUTM, findUTMZone, getProjection, getUTMProjection, readGPX
-from .hankel import hankelFC
+from .hankel import dc1dFilter, hankelFC
 from .postinversion import iterateBounds, modelCovariance, modelResolutionMatrix
 from .sparseMat2Numpy import (convertCRSIndex2Map, sparseMatrix2Array,
                               sparseMatrix2coo, sparseMatrix2csr, sparseMatrix2Dense,
@@ -5,6 +5,11 @@
 Input supports python base types and all pg.core objects with .hash() method.
 Output supports DataContainerERT, ...
 
+Numerical ndarrays are stored without pickling. By default they are
+restored into memory, i.e., writable like the return value of the first
+call. Use @pg.cache(mmap=True) to get read-only memory maps instead, on
+a cache miss as well as on a hit, whose pages are shared between processes.
+
 TODO:
 
   *   Output types:
@@ -16,18 +21,30 @@ To use just add the decorator.
 def myLongRunningStuff(*args, **kwargs):
     #...
     return results
+
+The cache store can be shared by many processes. Entries are written
+atomically and the store is limited by pg.rc['cacheMaxSize'] (MB) and
+pg.rc['cacheMaxAge'] (days), least recently used entries are removed first.
 """
 import sys
 import os
+import glob
 import inspect
 import hashlib
 import json
 import time
+import uuid
 
 import numpy as np
 
 import pygimli as pg
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 
 __NO_CACHE__ = False
 
@@ -39,31 +56,103 @@ def strHash(string):
     return int(hashlib.sha224(string.encode()).hexdigest()[:16], 16)
 
 def valHash(a):
-    
+
     if isinstance(a, str):
         return strHash(a)
     elif isinstance(a, int):
         return a
-    elif isinstance(a, list):
+    elif isinstance(a, (list, tuple)):
         hsh = 0
         for item in a:
             hsh = hsh ^ valHash(item)
         return hsh
     elif isinstance(a, np.ndarray):
-        if a.ndim == 1:
-            return hash(pg.Vector(a))
-        elif a.ndim == 2:
-            # convert to RVector to use memcopy
-            return hash(pg.Vector(a.reshape((1,a.shape[0]*a.shape[1]))[0]))
-        else:
-            print(a)
-            pg.error('no hash for numpy array')
+        if a.dtype.hasobject:
+            return valHash(list(a.ravel())) ^ hash(a.shape)
+        # hash the raw buffer, no conversion needed
+        h = hashlib.blake2b(np.ascontiguousarray(a).view(np.uint8),
+                            digest_size=8)
+        return int.from_bytes(h.digest(), 'little') ^ hash(a.shape) ^ \
+            strHash(a.dtype.str)
+    elif hasattr(a, 'tocsr') and hasattr(a, 'nnz'):  # scipy.sparse
+        a = a.tocsr()
+        return valHash(a.data) ^ valHash(a.indices) ^ \
+            valHash(a.indptr) ^ hash(a.shape)
 
     return hash(a)
 
+
+class _FileLock(object):
+    """Exclusive lock on a file, shared between processes.
+
+    Not reentrant, don't nest two locks on the same file in one process.
+    """
+
+    def __init__(self, fileName):
+        self._fileName = fileName
+        self._fd = None
+
+    def __enter__(self):
+        self._fd = open(self._fileName, 'a+')
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            self._fd.seek(0)
+            msvcrt.locking(self._fd.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *args):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            self._fd.seek(0)
+            msvcrt.locking(self._fd.fileno(), msvcrt.LK_UNLCK, 1)
+        self._fd.close()
+        self._fd = None
+
+
+def _entryFiles(name):
+    """All data files of the cache entry `name` without the json sidecar."""
+    return [f for f in glob.glob(name) + glob.glob(name + '.*')
+            if not f.endswith('.json') and '.tmp' not in f]
+
+
+def loadArray(fileName, mmap=True):
+    """Load a numpy array file, by default memory mapped, i.e., read-only.
+
+    The OS shares the pages of the mapped file between all processes,
+    so many processes can restore the same large cached array without
+    holding a private copy. Files containing Python objects can't be
+    mapped and are loaded into memory.
+
+    Parameters
+    ----------
+    fileName : str
+        .npy file name
+    mmap : bool [True]
+        Return a read-only np.memmap, otherwise a writable ndarray.
+    """
+    if mmap:
+        try:
+            return np.load(fileName, mmap_mode='r')
+        except ValueError:
+            pass
+    return np.load(fileName, allow_pickle=True)
+
+
+def _writeJSON(fileName, info):
+    """Write json file atomically."""
+    tmp = '{0}.{1}.tmp'.format(fileName, uuid.uuid4().hex)
+    with open(tmp, 'w') as of:
+        json.dump(info, of, sort_keys=False,
+                  indent=4, separators=(',', ': '))
+    os.replace(tmp, fileName)
+
+
 class Cache(object):
-    def __init__(self, hashValue):
+    def __init__(self, hashValue, mmap=False):
         self._value = None
+        self._mmap = mmap
         self._hash = hashValue
         self._name = CacheManager().cachingPath(str(self._hash))
         self._info = None
@@ -77,6 +166,8 @@ class Cache(object):
                           'date': 0,
                           'dur': 0.0,
                           'restored': 0,
+                          'accessed': 0,
+                          'bytes': 0,
                           'codeinfo': '',
                           'version': '',
                           'args': '',
@@ -94,7 +185,10 @@ class Cache(object):
 
     @value.setter
     def value(self, v):
-        self.info['type'] = str(type(v).__name__)
+        if isinstance(v, np.ndarray):  # also restored np.memmap
+            self.info['type'] = 'ndarray'
+        else:
+            self.info['type'] = str(type(v).__name__)
 
         # if len(self.info['type']) != 1:
         #     pg.error('only single return caches supported for now.')
@@ -102,31 +196,71 @@ class Cache(object):
 
         self.info['file'] = self._name
 
+        # write to temporary files and move them in place afterwards, so
+        # other processes never see incomplete entries
+        tmp = '{0}.{1}.tmp'.format(self._name, uuid.uuid4().hex)
+        try:
+            self._save(v, tmp)
+        except BaseException:
+            for f in glob.glob(tmp) + glob.glob(tmp + '.*'):
+                os.remove(f)
+            raise
+
+        nBytes = 0
+        for f in glob.glob(tmp) + glob.glob(tmp + '.*'):
+            nBytes += os.path.getsize(f)
+            os.replace(f, self._name + f[len(tmp):])
+
+        self.info['bytes'] = nBytes
+        self.info['accessed'] = time.time()
         self.updateCacheInfo()
 
+        if self._mmap and self.info['type'] == 'ndarray':
+            # same read-only memory map as restored on a hit
+            v = loadArray(self._name + '.npy', mmap=True)
+
+        self._value = v
+        CacheManager()._stats['stored'] += 1
+        CacheManager()._stats['bytesWritten'] += nBytes
+        pg.info('Cache stored:', self._name)
+        CacheManager().evict()
+
+    def _save(self, v, name):
+        """Save value v to file(s) starting with name."""
         if self.info['type'] == 'Mesh':
             pg.info('Save Mesh binary v2')
-            v.saveBinaryV2(self._name)
+            v.saveBinaryV2(name)
         elif self.info['type'] == 'RVector':
             pg.info('Save RVector binary')
-            v.save(self._name, format=pg.core.Binary)
+            v.save(name, format=pg.core.Binary)
         elif self.info['type'] == 'ndarray':
             pg.info('Save ndarray')
-            np.save(self._name, v, allow_pickle=True)
+            # plain binary layout for numbers, can be restored memory mapped
+            np.save(name, v, allow_pickle=v.dtype.hasobject)
         elif hasattr(v, 'save') and hasattr(v, 'load'):
-            v.save(self._name)
+            v.save(name)
         else:
-            np.save(self._name, v, allow_pickle=True)
+            np.save(name, v, allow_pickle=True)
             # pg.warn('ascii save of type', self.info['type'], 'might by dangerous')
-            # v.save(self._name)
-
-        self._value = v
-        pg.info('Cache stored:', self._name)
+            # v.save(name)
 
     def updateCacheInfo(self):
-        with open(self._name + '.json', 'w') as of:
-            json.dump(self.info, of, sort_keys=False,
-                      indent=4, separators=(',', ': '))
+        with _FileLock(CacheManager().lockFile()):
+            _writeJSON(self._name + '.json', self.info)
+
+    def _touch(self):
+        """Count the restore and mark the entry as recently used."""
+        with _FileLock(CacheManager().lockFile()):
+            try:
+                with open(self._name + '.json') as file:
+                    info = json.load(file)
+            except (OSError, ValueError):
+                # removed meanwhile, write our version again
+                info = self.info
+            info['restored'] = info.get('restored', 0) + 1
+            info['accessed'] = time.time()
+            _writeJSON(self._name + '.json', info)
+        self.info = info
 
     def restore(self):
         """Read data from json infos"""
@@ -144,34 +278,37 @@ class Cache(object):
                 #     pg.error('only single return caches supported for now.')
 
                 #pg._y(pg.pf(self.info))
-                
+
                 if self.info['type'] == 'DataContainerERT':
-                    self._value = pg.DataContainerERT(self.info['file'],
+                    self._value = pg.DataContainerERT(self._name,
                                                       removeInvalid=False)
                     # print(self._value)
                 elif self.info['type'] == 'RVector':
                     self._value = pg.Vector()
-                    self._value.load(self.info['file'], format=pg.core.Binary)
+                    self._value.load(self._name, format=pg.core.Binary)
                 elif self.info['type'] == 'Mesh':
                     pg.tic()
                     self._value = pg.Mesh()
-                    self._value.loadBinaryV2(self.info['file'] + '.bms')
+                    self._value.loadBinaryV2(self._name + '.bms')
                     pg.debug("Restoring cache took:", pg.dur(), "s")
                 elif self.info['type'] == 'ndarray':
-                    self._value = np.load(self.info['file'] + '.npy',
-                                          allow_pickle=True)
+                    self._value = loadArray(self._name + '.npy',
+                                            mmap=self._mmap)
                 elif self.info['type'] == 'Cm05Matrix':
-                    self._value = pg.matrix.Cm05Matrix(self.info['file'])
+                    self._value = pg.matrix.Cm05Matrix(self._name)
+                elif self.info['type'] == 'SparseCm05Matrix':
+                    self._value = pg.matrix.SparseCm05Matrix(self._name)
                 elif self.info['type'] == 'GeostatisticConstraintsMatrix':
                     self._value = pg.matrix.GeostatisticConstraintsMatrix(
-                                                            self.info['file'])
+                                                            self._name)
                 else:
-                    self._value = np.load(self.info['file'] + '.npy',
+                    self._value = np.load(self._name + '.npy',
                                           allow_pickle=True)
 
                 if self.value is not None:
-                    self.info['restored'] = self.info['restored'] + 1
-                    self.updateCacheInfo()
+                    self._touch()
+                    CacheManager()._stats['bytesRead'] += \
+                        self.info.get('bytes', 0)
                     pg.info('Cache {3} restored ({1}s x {0}): {2}'.\
                         format(self.info['restored'],
                                round(self.info['dur'], 1),
@@ -200,33 +337,57 @@ class CacheManager(object):
     def __init__(self):
         if not self.__has_init:
             self._caches = {}
+            self._codeHashes = {}
+            self._stats = {'hits': 0,
+                           'misses': 0,
+                           'stored': 0,
+                           'evicted': 0,
+                           'bytesRead': 0,
+                           'bytesWritten': 0,
+                           'bytesEvicted': 0,
+                           }
             self.__has_init = True
 
     @staticmethod
     def instance(cls):
         return cls.__instance__
 
-    def cachingPath(self, fName):
-        """Create a path name for the cache"""
+    def cachePath(self):
+        """Return the path of the cache store and create it if necessary."""
         if pg.rc["globalCache"]:
             path = pg.getCachePath()
         else:
             path = ".cache"
         if not os.path.exists(path):
-            os.mkdir(path)
-        return os.path.join(path, fName)
+            os.makedirs(path, exist_ok=True)
+        return path
+
+    def cachingPath(self, fName):
+        """Create a path name for the cache"""
+        return os.path.join(self.cachePath(), fName)
+
+    def lockFile(self):
+        """Lock file guarding the cache infos and eviction of the store."""
+        return os.path.join(self.cachePath(), 'cache.lock')
 
     def functInfo(self, funct):
         """Return unique info string about the called function."""
         return funct.__code__.co_filename + ":" + funct.__qualname__
 
+    def codeHash(self, funct):
+        """Hash of the function source code, memoized per process."""
+        code = funct.__code__
+        if code not in self._codeHashes:
+            self._codeHashes[code] = strHash(inspect.getsource(funct))
+        return self._codeHashes[code]
+
     def hash(self, funct, *args, **kwargs):
         """"Create a hash value"""
         pg.tic()
         functInfo = self.functInfo(funct)
         funcHash = strHash(functInfo)
         versionHash = strHash(pg.versionStr())
-        codeHash = strHash(inspect.getsource(funct))
+        codeHash = self.codeHash(funct)
 
         argHash = 0
         for i, a in enumerate(args):
@@ -240,35 +401,143 @@ class CacheManager(object):
                 argHash = argHash ^ (valHash(k + str(v)))
             else:
                 argHash = argHash ^ valHash(k) ^ valHash(v)
-                            
+
         pg.debug("Hashing took:", pg.dur(), "s")
         return funcHash ^ versionHash ^ codeHash ^ argHash
 
-    def cache(self, funct, *args, **kwargs):
+    def cache(self, funct, *args, mmap=False, **kwargs):
         """ Create a unique cache """
         hashVal = self.hash(funct, *args, **kwargs)
 
-        cached = Cache(hashVal)
+        cached = Cache(hashVal, mmap=mmap)
         cached.info['codeinfo'] = self.functInfo(funct)
         cached.info['version'] = pg.versionStr()
         cached.info['args'] = str(args)
         cached.info['kwargs'] = str(kwargs)
 
+        if cached.value is None:
+            self._stats['misses'] += 1
+        else:
+            self._stats['hits'] += 1
+
         return cached
 
+    def entries(self):
+        """Return all entries of the cache store.
+
+        Returns
+        -------
+        entries : list
+            List of (lastAccess, bytes, name) tuples.
+        """
+        entries = []
+        for info in glob.glob(os.path.join(self.cachePath(), '*.json')):
+            name = info[:-5]
+            if not os.path.basename(name).lstrip('-').isdigit():
+                continue
+            try:
+                with open(info) as file:
+                    i = json.load(file)
+                accessed = i.get('accessed', 0) or i.get('date', 0)
+            except (OSError, ValueError):
+                accessed = 0  # broken info, remove first
+            nBytes = sum(os.path.getsize(f) for f in _entryFiles(name)
+                         if os.path.exists(f))
+            entries.append((accessed, nBytes, name))
+        return entries
+
+    def evict(self, maxSize=None, maxAge=None):
+        """Remove old and least recently used entries from the cache store.
+
+        Parameters
+        ----------
+        maxSize : float [pg.rc['cacheMaxSize']]
+            Maximum size of the store in MB. 0 for no limit.
+        maxAge : float [pg.rc['cacheMaxAge']]
+            Maximum time in days since the last use of an entry.
+            0 for no limit.
+
+        Returns
+        -------
+        nEvicted : int
+            Number of removed entries.
+        """
+        if maxSize is None:
+            maxSize = pg.rc.get('cacheMaxSize', 0)
+        if maxAge is None:
+            maxAge = pg.rc.get('cacheMaxAge', 0)
+
+        if not maxSize and not maxAge:
+            return 0
+
+        now = time.time()
+        with _FileLock(self.lockFile()):
+            remove = []
+            total = 0
+            for e in sorted(self.entries(), reverse=True):
+                total += e[1]
+                if (maxAge and now - e[0] > maxAge * 86400) or \
+                        (maxSize and total > maxSize * 1024**2):
+                    remove.append(e)
+                    total -= e[1]
+
+            for _, nBytes, name in remove:
+                for f in _entryFiles(name) + [name + '.json']:
+                    try:
+                        os.remove(f)
+                    except OSError:
+                        pass
+                self._stats['evicted'] += 1
+                self._stats['bytesEvicted'] += nBytes
+
+        if len(remove) > 0:
+            pg.debug('Cache evicted {0} entries'.format(len(remove)))
+        return len(remove)
+
+    def statistics(self):
+        """Return hit/miss/bytes statistics of this process and the store.
+
+        Returns
+        -------
+        stats : dict
+            Counters for hits, misses, stored and evicted entries and read,
+            written and evicted bytes together with the number of entries
+            and the total size (bytes) of the store.
+        """
+        stats = dict(self._stats)
+        entries = self.entries()
+        stats['entries'] = len(entries)
+        stats['size'] = sum(e[1] for e in entries)
+        return stats
+
+
+def cache(funct=None, mmap=False):
+    """Cache decorator.
+
+    Use as @pg.cache or @pg.cache(mmap=True).
+
+    Parameters
+    ----------
+    funct : callable
+        Function to be cached.
+    mmap : bool [False]
+        Return ndarray results as read-only memory maps of the cache file,
+        for large results shared between processes. Otherwise results are
+        writable arrays on a cache miss and a cache hit alike.
+    """
+    if funct is None:
+        return lambda f: cache(f, mmap=mmap)
 
-def cache(funct):
-    """Cache decorator."""
     def wrapper(*args, **kwargs):
 
         nc = kwargs.pop('skipCache', False)
-        
+
         if any(('--noCache' in sys.argv,
                 '-N' in sys.argv, nc is True, __NO_CACHE__)):
 
             return funct(*args, **kwargs)
 
-        cache = CacheManager().cache(funct, *args, **kwargs)
+        cache = CacheManager().cache(funct, *args, mmap=mmap, **kwargs)
         if cache.value is not None:
             return cache.value
         else:
@@ -279,6 +548,7 @@ def cache(funct):
             cache.info['dur'] = sw.duration()
             try:
                 cache.value = rv
+                rv = cache.value
             except Exception as e:
                 print(e)
                 pg.warn("Can't cache:", rv)
@@ -10,7 +10,8 @@ import pygimli as pg
 
 
 # better rename I to something else (range?) according to E743
-def covarianceMatrixVec(x, y, z=None, I=None, dip=0, strike=0, var=1):
+def covarianceMatrixVec(x, y, z=None, I=None, dip=0, strike=0, var=1,
+                        sparse=False, cutoff=3.0):
     """Geostatistical covariance matrix for given points.
 
     Parameters
@@ -23,28 +24,57 @@ def covarianceMatrixVec(x, y, z=None, I=None, dip=0, strike=0, var=1):
             dip angle (in degrees) of major axis (I[0])
         strike : float
             strike angle (for 3D)
+        sparse : bool [False]
+            Only compute the covariance of point pairs closer than cutoff
+            (found by a KD-tree) and return a sparse matrix. The exponential
+            covariance is tapered by a compactly supported Wendland function
+            (Furrer et al., 2006) so that the matrix stays positive definite.
+        cutoff : float [3]
+            Taper range for sparse=True in units of correlation length.
 
     Returns
     -------
     Cm : np.array (square matrix of size cellCount/nodeCount)
-        covariance matrix
-
+        covariance matrix, scipy.sparse.csr_matrix for sparse=True
     """
     if I is None:
         I = [1, 1, 1]
     elif isinstance(I, (float, int)):
         I = [I, I, I]
     elif len(I) < 3:
-        I.append(I[-1])
+        I = list(I) + [I[-1]] * (3 - len(I))
 
     if z is None:
         z = np.zeros_like(x)
 
+    alpha = -dip * pi / 180  # rotation of operator
+    beta = -strike * pi / 180
+
+    if sparse:
+        from scipy.sparse import coo_matrix
+        from scipy.spatial import cKDTree
+
+        # the normalized lag is linear in the point difference, so map
+        # the points once and search neighbors with euclidean distance
+        T = np.array([[cos(alpha)*cos(beta) / I[0],
+                       -sin(alpha)*cos(beta) / I[0], 0],
+                      [sin(alpha)*cos(beta) / I[1],
+                       cos(alpha)*cos(beta) / I[1], 0],
+                      [0, 0, sin(beta) / I[2]]])
+        P = np.column_stack([x, y, z]).dot(T.T)
+        ij = cKDTree(P).query_pairs(cutoff, output_type='ndarray')
+        H = np.sqrt(np.sum((P[ij[:, 0]] - P[ij[:, 1]])**2, axis=1))
+        h = H / cutoff
+        c = var * np.exp(-H) * (1 - h)**4 * (4 * h + 1)
+        n = len(P)
+        row = np.concatenate([ij[:, 0], ij[:, 1], np.arange(n)])
+        col = np.concatenate([ij[:, 1], ij[:, 0], np.arange(n)])
+        val = np.concatenate([c, c, np.full(n, float(var))])
+        return coo_matrix((val, (row, col)), shape=(n, n)).tocsr()
+
     hx = x - x[:, np.newaxis]
     hy = y - y[:, np.newaxis]
     hz = z - z[:, np.newaxis]
-    alpha = -dip * pi / 180  # rotation of operator
-    beta = -strike * pi / 180
     # compute lags, normalized by correlation lengths
     Hx = (hx*cos(alpha)-hy*sin(alpha))*cos(beta) / I[0]
     Hy = (hx*sin(alpha)+hy*cos(alpha))*cos(beta) / I[1]
@@ -160,3 +160,289 @@ def hankelFC(order):
         nc0 = 60
     #return (np.reshape(fc, (-1, 1)), nc0)  # (100,) -> (100, 1)
     return fc, nc0
+
+
+def dc1dFilter():
+    """Hankel filter of the DC 1D forward operator (pg.core.DC1dModelling).
+
+    801 abscissae (10 per decade) and weights for the J0 transformation of
+    the layered earth kernel, identical to the ones of the C++ operator, so
+    that Python implementations produce the same results.
+
+    Returns
+    -------
+    x : np.array(801)
+        abscissae (wavenumber times distance)
+    w : np.array(801)
+        filter weights
+    """
+    x = 8.917099801327442e-14 * np.exp(0.1 * np.arange(801))
+    w = np.array([
+        2.103562053838982e-29, -1.264469361608894e-14, 4.615731256788567e-14,
+        -2.798703374257668e-14, 5.465764965410841e-14, -2.652933109928729e-14,
+        5.674913434067321e-14, -2.157276828977208e-14, 5.831846086773976e-14,
+        -1.546589284868783e-14, 6.057302455652974e-14, -8.502531259083065e-15,
+        6.388018061147645e-14, -5.659657635010288e-16, 6.848500604791407e-14,
+        8.572897732168276e-15, 7.465068154681813e-14, 1.920837293261338e-14,
+        8.269345428975771e-14, 3.1701165629229e-14, 9.300004039695208e-14,
+        4.649069639417992e-14, 1.060441944490564e-13, 6.411216589597457e-14,
+        1.224060834001701e-13, 8.521776751507023e-14, 1.427957940487172e-13,
+        1.106026606968463e-13, 1.680820203098405e-13, 1.412367028159546e-13,
+        1.993271011776308e-13, 1.783032042964119e-13, 2.378298196799422e-13,
+        2.232462602765097e-13, 2.851776817107034e-13, 2.778285575785995e-13,
+        3.433107735233557e-13, 3.442019764139949e-13, 4.145997612327839e-13,
+        4.249938198224969e-13, 5.019411631949951e-13, 5.234121310773422e-13,
+        6.08873719324756e-13, 6.433743253810275e-13, 7.397205280796933e-13,
+        7.89664297886592e-13, 8.997626559623209e-13, 9.681243129571425e-13,
+        1.095451187471558e-12, 1.185889375491455e-12, 1.334666226164323e-12,
+        1.451673490118585e-12, 1.627033241780647e-12, 1.776119296526221e-12,
+        1.984309459865773e-12, 2.172225112712636e-12, 2.420855801356264e-12,
+        2.655866524621122e-12, 2.954213313000758e-12, 3.246433455110429e-12,
+        3.605807223054322e-12, 3.9676082798213e-12, 4.401806878720721e-12,
+        4.848316218220904e-12, 5.37417607788477e-12, 5.923886142128417e-12,
+        6.561955948855011e-12, 7.237468388830243e-12, 8.012831864792648e-12,
+        8.841766480402105e-12, 9.785047278800097e-12, 1.080115224902499e-11,
+        1.194974128877562e-11, 1.319424925552153e-11, 1.459380374689331e-11,
+        1.611708818260074e-11, 1.782336249944076e-11, 1.968696083966218e-11,
+        2.176804271234846e-11, 2.40471274537544e-11, 2.658616922424555e-11,
+        2.937256616666064e-11, 3.24711207158745e-11, 3.587699548548411e-11,
+        3.965909071112399e-11, 4.382145152220635e-11, 4.843856688602439e-11,
+        5.352476425684008e-11, 5.916190912377548e-11, 6.537635327328955e-11,
+        7.225949098391668e-11, 7.985185650562155e-11, 8.825697213255411e-11,
+        9.753221923111176e-11, 1.077963949370144e-10, 1.191270094182892e-10,
+        1.31661951905434e-10, 1.455028951566729e-10, 1.608114581091983e-10,
+        1.777184270673645e-10, 1.964147916871289e-10, 2.170665216346822e-10,
+        2.399008451839042e-10, 2.651263504640323e-10, 2.930148720448538e-10,
+        3.238267179640594e-10, 3.578885297833856e-10, 3.955234710219298e-10,
+        4.371254308993604e-10, 4.83094047393758e-10, 5.339056350072159e-10,
+        5.90052957369007e-10, 6.521132758098962e-10, 7.206928333934838e-10,
+        7.964924450372341e-10, 8.802567084675067e-10, 9.728375895186284e-10,
+        1.075148437456224e-09, 1.188226062693121e-09, 1.313189706258061e-09,
+        1.451302163665563e-09, 1.6039339435116e-09, 1.77262406329356e-09,
+        1.95904973321987e-09, 2.165087540667258e-09, 2.392789115986871e-09,
+        2.644443536014764e-09, 2.922559573439235e-09, 3.229930291248597e-09,
+        3.569622651576204e-09, 3.945045448172924e-09, 4.359947261255963e-09,
+        4.818489091363688e-09, 5.325251901762953e-09, 5.885315583343685e-09,
+        6.504277635547376e-09, 7.18834041924257e-09, 7.944342903082902e-09,
+        8.77985856295911e-09, 9.703242578022093e-09, 1.07237432276894e-08,
+        1.185156747840095e-08, 1.309800933225301e-08, 1.447553742402158e-08,
+        1.599794451372024e-08, 1.768046154055318e-08, 1.953993335487118e-08,
+        2.1594964684505e-08, 2.386612830616206e-08, 2.637614961034523e-08,
+        2.915015476269831e-08, 3.221590205565798e-08, 3.560407926098509e-08,
+        3.934859178954436e-08, 4.348692045365787e-08, 4.806047869438007e-08,
+        5.311504443749314e-08, 5.870120138001748e-08, 6.487486163571268e-08,
+        7.169780940885934e-08, 7.923833480505012e-08, 8.757190229426675e-08,
+        9.678192055835553e-08, 1.069605631204864e-07, 1.182097045925483e-07,
+        1.306419269237675e-07, 1.443816591198488e-07, 1.595664099835792e-07,
+        1.763481565722233e-07, 1.948948533650376e-07, 2.153921247351847e-07,
+        2.380451115468297e-07, 2.630805351444854e-07, 2.907489558998551e-07,
+        3.213272911558462e-07, 3.551215767529809e-07, 3.924700396067688e-07,
+        4.337464734078393e-07, 4.793639887921159e-07, 5.297791390370199e-07,
+        5.85496497998219e-07, 6.470737017046583e-07, 7.151270374758372e-07,
+        7.903376040582035e-07, 8.734581359370587e-07, 9.653205295304359e-07,
+        1.06684417629933e-06, 1.179045157323447e-06, 1.303046419382764e-06,
+        1.440089007182073e-06, 1.591544490556806e-06, 1.758928685376697e-06,
+        1.943916830388476e-06, 2.148360347694608e-06, 2.374305378111399e-06,
+        2.624013254094558e-06, 2.89998313729281e-06, 3.204977025773239e-06,
+        3.542047402097807e-06, 3.914567778667102e-06, 4.326266465748067e-06,
+        4.781263881007758e-06, 5.284113792545945e-06, 5.839848890150422e-06,
+        6.454031158395685e-06, 7.132807538712648e-06, 7.882971454044484e-06,
+        8.712030795792634e-06, 9.628283069078872e-06, 1.064089843325841e-05,
+        1.176001148348469e-05, 1.299682267761921e-05, 1.436371043746991e-05,
+        1.587435503282041e-05, 1.754387550120777e-05, 1.938898096105121e-05,
+        2.142813784487508e-05, 2.368175471430264e-05, 2.61723865181813e-05,
+        2.892496032668667e-05, 3.196702481167932e-05, 3.532902595927333e-05,
+        3.904461178455365e-05, 4.31509690875633e-05, 4.768919563102351e-05,
+        5.270471145419851e-05, 5.82477134493557e-05, 6.437367773954277e-05,
+        7.114391489568718e-05, 7.862618353777022e-05, 8.689536847209423e-05,
+        9.603423013681158e-05, 0.0001061342328695059, 0.0001172964602657162,
+        0.0001296326268075215, 0.0001432661958546299, 0.00015833361521504,
+        0.0001749856826064412, 0.000193389054722159, 0.0002137279149064782,
+        0.0002362058162174614, 0.0002610477181410775, 0.0002885022375064333,
+        0.0003188441357870562, 0.0003523770680013592, 0.0003894366200728159,
+        0.0004303936656695837, 0.0004756580748770003, 0.0005256828130316798,
+        0.0005809684683619366, 0.0006420682561143772, 0.0007095935446942389,
+        0.0007842199637491256, 0.0008666941465924691, 0.000957841183475901,
+        0.001058572843543458, 0.001169896665384001, 0.001292925974983324,
+        0.001428890965739396, 0.00157915088962763, 0.001745207548623177,
+        0.001928720102656342, 0.002131521473093367, 0.002355636277673631,
+        0.002603300731229735, 0.002876984272542283, 0.003179413630050106,
+        0.003513598723334281, 0.003882861625673649, 0.00429086725403169,
+        0.00474165797348686, 0.005239689338467119, 0.005789870985188969,
+        0.00639760707200034, 0.007068843783102744, 0.007810112796625723,
+        0.008628584975720666, 0.009532112534855742, 0.0105292869710523,
+        0.01162947042684567, 0.01284285301027502, 0.0141804540040849,
+        0.01565416842684913, 0.01727670025860997, 0.01906157878467033,
+        0.02102295173845023, 0.02317553622087861, 0.02553413681316817,
+        0.02811347056705691, 0.03092716134472897, 0.03398734108220733,
+        0.03730266904318316, 0.04087756584601726, 0.04470845458227711,
+        0.04878245655564208, 0.05307046388837388, 0.05752521479656082,
+        0.06206888924914453, 0.06659098690582325, 0.07092687097703929,
+        0.07485762155329997, 0.07807466421172765, 0.08018887211338042,
+        0.08067640670918658, 0.07891767306422777, 0.07412406301630496,
+        0.06545864753141331, 0.05195771725733346, 0.03284797274184859,
+        0.00749707632583127, -0.02386612869894549, -0.06017494378476118,
+        -0.0981789979885067, -0.1328147797272611, -0.1554628569772562,
+        -0.156398215798745, -0.124304986652905, -0.05486815986343697,
+        0.04686255899170307, 0.1511218295806206, 0.2119315534410599,
+        0.1695134135887796, 0.0138619742033148, -0.1869350451838135,
+        -0.2455889606925336, -0.05309269401899814, 0.2519998415798595,
+        0.1968224876057428, -0.201433361896916, -0.2458450827258603,
+        0.3433559314076636, -0.04770066510626292, -0.2096628473507452,
+        0.2509085123794248, -0.1676412661335192, 0.07495199786896763,
+        -0.01695135102751146, -0.008828524201374996, 0.0161678735618355,
+        -0.01556411755992529, 0.0125131112521637, -0.009299315246978098,
+        0.006650525996779493, -0.004667707408671884, 0.003248885545556855,
+        -0.002255529108544675, 0.001566875211100915, -0.001091132486368091,
+        0.0007625383049040949, -0.0005352540577820409, 0.000377710456721467,
+        -0.0002682528211535297, 0.0001920265274996755, -0.0001388213723208944,
+        0.0001015998917810005, -7.549725062631259e-05, 5.714172920052936e-05,
+        -4.419160967680634e-05, 3.501776199578583e-05, -2.84849695413999e-05,
+        2.380104817324115e-05, -2.041274924032166e-05, 1.79336348979186e-05,
+        -1.609367780777977e-05, 1.470394692017765e-05, -1.363208540087839e-05,
+        1.278540851480116e-05, -1.209910323276592e-05, 1.152780746372085e-05,
+        -1.103964249967709e-05, 1.061214724478712e-05, -1.022954672255804e-05,
+        9.880801917269063e-06, -9.558136268373164e-06, 9.255989462874843e-06,
+        -8.97036803983496e-06, 8.698439226217636e-06, -8.438199899378174e-06,
+        8.188185039708096e-06, -7.947275976752668e-06, 7.714620489277085e-06,
+        -7.489590334670121e-06, 7.271712845563131e-06, -7.06059520272004e-06,
+        6.85589095863429e-06, -6.657307826365352e-06, 6.464610635947412e-06,
+        -6.277596705248834e-06, 6.096069004564178e-06, -5.919835014912806e-06,
+        5.748721389173238e-06, -5.582576428368341e-06, 5.421255729073172e-06,
+        -5.26461148323362e-06, 5.112497827757443e-06, -4.964780650195476e-06,
+        4.821336526159266e-06, -4.682043530422997e-06, 4.546777587820041e-06,
+        -4.415418000076004e-06, 4.287852503112911e-06, -4.163974668109847e-06,
+        4.043678407829827e-06, -3.926857526517075e-06, 3.813409851360361e-06,
+        -3.703239239834851e-06, 3.596252927182967e-06, -3.492358600906126e-06,
+        3.391465179914198e-06, -3.29348543124194e-06, 3.198336356446399e-06,
+        -3.105937110348406e-06, 3.016207679069661e-06, -2.929069911562291e-06,
+        2.844448954094881e-06, -2.762272935820411e-06, 2.682471568415877e-06,
+        -2.604975709140556e-06, 2.529718233664062e-06, -2.456634690985054e-06,
+        2.385662793855871e-06, -2.316741584624232e-06, 2.249811415880699e-06,
+        -2.184814552602377e-06, 2.121695378987067e-06, -2.0603999269499e-06,
+        2.00087543589398e-06, -1.943070483347481e-06, 1.886935339579619e-06,
+        -1.832421953831803e-06, 1.779483599068986e-06, -1.728074671861562e-06,
+        1.67815084081871e-06, -1.629669220867866e-06, 1.582588274939725e-06,
+        -1.536867577717458e-06, 1.492467744182388e-06, -1.449350544031671e-06,
+        1.407478963215944e-06, -1.366817091697906e-06, 1.327329980403758e-06,
+        -1.288983628354532e-06, 1.251745052743577e-06, -1.215582289623042e-06,
+        1.180464297731392e-06, -1.146360878232118e-06, 1.113242681755176e-06,
+        -1.081081241360643e-06, 1.049848946307979e-06, -1.019518969919736e-06,
+        9.900652269648073e-07, -9.614623823829486e-07, 9.336858590396267e-07,
+        -9.067118039187765e-07, 8.805170379415897e-07, -8.550790335506564e-07,
+        8.303759185665738e-07, -8.063864695073603e-07, 7.830900795968434e-07,
+        -7.604667251660013e-07, 7.384969528074763e-07, -7.171618775580271e-07,
+        6.964431695613518e-07, -6.763230273695452e-07, 6.567841555251206e-07,
+        -6.378097555683096e-07, 6.193835199757372e-07, -6.014896169720738e-07,
+        5.841126695566173e-07, -5.672377400509635e-07, 5.508503223216395e-07,
+        -5.349363333399711e-07, 5.194820986824491e-07, -5.044743364413132e-07,
+        4.899001458890472e-07, -4.757469999761242e-07, 4.620027360551677e-07,
+        -4.486555431391317e-07, 4.356939495368206e-07, -4.231068139067277e-07,
+        4.108833178901058e-07, -3.990129570237777e-07, 3.874855299952715e-07,
+        -3.762911289578004e-07, 3.654201320223786e-07, -3.54863196176586e-07,
+        3.44611248945519e-07, -3.346554794873414e-07, 3.249873307934947e-07,
+        -3.15598493142124e-07, 3.06480897492867e-07, -2.976267081233949e-07,
+        2.890283152696976e-07, -2.806783286653362e-07, 2.725695717362821e-07,
+        -2.646950756050221e-07, 2.570480727284082e-07, -2.496219907786807e-07,
+        2.424104471687142e-07, -2.354072438896643e-07, 2.286063621819694e-07,
+        -2.220019570969968e-07, 2.155883523600859e-07, -2.093600356601861e-07,
+        2.033116540781646e-07, -1.974380094205501e-07, 1.917340535876188e-07,
+        -1.861948842172547e-07, 1.808157405985162e-07, -1.755919996494557e-07,
+        1.705191718700136e-07, -1.655928973946416e-07, 1.608089422670497e-07,
+        -1.561631948835526e-07, 1.516516624771349e-07, -1.472704676262496e-07,
+        1.430158448819191e-07, -1.388841375627619e-07, 1.348717946589134e-07,
+        -1.309753677747614e-07, 1.271915081246862e-07, -1.235169636417206e-07,
+        1.19948576209994e-07, -1.16483278973208e-07, 1.131180936862105e-07,
+        -1.098501281312535e-07, 1.066765736321394e-07, -1.035947026599537e-07,
+        1.006018664975167e-07, -9.769549295058651e-08, 9.487308412474973e-08,
+        -9.21322142833144e-08, 8.947052777472484e-08, -8.688573700943116e-08,
+        8.437562048443172e-08, -8.193802086874367e-08, 7.957084315467929e-08,
+        -7.727205286392825e-08, 7.50396742974787e-08, -7.287178883148888e-08,
+        7.07665332669298e-08, -6.872209823264986e-08, 6.673672663335082e-08,
+        -6.48087121371678e-08, 6.293639770567428e-08, -6.111817417008917e-08,
+        5.935247885127626e-08, -5.763779421770836e-08, 5.597264657919956e-08,
+        -5.435560481863042e-08, 5.278527916288309e-08, -5.126031999018991e-08,
+        4.977941667022704e-08, -4.83412964362335e-08, 4.694472329047102e-08,
+        -4.558849694284832e-08, 4.427145178025873e-08, -4.299245586445184e-08,
+        4.175040995827635e-08, -4.054424658081963e-08, 3.937292909065092e-08,
+        -3.823545079527342e-08, 3.713083408552377e-08, -3.605812959486601e-08,
+        3.501641538356351e-08, -3.400479614676831e-08, 3.302240244515663e-08,
+        -3.206838995736202e-08, 3.114193875409117e-08, -3.024225259359901e-08,
+        2.936855823761587e-08, -2.852010478676213e-08, 2.769616303496246e-08,
+        -2.689602484264953e-08, 2.611900252829978e-08, -2.53644282775314e-08,
+        2.463165356908288e-08, -2.39200486173057e-08, 2.322900183088905e-08,
+        -2.255791928733344e-08, 2.190622422255186e-08, -2.127335653510145e-08,
+        2.065877230473273e-08, -2.006194332493974e-08, 1.948235664905881e-08,
+        -1.891951414942437e-08, 1.837293208920017e-08, -1.784214070660012e-08,
+        1.732668381117887e-08, -1.682611839179446e-08, 1.634001423585344e-08,
+        -1.586795355952947e-08, 1.540953064868929e-08, -1.496435151022419e-08,
+        1.453203353344868e-08, -1.411220516125227e-08, 1.370450557074419e-08,
+        -1.330858436314438e-08, 1.292410126264865e-08, -1.25507258239834e-08,
+        1.218813714839246e-08, -1.183602360782992e-08, 1.149408257713515e-08,
+        -1.116202017395058e-08, 1.083955100614394e-08, -1.0526397926519e-08,
+        1.022229179461678e-08, -9.926971245406734e-09, 9.640182464660921e-09,
+        -9.361678970810806e-09, 9.091221403102824e-09, -8.828577315878212e-09,
+        8.573520978800616e-09, -8.325833182853652e-09, 8.085301051938885e-09,
+        -7.851717859915976e-09, 7.624882852931747e-09, -7.404601076884107e-09,
+        7.190683209868762e-09, -6.982945399464102e-09, 6.781209104717332e-09,
+        -6.585300942697731e-09, 6.395052539483568e-09, -6.210300385452473e-09,
+        6.030885694751333e-09, -5.8566542688268e-09, 5.68745636389964e-09,
+        -5.523146562267662e-09, 5.36358364732565e-09, -5.208630482195534e-09,
+        5.058153891863612e-09, -4.912024548723426e-09, 4.77011686142501e-09,
+        -4.63230886693463e-09, 4.498482125712853e-09, -4.368521619921419e-09,
+        4.242315654571151e-09, -4.119755761525383e-09, 4.000736606276379e-09,
+        -3.885155897415073e-09, 3.772914298716528e-09, -3.663915343765296e-09,
+        3.558065353046999e-09, -3.455273353434971e-09, 3.355451000003056e-09,
+        -3.258512500097394e-09, 3.164374539601736e-09, -3.072956211332787e-09,
+        2.984178945504153e-09, -2.897966442199276e-09, 2.814244605795313e-09,
+        -2.732941481281439e-09, 2.653987192416816e-09, -2.577313881675167e-09,
+        2.502855651924429e-09, -2.430548509791296e-09, 2.360330310661908e-09,
+        -2.292140705271406e-09, 2.22592108783654e-09, -2.161614545686758e-09,
+        2.09916581035045e-09, -2.038521210054267e-09, 1.979628623594711e-09,
+        -1.922437435542387e-09, 1.866898492740427e-09, -1.812964062059653e-09,
+        1.760587789374176e-09, -1.709724659722168e-09, 1.660330958617607e-09,
+        -1.61236423447973e-09, 1.565783262147887e-09, -1.520548007450427e-09,
+        1.476619592797189e-09, -1.433960263766035e-09, 1.39253335665469e-09,
+        -1.352303266970005e-09, 1.313235418827548e-09, -1.275296235235242e-09,
+        1.238453109235514e-09, -1.202674375881138e-09, 1.167929285020692e-09,
+        -1.13418797487023e-09, 1.101421446348478e-09, -1.069601538153474e-09,
+        1.038700902559248e-09, -1.008692981911727e-09, 9.795519858036666e-10,
+        -9.51252868909002e-10, 9.2377130945756e-10, -8.97083688331633e-10,
+        8.711670687664494e-10, -8.459991766370928e-10, 8.215583813149323e-10,
+        -7.978236770771082e-10, 7.74774665053093e-10, -7.523915356928136e-10,
+        7.306550517412669e-10, -7.095465317049981e-10, 6.890478337962292e-10,
+        -6.69141340340839e-10, 6.498099426367938e-10, -6.310370262500165e-10,
+        6.128064567350563e-10, -5.951025657682865e-10, 5.779101376817111e-10,
+        -5.612143963858077e-10, 5.450009926701687e-10, -5.29255991871025e-10,
+        5.139658618950525e-10, -4.991174615891697e-10, 4.846980294463296e-10,
+        -4.706951726376001e-10, 4.570968563611062e-10, -4.438913934986793e-10,
+        4.310674345713248e-10, -4.186139579848742e-10, 4.065202605574395e-10,
+        -3.947759483205284e-10, 3.833709275859127e-10, -3.722953962705749e-10,
+        3.615398354722752e-10, -3.510950012884991e-10, 3.409519168717552e-10,
+        -3.311018647143929e-10, 3.215363791563124e-10, -3.12247239109124e-10,
+        3.032264609905071e-10, -2.944662918626933e-10, 2.859592027691788e-10,
+        -2.77697882263937e-10, 2.696752301275724e-10, -2.61884351265013e-10,
+        2.543185497794985e-10, -2.469713232177689e-10, 2.398363569815098e-10,
+        -2.329075189002498e-10, 2.261788539610461e-10, -2.196445791904288e-10,
+        2.132990786842053e-10, -2.071368987808525e-10, 2.011527433743496e-10,
+        -1.953414693624216e-10, 1.896980822262837e-10, -1.842177317380848e-10,
+        1.788957077923634e-10, -1.737274363579317e-10, 1.687084755467094e-10,
+        -1.638345117961281e-10, 1.591013561618254e-10, -1.545049407174433e-10,
+        1.500413150584345e-10, -1.457066429068751e-10, 1.414971988143619e-10,
+        -1.374093649601637e-10, 1.334396280418735e-10, -1.295845762558885e-10,
+        1.258408963651246e-10, -1.222053708514437e-10, 1.186748751503467e-10,
+        -1.152463749655566e-10, 1.119169236611821e-10, -1.08683659729222e-10,
+        1.055438043302322e-10, -1.024946589050432e-10, 9.953360285547503e-11,
+        -9.665809129205519e-11, 9.386565284680683e-11, -9.115388754922578e-11,
+        8.852046476362457e-11, -8.596312118607507e-11, 8.347965889923978e-11,
+        -8.10679434834466e-11, 7.872590218244558e-11, -7.645152212241484e-11,
+        7.424284858301879e-11, -7.209798331980772e-11, 7.001508293831719e-11,
+        -6.79923573226507e-11, 6.60280681269051e-11, -6.412052735069306e-11,
+        6.226809604991307e-11, -6.046918330329692e-11, 5.872224571634798e-11,
+        -5.702578811834639e-11, 5.537836697680089e-11, -5.377860007122251e-11,
+        5.222519065363231e-11, -5.07169852052075e-11, 4.925310917157278e-11,
+        -4.783328375532226e-11, 4.645856316442775e-11, -4.513304831495452e-11,
+        4.386786828115582e-11, -4.269042848860555e-11, 4.166589074066043e-11,
+        -4.09470613197253e-11, 4.089025606285087e-11, -4.232439520086882e-11,
+        4.71759702866184e-11, -5.992051472297203e-11, 9.095360729014628e-11])
+    return x, w